@@ -6,13 +6,14 @@ import functools
 import logging
 import random
 import secrets
+import time
 import typing  # this can go away when Python 3.8 support is dropped
 from argparse import Namespace
 from collections import Counter, deque
 from collections.abc import Collection, MutableSequence
 from enum import IntEnum, IntFlag
-from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, TypedDict, Union, \
-    Type, ClassVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, \
+    TypedDict, Union, Type, ClassVar
 
 import NetUtils
 import Options
@@ -20,6 +21,7 @@ import Utils
 
 if typing.TYPE_CHECKING:
     from worlds import AutoWorld
+    from Profiling import GenerationProfile
 
 
 class Group(TypedDict, total=False):
@@ -63,6 +65,7 @@ class MultiWorld():
     regions: RegionManager
     itempool: List[Item]
     is_race: bool = False
+    profile: Optional[GenerationProfile] = None
     precollected_items: Dict[int, List[Item]]
     state: CollectionState
 
@@ -520,27 +523,7 @@ class MultiWorld():
             state = CollectionState(self)
         prog_locations = {location for location in self.get_locations() if location.item
                           and location.item.advancement and location not in state.locations_checked}
-
-        while prog_locations:
-            sphere: Set[Location] = set()
-            # build up spheres of collection radius.
-            # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-            for location in prog_locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-
-            if not sphere:
-                # ran out of places and did not finish yet, quit
-                return False
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-            prog_locations -= sphere
-
-            if self.has_beaten_game(state):
-                return True
-
-        return False
+        return SphereSweep(self, prog_locations, state, "can_beat_game").run(lambda sweep: sweep.beaten)
 
     def get_spheres(self) -> Iterator[Set[Location]]:
         """
@@ -550,27 +533,20 @@ class MultiWorld():
         locations is followed by an empty set, and then a set of all of the
         unreachable locations.
         """
-        state = CollectionState(self)
-        locations = set(self.get_filled_locations())
-
-        while locations:
-            sphere: Set[Location] = set()
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
+        sweep = SphereSweep(self, self.get_filled_locations(), name="get_spheres")
+        while sweep.remaining:
+            sphere = sweep.step()
             yield sphere
             if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
+                yield sweep.remaining  # unreachable locations
                 break
 
-            for location in sphere:
-                state.collect(location.item, True, location)
-            locations -= sphere
-
-    def fulfills_accessibility(self, state: Optional[CollectionState] = None):
-        """Check if accessibility rules are fulfilled with current or supplied state."""
+    def fulfills_accessibility(self, state: Optional[CollectionState] = None,
+                               spheres: Optional[List[Set[Location]]] = None):
+        """Check if accessibility rules are fulfilled with current or supplied state.
+        A supplied state is left with everything collected that was reachable, to continue from, e.g. with
+        can_beat_game, without sweeping those spheres again.
+        A supplied spheres list is extended with the spheres swept, e.g. for Spoiler.create_playthrough."""
         if not state:
             state = CollectionState(self)
         players: Dict[str, Set[int]] = {
@@ -581,8 +557,6 @@ class MultiWorld():
         for player, access in self.accessibility.items():
             players[access.current_key].add(player)
 
-        beatable_fulfilled = False
-
         def location_condition(location: Location):
             """Determine if this location has to be accessible, location is already filtered by location_relevant"""
             if location.player in players["locations"] or (location.item and location.item.player not in
@@ -598,39 +572,98 @@ class MultiWorld():
                 return True
             return False
 
-        def all_done() -> bool:
+        def all_done(sweep: SphereSweep) -> bool:
             """Check if all access rules are fulfilled"""
-            if not beatable_fulfilled:
+            if not sweep.spheres or not sweep.beaten:
                 return False
-            if any(location_condition(location) for location in locations):
-                return False  # still locations required to be collected
-            return True
-
-        locations = [location for location in self.get_locations() if location_relevant(location)]
+            # still locations required to be collected?
+            return not any(location_condition(location) for location in sweep.remaining)
 
-        while locations:
-            sphere: List[Location] = []
-            for n in range(len(locations) - 1, -1, -1):
-                if locations[n].can_reach(state):
-                    sphere.append(locations.pop(n))
-
-            if not sphere:
-                # ran out of places and did not finish yet, quit
-                logging.warning(f"Could not access required locations for accessibility check."
-                                f" Missing: {locations}")
-                return False
+        sweep = SphereSweep(self, filter(location_relevant, self.get_locations()), state, "fulfills_accessibility")
+        if spheres is not None:
+            sweep.spheres = spheres
+        if sweep.run(all_done):
+            return True
+        if sweep.remaining:
+            # ran out of places and did not finish yet, quit
+            logging.warning(f"Could not access required locations for accessibility check."
+                            f" Missing: {sweep.remaining}")
+        return False
 
-            for location in sphere:
-                if location.item:
-                    state.collect(location.item, True, location)
 
-            if self.has_beaten_game(state):
-                beatable_fulfilled = True
+class SphereSweep:
+    """
+    Collects the items of the given locations into a state, one sphere of reachable locations at a time.
+    Spheres are kept, so one sweep can answer beatability, accessibility and sphere questions,
+    progress and time taken can be read while it runs.
+    """
+    multiworld: MultiWorld
+    state: CollectionState
+    remaining: Set[Location]
+    """locations that were not reached yet"""
+    spheres: List[Set[Location]]
+    name: str
+    time: float
+    _beaten: bool
 
-            if all_done():
-                return True
+    def __init__(self, multiworld: MultiWorld, locations: Iterable[Location],
+                 state: Optional[CollectionState] = None, name: str = "sweep") -> None:
+        self.multiworld = multiworld
+        self.state = state if state else CollectionState(multiworld)
+        self.remaining = set(locations)
+        self.spheres = []
+        self.name = name
+        self.time = 0.0
+        self._beaten = False
 
-        return False
+    @property
+    def beaten(self) -> bool:
+        """If the game is beaten with what was collected so far."""
+        if not self._beaten:
+            self._beaten = self.multiworld.has_beaten_game(self.state)
+        return self._beaten
+
+    def step(self) -> Set[Location]:
+        """Collects the next sphere and returns it. Returns an empty set if no remaining location is reachable."""
+        start = time.perf_counter()
+        state = self.state
+        # Everything in each sphere is independent of each other and only depends on lower spheres
+        sphere = {location for location in self.remaining if location.can_reach(state)}
+        self._collect_sphere(sphere, start)
+        return sphere
+
+    def replay(self, sphere: Set[Location]) -> Optional[Set[Location]]:
+        """Collects the remaining locations of a sphere that a sweep from the same state swept before, and returns them.
+        Returns None without collecting anything if one of them is not reachable yet,
+        the remaining spheres then have to be swept with step."""
+        start = time.perf_counter()
+        sphere = sphere & self.remaining
+        if not all(location.can_reach(self.state) for location in sphere):
+            return None
+        self._collect_sphere(sphere, start)
+        return sphere
+
+    def _collect_sphere(self, sphere: Set[Location], start: float) -> None:
+        state = self.state
+        for location in sphere:
+            if location.item:
+                state.collect(location.item, True, location)
+        self.remaining -= sphere
+        if sphere:
+            self.spheres.append(sphere)
+        taken = time.perf_counter() - start
+        self.time += taken
+        if self.multiworld.profile:
+            self.multiworld.profile.add_sphere(self.name, taken)
+        logging.debug("%s: sphere %i with %i locations, %i remaining.", self.name, len(self.spheres), len(sphere),
+                      len(self.remaining))
+
+    def run(self, until: Callable[[SphereSweep], bool]) -> bool:
+        """Steps until `until` is fulfilled and returns True, or False if no remaining location is reachable first."""
+        while not until(self):
+            if not self.remaining or not self.step():
+                return False
+        return True
 
 
 PathValue = Tuple[str, Optional["PathValue"]]
@@ -645,6 +678,14 @@ class CollectionState():
     path: Dict[Union[Region, Entrance], PathValue]
     locations_checked: Set[Location]
     stale: Dict[int, bool]
+    shared_items: Set[int]
+    """players whose prog_items Counter may be shared with another state"""
+    shared_regions: Set[int]
+    """players whose reachable_regions and blocked_connections sets may be shared with another state"""
+    failed_rules: Set[Callable[[CollectionState], bool]]
+    """access rules that fail until an item count they read changes, see worlds.generic.Rules.DependencyTrackedRule"""
+    failed_rule_reads: Dict[Tuple[int, str], Tuple[Callable[[CollectionState], bool], ...]]
+    """rules of failed_rules by player and item name they read, may also hold rules that were forgotten since"""
     additional_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
     additional_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
 
@@ -657,6 +698,10 @@ class CollectionState():
         self.path = {}
         self.locations_checked = set()
         self.stale = {player: True for player in parent.get_all_ids()}
+        self.shared_items = set()
+        self.shared_regions = set()
+        self.failed_rules = set()
+        self.failed_rule_reads = {}
         for function in self.additional_init_functions:
             function(self, parent)
         for items in parent.precollected_items.values():
@@ -665,6 +710,7 @@ class CollectionState():
 
     def update_reachable_regions(self, player: int):
         self.stale[player] = False
+        self.unshare_regions(player)
         reachable_regions = self.reachable_regions[player]
         blocked_connections = self.blocked_connections[player]
         queue = deque(self.blocked_connections[player])
@@ -696,19 +742,44 @@ class CollectionState():
                         queue.append(new_entrance)
 
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.multiworld)
-        ret.prog_items = copy.deepcopy(self.prog_items)
-        ret.reachable_regions = {player: copy.copy(self.reachable_regions[player]) for player in
-                                 self.reachable_regions}
-        ret.blocked_connections = {player: copy.copy(self.blocked_connections[player]) for player in
-                                   self.blocked_connections}
+        ret = CollectionState.__new__(CollectionState)
+        ret.multiworld = self.multiworld
+        if self.multiworld.profile:
+            self.multiworld.profile.state_copies += 1
+        # per-player data is shared copy-on-write, whichever state modifies a player's data first copies it
+        ret.prog_items = self.prog_items.copy()
+        ret.reachable_regions = self.reachable_regions.copy()
+        ret.blocked_connections = self.blocked_connections.copy()
+        self.shared_items = set(self.prog_items)
+        ret.shared_items = set(self.prog_items)
+        self.shared_regions = set(self.reachable_regions)
+        ret.shared_regions = set(self.reachable_regions)
         ret.events = copy.copy(self.events)
         ret.path = copy.copy(self.path)
         ret.locations_checked = copy.copy(self.locations_checked)
+        ret.stale = {player: True for player in self.stale}
+        ret.failed_rules = self.failed_rules.copy()
+        ret.failed_rule_reads = self.failed_rule_reads.copy()
+        for function in self.additional_init_functions:
+            function(ret, self.multiworld)
         for function in self.additional_copy_functions:
             ret = function(self, ret)
         return ret
 
+    def unshare_items(self, player: int) -> None:
+        """Has to be called before modifying prog_items[player] in place.
+        World.collect and World.remove, including overrides, do this automatically."""
+        if player in self.shared_items:
+            self.shared_items.remove(player)
+            self.prog_items[player] = self.prog_items[player].copy()
+
+    def unshare_regions(self, player: int) -> None:
+        """Has to be called before modifying reachable_regions[player] or blocked_connections[player] in place."""
+        if player in self.shared_regions:
+            self.shared_regions.remove(player)
+            self.reachable_regions[player] = self.reachable_regions[player].copy()
+            self.blocked_connections[player] = self.blocked_connections[player].copy()
+
     def can_reach(self,
                   spot: Union[Location, Entrance, Region, str],
                   resolution_hint: Optional[str] = None,
@@ -798,6 +869,9 @@ class CollectionState():
 
         self.stale[item.player] = True
 
+        if changed and self.failed_rule_reads:
+            self.forget_failed_rules(item)
+
         if changed and not event:
             self.sweep_for_events()
 
@@ -809,7 +883,24 @@ class CollectionState():
             # invalidate caches, nothing can be trusted anymore now
             self.reachable_regions[item.player] = set()
             self.blocked_connections[item.player] = set()
+            self.shared_regions.discard(item.player)
             self.stale[item.player] = True
+            if self.failed_rule_reads:
+                self.forget_failed_rules(item)
+
+    def forget_failed_rules(self, item: Item) -> None:
+        """Forgets the failed access rules that read an item count collecting or removing item changed."""
+        from worlds.AutoWorld import World
+        world = self.multiworld.worlds[item.player]
+        world_type = type(world)
+        if world_type.collect is World.collect and world_type.remove is World.remove \
+                and world_type.collect_item is World.collect_item and "collect_item" not in vars(world):
+            read_keys = [(item.player, item.name)]
+        else:
+            # the world may change the counts of any of its item names
+            read_keys = [read_key for read_key in self.failed_rule_reads if read_key[0] == item.player]
+        for read_key in read_keys:
+            self.failed_rules.difference_update(self.failed_rule_reads.pop(read_key, ()))
 
 
 class Entrance:
@@ -1201,30 +1292,34 @@ class Spoiler:
             self.entrances[(entrance, direction, player)] = \
                 {"player": player, "entrance": entrance, "exit": exit_, "direction": direction}
 
-    def create_playthrough(self, create_paths: bool = True) -> None:
-        """Destructive to the multiworld while it is run, damage gets repaired afterwards."""
+    def create_playthrough(self, create_paths: bool = True, spheres: Sequence[Set[Location]] = ()) -> None:
+        """Destructive to the multiworld while it is run, damage gets repaired afterwards.
+        spheres of a sweep from an empty state, like those of MultiWorld.fulfills_accessibility, are replayed
+        for as long as they match, instead of sweeping for them again."""
         from itertools import chain
         # get locations containing progress items
         multiworld = self.multiworld
         prog_locations = {location for location in multiworld.get_filled_locations() if location.item.advancement}
         state_cache: List[Optional[CollectionState]] = [None]
         collection_spheres: List[Set[Location]] = []
-        state = CollectionState(multiworld)
-        sphere_candidates = set(prog_locations)
+        sweep = SphereSweep(multiworld, prog_locations, name="playthrough")
+        if any(location.progress_type == LocationProgressType.EXCLUDED for location in prog_locations):
+            spheres = ()  # not swept by the accessibility check, so its spheres can be missing their items
+        replayed_spheres = iter(spheres)
         logging.debug('Building up collection spheres.')
-        while sphere_candidates:
-
+        while sweep.remaining:
             # build up spheres of collection radius.
-            # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-
-            sphere_candidates -= sphere
+            sphere = None
+            for replayed_sphere in replayed_spheres:
+                sphere = sweep.replay(replayed_sphere)
+                if sphere is None:
+                    replayed_spheres = iter(())  # no longer matches, the remaining spheres are swept
+                if sphere is None or sphere:
+                    break
+            if not sphere:
+                sphere = sweep.step()
             collection_spheres.append(sphere)
-            state_cache.append(state.copy())
+            state_cache.append(sweep.state.copy())
 
             logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
                           len(sphere),
@@ -1232,34 +1327,63 @@ class Spoiler:
             if not sphere:
                 logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
                     location.item.name, location.item.player, location.name, location.player) for location in
-                                                                               sphere_candidates])
-                if any([multiworld.accessibility[location.item.player] != 'minimal' for location in sphere_candidates]):
-                    raise RuntimeError(f'Not all progression items reachable ({sphere_candidates}). '
+                                                                               sweep.remaining])
+                if any([multiworld.accessibility[location.item.player] != 'minimal' for location in sweep.remaining]):
+                    raise RuntimeError(f'Not all progression items reachable ({sweep.remaining}). '
                                        f'Something went terribly wrong here.')
                 else:
-                    self.unreachables = sphere_candidates
+                    self.unreachables = sweep.remaining
                     break
 
         # in the second phase, we cull each sphere such that the game is still beatable,
         # reducing each range of influence to the bare minimum required inside it
-        restore_later = {}
-        for num, sphere in reversed(tuple(enumerate(collection_spheres))):
-            to_delete = set()
-            for location in sphere:
-                # we remove the item at location and check if game is still beatable
-                logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
-                              location.item.player)
-                old_item = location.item
+        restore_later: Dict[Location, Item] = {}
+
+        def cull(batch: List[Location], start_state: Optional[CollectionState], uncollected: Set[Location]) -> bool:
+            """Removes the items of batch if the game is still beatable without them, uncollected being the
+            progression locations that start_state did not collect. Same as can_beat_game, without gathering those."""
+            logging.debug('Checking if %i items starting with %s (Player %d) are required to beat the game.',
+                          len(batch), batch[0].item.name, batch[0].item.player)
+            for location in batch:
+                restore_later[location] = location.item
                 location.item = None
-                if multiworld.can_beat_game(state_cache[num]):
-                    to_delete.add(location)
-                    restore_later[location] = old_item
-                else:
-                    # still required, got to keep it around
-                    location.item = old_item
+            state = start_state.copy() if start_state else None
+            culling = SphereSweep(multiworld, (location for location in uncollected if location.item), state,
+                                  "playthrough culling")
+            if culling.run(lambda sweep: sweep.beaten):
+                return True
+            # still required, got to keep it around
+            for location in batch:
+                location.item = restore_later.pop(location)
+            return False
+
+        uncollected = set(sweep.remaining)
+        for num, sphere in reversed(tuple(enumerate(collection_spheres))):
+            uncollected |= sphere
+            # Culling a batch of locations at once means culling them one at a time would have worked as well,
+            # so the batch grows while that succeeds. If it fails, the first required location is searched for by
+            # halving, as the remaining locations of a failed batch are known to fail together.
+            candidates = list(sphere)
+            index = 0
+            batch_size = 1
+            while index < len(candidates):
+                end = min(index + batch_size, len(candidates))
+                if cull(candidates[index:end], state_cache[num], uncollected):
+                    index = end
+                    batch_size *= 2
+                    continue
+                while end - index > 1:
+                    middle = (index + end) // 2
+                    if cull(candidates[index:middle], state_cache[num], uncollected):
+                        index = middle
+                    else:
+                        end = middle
+                index += 1  # candidates[index] is required
+                batch_size = 1
 
             # cull entries in spheres for spoiler walkthrough at end
-            sphere -= to_delete
+            sphere.difference_update(restore_later)
+            del state_cache[num:]  # only earlier spheres are tested from here on
 
         # second phase, sphere 0
         removed_precollected = []
@@ -1353,6 +1477,10 @@ class Spoiler:
                             get_path(state, multiworld.get_region('Inverted Big Bomb Shop', player))
 
     def to_file(self, filename: str) -> None:
+        with open(filename, 'w', encoding="utf-8-sig") as outfile:
+            self.write(outfile)
+
+    def write(self, outfile: typing.TextIO) -> None:
         from worlds import AutoWorld
 
         def write_option(option_key: str, option_obj: Options.AssembleOptions) -> None:
@@ -1360,64 +1488,63 @@ class Spoiler:
             display_name = getattr(option_obj, "display_name", option_key)
             outfile.write(f"{display_name + ':':33}{res.current_option_name}\n")
 
-        with open(filename, 'w', encoding="utf-8-sig") as outfile:
+        outfile.write(
+            'Archipelago Version %s  -  Seed: %s\n\n' % (
+                Utils.__version__, self.multiworld.seed))
+        outfile.write('Filling Algorithm:               %s\n' % self.multiworld.algorithm)
+        outfile.write('Players:                         %d\n' % self.multiworld.players)
+        outfile.write(f'Plando Options:                  {self.multiworld.plando_options}\n')
+        AutoWorld.call_stage(self.multiworld, "write_spoiler_header", outfile)
+
+        for player in range(1, self.multiworld.players + 1):
+            if self.multiworld.players > 1:
+                outfile.write('\nPlayer %d: %s\n' % (player, self.multiworld.get_player_name(player)))
+            outfile.write('Game:                            %s\n' % self.multiworld.game[player])
+
+            for f_option, option in self.multiworld.worlds[player].options_dataclass.type_hints.items():
+                write_option(f_option, option)
+
+            AutoWorld.call_single(self.multiworld, "write_spoiler_header", player, outfile)
+
+        if self.entrances:
+            outfile.write('\n\nEntrances:\n\n')
+            outfile.write('\n'.join(['%s%s %s %s' % (f'{self.multiworld.get_player_name(entry["player"])}: '
+                                                     if self.multiworld.players > 1 else '', entry['entrance'],
+                                                     '<=>' if entry['direction'] == 'both' else
+                                                     '<=' if entry['direction'] == 'exit' else '=>',
+                                                     entry['exit']) for entry in self.entrances.values()]))
+
+        AutoWorld.call_all(self.multiworld, "write_spoiler", outfile)
+
+        locations = [(str(location), str(location.item) if location.item is not None else "Nothing")
+                     for location in self.multiworld.get_locations() if location.show_in_spoiler]
+        outfile.write('\n\nLocations:\n\n')
+        outfile.write('\n'.join(
+            ['%s: %s' % (location, item) for location, item in locations]))
+
+        outfile.write('\n\nPlaythrough:\n\n')
+        outfile.write('\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(
+            [f"  {location}: {item}" for (location, item) in sphere.items()] if isinstance(sphere, dict) else
+            [f"  {item}" for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()]))
+        if self.unreachables:
+            outfile.write('\n\nUnreachable Items:\n\n')
             outfile.write(
-                'Archipelago Version %s  -  Seed: %s\n\n' % (
-                    Utils.__version__, self.multiworld.seed))
-            outfile.write('Filling Algorithm:               %s\n' % self.multiworld.algorithm)
-            outfile.write('Players:                         %d\n' % self.multiworld.players)
-            outfile.write(f'Plando Options:                  {self.multiworld.plando_options}\n')
-            AutoWorld.call_stage(self.multiworld, "write_spoiler_header", outfile)
-
-            for player in range(1, self.multiworld.players + 1):
-                if self.multiworld.players > 1:
-                    outfile.write('\nPlayer %d: %s\n' % (player, self.multiworld.get_player_name(player)))
-                outfile.write('Game:                            %s\n' % self.multiworld.game[player])
-
-                for f_option, option in self.multiworld.worlds[player].options_dataclass.type_hints.items():
-                    write_option(f_option, option)
-
-                AutoWorld.call_single(self.multiworld, "write_spoiler_header", player, outfile)
-
-            if self.entrances:
-                outfile.write('\n\nEntrances:\n\n')
-                outfile.write('\n'.join(['%s%s %s %s' % (f'{self.multiworld.get_player_name(entry["player"])}: '
-                                                         if self.multiworld.players > 1 else '', entry['entrance'],
-                                                         '<=>' if entry['direction'] == 'both' else
-                                                         '<=' if entry['direction'] == 'exit' else '=>',
-                                                         entry['exit']) for entry in self.entrances.values()]))
-
-            AutoWorld.call_all(self.multiworld, "write_spoiler", outfile)
-
-            locations = [(str(location), str(location.item) if location.item is not None else "Nothing")
-                         for location in self.multiworld.get_locations() if location.show_in_spoiler]
-            outfile.write('\n\nLocations:\n\n')
-            outfile.write('\n'.join(
-                ['%s: %s' % (location, item) for location, item in locations]))
-
-            outfile.write('\n\nPlaythrough:\n\n')
-            outfile.write('\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(
-                [f"  {location}: {item}" for (location, item) in sphere.items()] if isinstance(sphere, dict) else
-                [f"  {item}" for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()]))
-            if self.unreachables:
-                outfile.write('\n\nUnreachable Items:\n\n')
-                outfile.write(
-                    '\n'.join(['%s: %s' % (unreachable.item, unreachable) for unreachable in self.unreachables]))
-
-            if self.paths:
-                outfile.write('\n\nPaths:\n\n')
-                path_listings = []
-                for location, path in sorted(self.paths.items()):
-                    path_lines = []
-                    for region, exit in path:
-                        if exit is not None:
-                            path_lines.append("{} -> {}".format(region, exit))
-                        else:
-                            path_lines.append(region)
-                    path_listings.append("{}\n        {}".format(location, "\n   =>   ".join(path_lines)))
-
-                outfile.write('\n'.join(path_listings))
-            AutoWorld.call_all(self.multiworld, "write_spoiler_end", outfile)
+                '\n'.join(['%s: %s' % (unreachable.item, unreachable) for unreachable in self.unreachables]))
+
+        if self.paths:
+            outfile.write('\n\nPaths:\n\n')
+            path_listings = []
+            for location, path in sorted(self.paths.items()):
+                path_lines = []
+                for region, exit in path:
+                    if exit is not None:
+                        path_lines.append("{} -> {}".format(region, exit))
+                    else:
+                        path_lines.append(region)
+                path_listings.append("{}\n        {}".format(location, "\n   =>   ".join(path_lines)))
+
+            outfile.write('\n'.join(path_listings))
+        AutoWorld.call_all(self.multiworld, "write_spoiler_end", outfile)
 
 
 class Tutorial(NamedTuple):
@@ -1,6 +1,7 @@
 import collections
 import itertools
 import logging
+import time
 import typing
 from collections import Counter, deque
 
@@ -20,6 +21,8 @@ def _log_fill_progress(name: str, placed: int, total_items: int) -> None:
 
 
 def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item] = tuple()) -> CollectionState:
+    if base_state.multiworld.profile:
+        base_state.multiworld.profile.sweep_from_pool_calls += 1
     new_state = base_state.copy()
     for item in itempool:
         new_state.collect(item, True)
@@ -27,6 +30,79 @@ def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item]
     return new_state
 
 
+class AssumedFillState:
+    """
+    Keeps base_state with an item pool collected into it for assumed fill.
+    Instead of re-collecting the whole pool for every maximum exploration state, items taken from or returned to the
+    pool are removed from or collected into the pool state. Removing an item of a player whose World.remove doesn't
+    exactly undo World.collect rebuilds the pool state from scratch instead.
+    """
+    base_state: CollectionState
+    item_pool: typing.List[Item]
+    pool_state: CollectionState
+    removable_players: typing.Set[int]
+
+    def __init__(self, base_state: CollectionState, item_pool: typing.List[Item]):
+        """
+        :param base_state: State assumed before fill.
+        :param item_pool: Items assumed to be collectable, kept as reference to be used on rebuilds.
+        """
+        self.base_state = base_state
+        self.item_pool = item_pool
+        self.rebuild()
+        self.removable_players = self._find_removable_players()
+
+    def _find_removable_players(self) -> typing.Set[int]:
+        """Removes the pool from a copy of pool_state, in collection order,
+        and returns the players whose prog_items and LogicMixin state end up as they were in base_state.
+        LogicMixin state that differs and isn't a dict per player can't be told apart by player, so no player is
+        removable then."""
+        test_state = self.pool_state.copy()
+        for item in self.item_pool:
+            test_state.remove(item)
+        removable_players = {player for player in {item.player for item in self.item_pool}
+                             if test_state.prog_items[player] == self.base_state.prog_items[player]}
+        player_ids = set(test_state.multiworld.get_all_ids())
+        for name, value in vars(test_state).items():
+            if name in CollectionState.__annotations__:
+                # declared by CollectionState itself, any other attributes were added by a LogicMixin
+                continue
+            base_value = getattr(self.base_state, name, None)
+            if isinstance(value, dict) and isinstance(base_value, dict) and player_ids.issuperset(value) \
+                    and player_ids.issuperset(base_value):
+                removable_players = {player for player in removable_players
+                                     if value.get(player) == base_value.get(player)}
+            elif value != base_value:
+                return set()
+        return removable_players
+
+    def rebuild(self) -> None:
+        self.pool_state = self.base_state.copy()
+        for item in self.item_pool:
+            self.pool_state.collect(item, True)
+
+    def collect(self, item: Item) -> None:
+        """Call after item was added to item_pool."""
+        self.pool_state.collect(item, True)
+
+    def remove(self, items: typing.Iterable[Item]) -> None:
+        """Call after items were taken out of item_pool."""
+        items = list(items)
+        if not all(item.player in self.removable_players for item in items):
+            self.rebuild()
+            return
+        for item in items:
+            self.pool_state.remove(item)
+            # pool_state never has its reachability updated, so base_state's regions remain a valid starting point
+            player = item.player
+            self.pool_state.reachable_regions[player] = self.base_state.reachable_regions[player].copy()
+            self.pool_state.blocked_connections[player] = self.base_state.blocked_connections[player].copy()
+
+    def sweep(self, extra_items: typing.Sequence[Item] = tuple()) -> CollectionState:
+        """Returns a new maximum exploration state for the pool plus extra_items."""
+        return sweep_from_pool(self.pool_state, extra_items)
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
@@ -44,6 +120,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     :param allow_excluded: if true and placement fails, it is re-attempted while ignoring excluded on Locations
     :param name: name of this fill step for progress logging purposes
     """
+    start = time.perf_counter()
     unplaced_items: typing.List[Item] = []
     placements: typing.List[Location] = []
     cleanup_required = False
@@ -56,6 +133,8 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     total = min(len(item_pool), len(locations))
     placed = 0
 
+    assumed_state = AssumedFillState(base_state, item_pool)
+
     while any(reachable_items.values()) and locations:
         # grab one item per player
         items_to_place = [items.pop()
@@ -65,8 +144,8 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                 if pool_item is item:
                     item_pool.pop(p)
                     break
-        maximum_exploration_state = sweep_from_pool(
-            base_state, item_pool + unplaced_items)
+        assumed_state.remove(items_to_place)
+        maximum_exploration_state = assumed_state.sweep(unplaced_items)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
 
@@ -112,7 +191,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
 
                         location.item = None
                         placed_item.location = None
-                        swap_state = sweep_from_pool(base_state, [placed_item, *item_pool] if unsafe else item_pool)
+                        swap_state = assumed_state.sweep([placed_item] if unsafe else [])
                         # unsafe means swap_state assumes we can somehow collect placed_item before item_to_place
                         # by continuing to swap, which is not guaranteed. This is unsafe because there is no mechanic
                         # to clean that up later, so there is a chance generation fails.
@@ -139,6 +218,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                                 reachable_items[placed_item.player].appendleft(
                                     placed_item)
                                 item_pool.append(placed_item)
+                                assumed_state.collect(placed_item)
 
                                 # cleanup at the end to hopefully get better errors
                                 cleanup_required = True
@@ -204,12 +284,15 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                             f'Already placed {len(placements)}: {", ".join(str(place) for place in placements)}')
 
     item_pool.extend(unplaced_items)
+    if multiworld.profile:
+        multiworld.profile.add_fill_step(name, time.perf_counter() - start)
 
 
 def remaining_fill(multiworld: MultiWorld,
                    locations: typing.List[Location],
                    itempool: typing.List[Item],
                    name: str = "Remaining") -> None:
+    start = time.perf_counter()
     unplaced_items: typing.List[Item] = []
     placements: typing.List[Location] = []
     swapped_items: typing.Counter[typing.Tuple[int, str]] = Counter()
@@ -277,6 +360,8 @@ def remaining_fill(multiworld: MultiWorld,
                         f'Already placed {len(placements)}: {", ".join(str(place) for place in placements)}')
 
     itempool.extend(unplaced_items)
+    if multiworld.profile:
+        multiworld.profile.add_fill_step(name, time.perf_counter() - start)
 
 
 def fast_fill(multiworld: MultiWorld,
@@ -589,9 +674,16 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
         }
         sphere_num: int = 1
         moved_item_count: int = 0
+        swept_sphere_count: int = 0
+        reused_sphere_count: int = 0
+        # Spheres following the current one, as found by the balancing sweep, with the state they were found in.
+        # They stay valid until items are swapped, so later spheres and balancing sweeps reuse them.
+        frontier: typing.List[typing.Tuple[typing.Set[Location], CollectionState]] = []
 
         def get_sphere_locations(sphere_state: CollectionState,
                                  locations: typing.Set[Location]) -> typing.Set[Location]:
+            nonlocal swept_sphere_count
+            swept_sphere_count += 1
             sphere_state.sweep_for_events(key_only=True, locations=locations)
             return {loc for loc in locations if sphere_state.can_reach(loc)}
 
@@ -606,7 +698,11 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            if frontier:
+                sphere_locations, state = frontier.pop(0)
+                reused_sphere_count += 1
+            else:
+                sphere_locations = get_sphere_locations(state, unchecked_locations)
             for location in sphere_locations:
                 unchecked_locations.remove(location)
                 if not location.locked:
@@ -636,16 +732,15 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         and item_percentage(player, reachables) < threshold_percentages[player])
                 }
                 if balancing_players:
-                    balancing_state = state.copy()
+                    balancing_state = state
                     balancing_unchecked_locations = unchecked_locations.copy()
                     balancing_reachables = reachable_locations_count.copy()
-                    balancing_sphere = sphere_locations.copy()
+                    balancing_sphere = sphere_locations
                     candidate_items: typing.Dict[int, typing.Set[Location]] = collections.defaultdict(set)
-                    while True:
+                    for depth in itertools.count():
                         # Check locations in the current sphere and gather progression items to swap earlier
                         for location in balancing_sphere:
                             if location.event:
-                                balancing_state.collect(location.item, True, location)
                                 player = location.item.player
                                 # only replace items that end up in another player's world
                                 if (not location.locked and not location.item.skip_in_prog_balancing and
@@ -654,7 +749,16 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                         location.progress_type != LocationProgressType.PRIORITY):
                                     candidate_items[player].add(location)
                                     logging.debug(f"Candidate item: {location.name}, {location.item.name}")
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                        if depth < len(frontier):
+                            balancing_sphere, balancing_state = frontier[depth]
+                            reused_sphere_count += 1
+                        else:
+                            balancing_state = balancing_state.copy()
+                            for location in balancing_sphere:
+                                if location.event:
+                                    balancing_state.collect(location.item, True, location)
+                            balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                            frontier.append((balancing_sphere, balancing_state))
                         for location in balancing_sphere:
                             balancing_unchecked_locations.remove(location)
                             if not location.locked:
@@ -724,6 +828,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
 
                     if old_moved_item_count < moved_item_count:
                         logging.debug(f"Moved {moved_item_count} items so far\n")
+                        frontier.clear()
                         unlocked = {fresh for player in balancing_players for fresh in unlocked_locations[player]}
                         for location in get_sphere_locations(state, unlocked):
                             unchecked_locations.remove(location)
@@ -742,6 +847,13 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                 logging.warning("Progression Balancing ran out of paths.")
                 break
 
+        logging.debug(f"Progression balancing moved {moved_item_count} items, swept {swept_sphere_count} spheres "
+                      f"and reused {reused_sphere_count} swept spheres.")
+        if multiworld.profile:
+            multiworld.profile.balancing_swaps += moved_item_count
+            multiworld.profile.balancing_spheres_swept += swept_sphere_count
+            multiworld.profile.balancing_spheres_reused += reused_sphere_count
+
 
 def swap_location_item(location_1: Location, location_2: Location, check_locked: bool = True) -> None:
     """Swaps Items of locations. Does NOT swap flags like shop_slot or locked, but does swap event"""
@@ -23,8 +23,11 @@ from typing import Sequence, Union, Optional
 
 import Utils
 import settings
+from worlds import load_component_worlds
 from worlds.LauncherComponents import Component, components, Type, SuffixIdentifier, icon_paths
 
+load_component_worlds()  # worlds register their components on import
+
 if __name__ == "__main__":
     import ModuleUpdate
     ModuleUpdate.update()
@@ -1,27 +1,52 @@
 import collections
 import concurrent.futures
+import io
 import logging
 import os
-import pickle
 import tempfile
 import time
 import zipfile
-import zlib
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import worlds
 from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, Region
 from Fill import balance_multiworld_progression, distribute_items_restrictive, distribute_planned, flood_items
 from Options import StartInventoryPool
+from Profiling import GenerationProfile
 from Utils import __version__, output_path, version_tuple
 from settings import get_settings
 from worlds import AutoWorld
-from worlds.generic.Rules import exclusion_rules, locality_rules
+from worlds.generic.Rules import exclusion_rules, locality_rules, track_rule_dependencies, untrack_rule_dependencies
 
 __all__ = ["main"]
 
 
-def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = None):
+OutputHandler = Callable[[str, Dict[str, Any], str], Any]
+"""Receives the directory of the slot files, the multidata before encoding and the spoiler text, or "" without."""
+
+
+def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = None,
+         output_handler: Optional[OutputHandler] = None):
+    """
+    Generates a multiworld from args and writes its output into a zip in the output path.
+    With output_handler, the output is handed to it in memory instead, while the slot files still exist, and no zip is
+    written.
+    """
+    # initialize the multiworld
+    multiworld = MultiWorld(args.multi)
+    profile_report = getattr(args, "profile_report", None)
+    if not profile_report:
+        return _generate(multiworld, args, seed, baked_server_options, output_handler)
+
+    multiworld.profile = GenerationProfile()
+    try:
+        return _generate(multiworld, args, seed, baked_server_options, output_handler)
+    finally:  # also if generation failed, to show how far it got
+        multiworld.profile.write(multiworld, profile_report)
+
+
+def _generate(multiworld: MultiWorld, args, seed, baked_server_options: Optional[Dict[str, object]],
+              output_handler: Optional[OutputHandler]) -> MultiWorld:
     if not baked_server_options:
         baked_server_options = get_settings().server_options.as_dict()
     assert isinstance(baked_server_options, dict)
@@ -30,8 +55,12 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         output_path.cached_path = args.outputpath
 
     start = time.perf_counter()
-    # initialize the multiworld
-    multiworld = MultiWorld(args.multi)
+
+    def start_phase(name: str) -> None:
+        if multiworld.profile:
+            multiworld.profile.start_phase(name)
+
+    start_phase("setup")
 
     logger = logging.getLogger()
     multiworld.set_seed(seed, args.race, str(args.outputname) if args.outputname else None)
@@ -74,30 +103,35 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     multiworld.state = CollectionState(multiworld)
     logger.info('Archipelago Version %s  -  Seed: %s\n', __version__, multiworld.seed)
 
-    logger.info(f"Found {len(AutoWorld.AutoWorldRegister.world_types)} World Types:")
-    longest_name = max(len(text) for text in AutoWorld.AutoWorldRegister.world_types)
+    # listed from the world index, as importing unused worlds now would add logic mixins to existing states
+    from worlds import world_index
+    logger.info(f"Found {len(world_index)} World Types:")
+    longest_name = max(len(text) for text in world_index)
 
     max_item = 0
     max_location = 0
-    for cls in AutoWorld.AutoWorldRegister.world_types.values():
-        if cls.item_id_to_name:
-            max_item = max(max_item, max(cls.item_id_to_name))
-            max_location = max(max_location, max(cls.location_id_to_name))
+    for entry in world_index.values():
+        if entry["data_package"]["item_name_to_id"]:
+            max_item = max(max_item, max(entry["data_package"]["item_name_to_id"].values()))
+            max_location = max(max_location, max(entry["data_package"]["location_name_to_id"].values()))
 
     item_digits = len(str(max_item))
     location_digits = len(str(max_location))
-    item_count = len(str(max(len(cls.item_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
-    location_count = len(str(max(len(cls.location_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
+    item_count = len(str(max(len(entry["data_package"]["item_name_to_id"]) for entry in world_index.values())))
+    location_count = len(str(max(len(entry["data_package"]["location_name_to_id"])
+                                 for entry in world_index.values())))
     del max_item, max_location
 
-    for name, cls in AutoWorld.AutoWorldRegister.world_types.items():
-        if not cls.hidden and len(cls.item_names) > 0:
-            logger.info(f" {name:{longest_name}}: {len(cls.item_names):{item_count}} "
-                        f"Items (IDs: {min(cls.item_id_to_name):{item_digits}} - "
-                        f"{max(cls.item_id_to_name):{item_digits}}) | "
-                        f"{len(cls.location_names):{location_count}} "
-                        f"Locations (IDs: {min(cls.location_id_to_name):{location_digits}} - "
-                        f"{max(cls.location_id_to_name):{location_digits}})")
+    for name, entry in world_index.items():
+        item_ids = entry["data_package"]["item_name_to_id"].values()
+        location_ids = entry["data_package"]["location_name_to_id"].values()
+        if not entry["hidden"] and len(item_ids) > 0:
+            logger.info(f" {name:{longest_name}}: {len(item_ids):{item_count}} "
+                        f"Items (IDs: {min(item_ids):{item_digits}} - "
+                        f"{max(item_ids):{item_digits}}) | "
+                        f"{len(location_ids):{location_count}} "
+                        f"Locations (IDs: {min(location_ids):{location_digits}} - "
+                        f"{max(location_ids):{location_digits}})")
 
     del item_digits, location_digits, item_count, location_count
 
@@ -105,6 +139,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     if not args.skip_output:
         AutoWorld.call_stage(multiworld, "assert_generate")
 
+    start_phase("generate_early")
     AutoWorld.call_all(multiworld, "generate_early")
 
     logger.info('')
@@ -132,12 +167,15 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
             del early
 
     logger.info('Creating MultiWorld.')
+    start_phase("create_regions")
     AutoWorld.call_all(multiworld, "create_regions")
 
     logger.info('Creating Items.')
+    start_phase("create_items")
     AutoWorld.call_all(multiworld, "create_items")
 
     logger.info('Calculating Access Rules.')
+    start_phase("set_rules")
 
     for player in multiworld.player_ids:
         # items can't be both local and non-local, prefer local
@@ -164,7 +202,11 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     else:
         multiworld.worlds[1].options.non_local_items.value = set()
         multiworld.worlds[1].options.local_items.value = set()
-    
+
+    if multiworld.profile:
+        multiworld.profile.profile_rules(multiworld)
+
+    start_phase("generate_basic")
     AutoWorld.call_all(multiworld, "generate_basic")
 
     # remove starting inventory from pool items.
@@ -285,27 +327,36 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         multiworld._all_state = None
 
     logger.info("Running Item Plando.")
+    start_phase("plando")
 
     distribute_planned(multiworld)
 
     logger.info('Running Pre Main Fill.')
+    start_phase("pre_fill")
 
     AutoWorld.call_all(multiworld, "pre_fill")
 
+    track_rule_dependencies(multiworld)
+
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
+    start_phase("fill")
 
     if multiworld.algorithm == 'flood':
         flood_items(multiworld)  # different algo, biased towards early game progress items
     elif multiworld.algorithm == 'balanced':
         distribute_items_restrictive(multiworld)
 
+    start_phase("post_fill")
     AutoWorld.call_all(multiworld, 'post_fill')
 
+    start_phase("balancing")
     if multiworld.players > 1 and not args.skip_prog_balancing:
         balance_multiworld_progression(multiworld)
     else:
         logger.info("Progression balancing skipped.")
 
+    untrack_rule_dependencies(multiworld)
+
     # we're about to output using multithreading, so we're removing the global random state to prevent accidental use
     multiworld.random.passthrough = False
 
@@ -314,6 +365,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         return multiworld
 
     logger.info(f'Beginning output...')
+    start_phase("output")
     outfilebase = 'AP_' + multiworld.seed_name
 
     output = tempfile.TemporaryDirectory()
@@ -321,7 +373,11 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
         with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
-            check_accessibility_task = pool.submit(multiworld.fulfills_accessibility)
+            # can_beat_game continues from what the accessibility check collected, the playthrough from its spheres
+            accessibility_state = CollectionState(multiworld)
+            accessibility_spheres: List[Set[Location]] = []
+            check_accessibility_task = pool.submit(multiworld.fulfills_accessibility, accessibility_state,
+                                                   accessibility_spheres)
 
             output_file_futures = [pool.submit(AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
             for player in output_players:
@@ -414,16 +470,18 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                     "datapackage": data_package,
                 }
                 AutoWorld.call_all(multiworld, "modify_multidata", multidata)
+                if output_handler:
+                    return multidata
 
-                multidata = zlib.compress(pickle.dumps(multidata), 9)
+                multidata = NetUtils.encode_multidata_format(multidata, get_settings().generator.multidata_format)
 
                 with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
                     f.write(multidata)
 
-            output_file_futures.append(pool.submit(write_multidata))
+            multidata_future = pool.submit(write_multidata)
+            output_file_futures.append(multidata_future)
             if not check_accessibility_task.result():
-                if not multiworld.can_beat_game():
+                if not multiworld.can_beat_game(accessibility_state):
                     raise Exception("Game appears as unbeatable. Aborting.")
                 else:
                     logger.warning("Location Accessibility requirements not fulfilled.")
@@ -436,17 +494,30 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
 
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
-            multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
+            start_phase("playthrough")
+            multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2, spheres=accessibility_spheres)
 
+        spoiler = ""
         if args.spoiler:
-            multiworld.spoiler.to_file(os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase))
-
-        zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
-        logger.info(f"Creating final archive at {zipfilename}")
-        with zipfile.ZipFile(zipfilename, mode="w", compression=zipfile.ZIP_DEFLATED,
-                             compresslevel=9) as zf:
-            for file in os.scandir(temp_dir):
-                zf.write(file.path, arcname=file.name)
+            start_phase("spoiler")
+            if output_handler:
+                with io.StringIO() as spoiler_file:
+                    multiworld.spoiler.write(spoiler_file)
+                    spoiler = spoiler_file.getvalue()
+            else:
+                multiworld.spoiler.to_file(os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase))
+
+        if output_handler:
+            start_phase("handle_output")
+            output_handler(temp_dir, multidata_future.result(), spoiler)
+        else:
+            zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
+            logger.info(f"Creating final archive at {zipfilename}")
+            start_phase("archive")
+            with zipfile.ZipFile(zipfilename, mode="w", compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=9) as zf:
+                for file in os.scandir(temp_dir):
+                    zf.write(file.path, arcname=file.name)
 
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return multiworld
@@ -3,6 +3,8 @@ from __future__ import annotations
 import argparse
 import asyncio
 import collections
+import concurrent.futures
+import contextvars
 import copy
 import datetime
 import functools
@@ -11,7 +13,9 @@ import inspect
 import itertools
 import logging
 import math
+import mmap
 import operator
+import os
 import pickle
 import random
 import threading
@@ -39,7 +43,7 @@ import NetUtils
 import Utils
 from Utils import version_tuple, restricted_loads, Version, async_start
 from NetUtils import Endpoint, ClientStatus, NetworkItem, decode, encode, NetworkPlayer, Permission, NetworkSlot, \
-    SlotType, LocationStore
+    SlotType, LocationStore, decode_multidata
 
 min_client_version = Version(0, 1, 6)
 colorama.init()
@@ -113,6 +117,7 @@ class Client(Endpoint):
         self.team = None
         self.slot = None
         self.send_index = 0
+        self.sending_items = False
         self.tags = []
         self.messageprocessor = client_message_processor(ctx, self)
         self.ctx = weakref.ref(ctx)
@@ -174,7 +179,14 @@ class Context:
     location_name_groups: typing.Dict[str, typing.Dict[str, typing.Set[str]]]
     all_item_and_group_names: typing.Dict[str, typing.Set[str]]
     all_location_and_group_names: typing.Dict[str, typing.Set[str]]
+    # fuzzy indexes for get_intended_text, per game
+    item_name_indexes: typing.Dict[str, Utils.FuzzyIndex]
+    location_name_indexes: typing.Dict[str, Utils.FuzzyIndex]
+    item_and_group_name_indexes: typing.Dict[str, Utils.FuzzyIndex]
+    location_and_group_name_indexes: typing.Dict[str, Utils.FuzzyIndex]
     non_hintable_names: typing.Dict[str, typing.Set[str]]
+    save_journal_compaction = 60
+    """number of journal entries after which the next save writes a full snapshot instead"""
 
     def __init__(self, host: str, port: int, server_password: str, password: str, location_check_points: int,
                  hint_cost: int, item_cheat: bool, release_mode: str = "disabled", collect_mode="disabled",
@@ -201,6 +213,10 @@ class Context:
         self.server = None
         self.countdown_timer = 0
         self.received_items = {}
+        self.dirty_item_slots: typing.Set[team_slot] = set()  # slots with received items not yet sent
+        self.pending_team_messages: typing.Dict[int, typing.List[dict]] = {}  # broadcast on next send_new_items
+        self.pending_sends: typing.List[typing.Callable[[], None]] = []  # called after next send_new_items' items
+        self.send_new_items_scheduled = False
         self.start_inventory = {}
         self.name_aliases: typing.Dict[team_slot, str] = {}
         self.location_checks = collections.defaultdict(set)
@@ -208,6 +224,9 @@ class Context:
         self.location_check_points = location_check_points
         self.hints_used = collections.defaultdict(int)
         self.hints: typing.Dict[team_slot, typing.Set[NetUtils.Hint]] = collections.defaultdict(set)
+        # (team, finding player, location) -> (holding slot, hint) of each unfound hint, to mark it found on check
+        self.unfound_hints: typing.Dict[typing.Tuple[int, int, int],
+                                        typing.Set[typing.Tuple[int, NetUtils.Hint]]] = {}
         self.release_mode: str = release_mode
         self.remaining_mode: str = remaining_mode
         self.collect_mode: str = collect_mode
@@ -226,6 +245,16 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread = None
         self.save_dirty = False
+        self.save_journal = False
+        try:
+            self.main_loop: typing.Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:  # not created within an event loop, like in tests
+            self.main_loop = None
+        self.save_journal_entries: typing.Optional[int] = None  # None while no snapshot was written
+        self.journal_received_items: typing.Dict[typing.Tuple[int, int, bool], int] = {}  # item counts saved
+        self.journal_location_checks: typing.Dict[team_slot, typing.Set[int]] = collections.defaultdict(set)
+        self.journal_hints: typing.Dict[team_slot, typing.Set[NetUtils.Hint]] = collections.defaultdict(set)
+        self.journal_stored_data_keys: typing.Set[str] = set()
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -244,21 +273,27 @@ class Context:
         self.location_name_groups = {}
         self.all_item_and_group_names = {}
         self.all_location_and_group_names = {}
+        self.item_name_indexes = {}
+        self.location_name_indexes = {}
+        self.item_and_group_name_indexes = {}
+        self.location_and_group_name_indexes = {}
         self.non_hintable_names = collections.defaultdict(frozenset)
 
         self._load_game_data()
 
     # Data package retrieval
     def _load_game_data(self):
-        import worlds
-        self.gamespackage = worlds.network_data_package["games"]
-
-        self.item_name_groups = {world_name: world.item_name_groups for world_name, world in
-                                 worlds.AutoWorldRegister.world_types.items()}
-        self.location_name_groups = {world_name: world.location_name_groups for world_name, world in
-                                     worlds.AutoWorldRegister.world_types.items()}
-        for world_name, world in worlds.AutoWorldRegister.world_types.items():
-            self.non_hintable_names[world_name] = world.hint_blacklist
+        # the world index holds everything the server needs, without importing the worlds
+        from worlds import network_data_package, world_index
+        # top level is copied, as embedded data packages replace games in it
+        self.gamespackage = dict(network_data_package["games"])
+
+        self.item_name_groups = {game: entry["data_package"]["item_name_groups"]
+                                 for game, entry in world_index.items()}
+        self.location_name_groups = {game: entry["data_package"]["location_name_groups"]
+                                     for game, entry in world_index.items()}
+        for game, entry in world_index.items():
+            self.non_hintable_names[game] = frozenset(entry["hint_blacklist"])
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
@@ -272,6 +307,12 @@ class Context:
                 set(game_package["item_name_to_id"]) | set(self.item_name_groups[game_name])
             self.all_location_and_group_names[game_name] = \
                 set(game_package["location_name_to_id"]) | set(self.location_name_groups.get(game_name, []))
+            # indexed on first use, as most games are never looked up
+            self.item_name_indexes[game_name] = Utils.FuzzyIndex(game_package["item_name_to_id"])
+            self.location_name_indexes[game_name] = Utils.FuzzyIndex(game_package["location_name_to_id"])
+            self.item_and_group_name_indexes[game_name] = Utils.FuzzyIndex(self.all_item_and_group_names[game_name])
+            self.location_and_group_name_indexes[game_name] = \
+                Utils.FuzzyIndex(self.all_location_and_group_names[game_name])
 
     def item_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["item_name_to_id"] if game in self.gamespackage else None
@@ -375,7 +416,10 @@ class Context:
                     raise Exception("No .archipelago found in archive.")
         else:
             with open(multidatapath, 'rb') as f:
-                data = f.read()
+                if os.fstat(f.fileno()).st_size < 2:
+                    raise Exception(f"{multidatapath} is empty or truncated.")
+                # format 4 location tables are used in place, so only pages that are accessed get read
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
         self._load(self.decompress(data), {}, use_embedded_server_options)
         self.data_filename = multidatapath
@@ -383,8 +427,10 @@ class Context:
     @staticmethod
     def decompress(data: bytes) -> dict:
         format_version = data[0]
-        if format_version > 3:
+        if format_version > 4:
             raise Utils.VersionException("Incompatible multidata.")
+        if format_version == 4:
+            return decode_multidata(data)
         return restricted_loads(zlib.decompress(data[1:]))
 
     def _load(self, decoded_obj: dict, game_data_packages: typing.Dict[str, typing.Any],
@@ -416,17 +462,18 @@ class Context:
             self.player_names[0, slot_id] = slot_info.name
             self.player_name_lookup[slot_info.name] = 0, slot_id
             self.read_data[f"hints_{0}_{slot_id}"] = lambda local_team=0, local_player=slot_id: \
-                list(self.get_rechecked_hints(local_team, local_player))
+                list(self.hints[local_team, local_player])
             self.read_data[f"client_status_{0}_{slot_id}"] = lambda local_team=0, local_player=slot_id: \
                 self.client_game_state[local_team, local_player]
 
         self.seed_name = decoded_obj["seed_name"]
         self.random.seed(self.seed_name)
         self.connect_names = decoded_obj['connect_names']
-        self.locations = LocationStore(decoded_obj.pop("locations"))  # pre-emptively free memory
+        locations = decoded_obj.pop("locations")  # pre-emptively free memory
+        self.locations = locations if isinstance(locations, LocationStore) else LocationStore(locations)
         self.slot_data = decoded_obj['slot_data']
-        for slot, data in self.slot_data.items():
-            self.read_data[f"slot_data_{slot}"] = lambda data=data: data
+        for slot in self.slot_data:  # slot_data may be decompressed lazily per slot
+            self.read_data[f"slot_data_{slot}"] = lambda local_slot=slot: self.slot_data[local_slot]
         self.er_hint_data = {int(player): {int(address): name for address, name in loc_data.items()}
                              for player, loc_data in decoded_obj["er_hint_data"].items()}
 
@@ -436,6 +483,7 @@ class Context:
 
         for slot, hints in decoded_obj["precollected_hints"].items():
             self.hints[0, slot].update(hints)
+        self.recheck_hints()
 
         # declare slots that aren't players as done
         for slot, slot_info in self.slot_info.items():
@@ -448,9 +496,12 @@ class Context:
             self._set_options(server_options)
 
         # embedded data package
-        for game_name, data in decoded_obj.get("datapackage", {}).items():
+        embedded_data_packages = decoded_obj.get("datapackage", {})
+        for game_name in embedded_data_packages:
             if game_name in game_data_packages:
                 data = game_data_packages[game_name]
+            else:
+                data = embedded_data_packages[game_name]
             logging.info(f"Loading embedded data package for game {game_name}")
             self.gamespackage[game_name] = data
             self.item_name_groups[game_name] = data["item_name_groups"]
@@ -479,9 +530,20 @@ class Context:
 
     def _save(self, exit_save: bool = False) -> bool:
         try:
-            encoded_save = pickle.dumps(self.get_save())
+            if self.save_journal:
+                if not self.journal_needs_snapshot(exit_save):
+                    journal_entry = encode_save_journal_entry(self.call_on_loop(self.get_save_journal_entry))
+                    with open(self.save_filename + ".journal", "ab") as f:
+                        f.write(journal_entry)
+                    return True
+                encoded_save = self.call_on_loop(self.encode_save_snapshot)
+            else:
+                encoded_save = pickle.dumps(self.get_save())
             with open(self.save_filename, "wb") as f:
                 f.write(zlib.compress(encoded_save))
+            if self.save_journal:
+                with open(self.save_filename + ".journal", "wb"):
+                    pass  # folded into the snapshot
         except Exception as e:
             logging.exception(e)
             return False
@@ -499,7 +561,12 @@ class Context:
             try:
                 with open(self.save_filename, 'rb') as f:
                     save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                try:
+                    with open(self.save_filename + ".journal", 'rb') as f:
+                        save_data = apply_save_journal(save_data, read_save_journal(f.read()))
+                except FileNotFoundError:
+                    pass
+                self.set_save(save_data)
             except FileNotFoundError:
                 logging.error('No save data found, starting a new game')
             except Exception as e:
@@ -527,21 +594,61 @@ class Context:
                         logging.info(f"Saving failed. Retry in {self.auto_save_interval} seconds.")
                     else:
                         self.save_dirty = False
-            self.auto_saver_thread = threading.Thread(target=save_regularly, daemon=True)
+            # in a copy of the current context, for context dependent logging like the WebHost's
+            self.auto_saver_thread = threading.Thread(target=contextvars.copy_context().run, args=(save_regularly,),
+                                                      daemon=True)
             self.auto_saver_thread.start()
 
             import atexit
             atexit.register(self._save, True)  # make sure we save on exit too
 
+    def call_on_loop(self, function: typing.Callable[[], _Return]) -> _Return:
+        """Returns function(), called on main_loop while it runs, for reading data the event loop modifies.
+        Waits for the result when called from another thread, like the autosave thread."""
+        loop = self.main_loop
+        if not loop or not loop.is_running():
+            return function()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return function()
+        except RuntimeError:  # no event loop running in this thread
+            pass
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function())
+                except BaseException as e:
+                    future.set_exception(e)
+
+        try:
+            loop.call_soon_threadsafe(run)
+        except RuntimeError:  # loop closed meanwhile
+            return function()
+        while True:
+            try:
+                return future.result(1)
+            except concurrent.futures.TimeoutError:
+                if not loop.is_running() and future.cancel():
+                    # loop stopped before getting to it, so nothing modifies the data anymore
+                    return function()
+
     def get_save(self) -> dict:
-        self.recheck_hints()
+        d = self.get_small_save_data()
+        d["received_items"] = self.received_items
+        d["hints"] = dict(self.hints)
+        d["location_checks"] = dict(self.location_checks)
+        d["stored_data"] = self.stored_data
+        return d
+
+    def get_small_save_data(self) -> dict:
+        """Returns the parts of get_save other than save_journal_deltas, which journal entries contain in full."""
         d = {
             "version": self.save_version,
             "connect_names": self.connect_names,
-            "received_items": self.received_items,
             "hints_used": dict(self.hints_used),
-            "hints": dict(self.hints),
-            "location_checks": dict(self.location_checks),
             "name_aliases": self.name_aliases,
             "client_game_state": dict(self.client_game_state),
             "client_activity_timers": tuple(
@@ -550,7 +657,6 @@ class Context:
                 (key, value.timestamp()) for key, value in self.client_connection_timers.items()),
             "random_state": self.random.getstate(),
             "group_collected": dict(self.group_collected),
-            "stored_data": self.stored_data,
             "game_options": {"hint_cost": self.hint_cost, "location_check_points": self.location_check_points,
                              "server_password": self.server_password, "password": self.password,
                              "release_mode": self.release_mode,
@@ -561,6 +667,47 @@ class Context:
 
         return d
 
+    def journal_needs_snapshot(self, exit_save: bool = False) -> bool:
+        """Whether the next save has to be a full snapshot, folding in the journal."""
+        return exit_save or self.save_journal_entries is None or \
+            self.save_journal_entries >= self.save_journal_compaction
+
+    def encode_save_snapshot(self) -> bytes:
+        """Returns the pickled get_save, resetting the save journal to start from it.
+        Call through call_on_loop while journaling, so the following entries neither miss nor repeat changes."""
+        self.reset_save_journal()
+        return pickle.dumps(self.get_save())
+
+    def reset_save_journal(self):
+        """Call when writing a full snapshot, so the following journal entries start from it."""
+        self.save_journal_entries = 0
+        self.journal_received_items = {key: len(items) for key, items in self.received_items.items()}
+        self.journal_location_checks = collections.defaultdict(set)
+        self.journal_hints = collections.defaultdict(set)
+        self.journal_stored_data_keys = set()
+
+    def get_save_journal_entry(self) -> dict:
+        """Returns the changes since the last snapshot or journal entry.
+        Received items, location checks, hints and stored data are only included if new,
+        the remaining, small parts of get_save are included in full.
+        Call through call_on_loop, as it takes the changes recorded by the event loop."""
+        entry = self.get_small_save_data()
+        received_items: typing.Dict[typing.Tuple[int, int, bool], typing.List[NetworkItem]] = {}
+        for key, items in self.received_items.items():
+            new_items = items[self.journal_received_items.get(key, 0):]
+            if new_items:
+                received_items[key] = new_items
+                self.journal_received_items[key] = self.journal_received_items.get(key, 0) + len(new_items)
+        location_checks, self.journal_location_checks = self.journal_location_checks, collections.defaultdict(set)
+        hints, self.journal_hints = self.journal_hints, collections.defaultdict(set)
+        stored_data_keys, self.journal_stored_data_keys = self.journal_stored_data_keys, set()
+        entry["received_items"] = received_items
+        entry["location_checks"] = dict(location_checks)
+        entry["hints"] = dict(hints)
+        entry["stored_data"] = {key: self.stored_data[key] for key in stored_data_keys}
+        self.save_journal_entries += 1
+        return entry
+
     def set_save(self, savedata: dict):
         if self.connect_names != savedata["connect_names"]:
             raise Exception("This savegame does not appear to match the loaded multiworld.")
@@ -579,6 +726,7 @@ class Context:
             {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
              in savedata["client_activity_timers"]})
         self.location_checks.update(savedata["location_checks"])
+        self.recheck_hints()
         self.random.setstate(savedata["random_state"])
 
         if "game_options" in savedata:
@@ -609,17 +757,35 @@ class Context:
             return max(1, int(self.hint_cost * 0.01 * len(self.locations[slot])))
         return 0
 
-    def recheck_hints(self, team: typing.Optional[int] = None, slot: typing.Optional[int] = None):
-        for hint_team, hint_slot in self.hints:
-            if (team is None or team == hint_team) and (slot is None or slot == hint_slot):
-                self.hints[hint_team, hint_slot] = {
-                    hint.re_check(self, hint_team) for hint in
-                    self.hints[hint_team, hint_slot]
-                }
-
-    def get_rechecked_hints(self, team: int, slot: int):
-        self.recheck_hints(team, slot)
-        return self.hints[team, slot]
+    def recheck_hints(self):
+        """Re-checks all hints and rebuilds the index of unfound ones. Only needed after loading hints,
+        afterwards add_hint and mark_hints_found keep them up to date."""
+        self.unfound_hints = {}
+        for (team, slot), hints in self.hints.items():
+            hints = self.hints[team, slot] = {hint.re_check(self, team) for hint in hints}
+            for hint in hints:
+                if not hint.found:
+                    self.unfound_hints.setdefault((team, hint.finding_player, hint.location), set()).add((slot, hint))
+
+    def add_hint(self, team: int, slot: int, hint: NetUtils.Hint):
+        """Remembers hint for slot, indexing it by its location while it is not found."""
+        self.hints[team, slot].add(hint)
+        self.journal_hints[team, slot].add(hint)
+        if not hint.found:
+            self.unfound_hints.setdefault((team, hint.finding_player, hint.location), set()).add((slot, hint))
+
+    def mark_hints_found(self, team: int, finding_player: int, locations: typing.Iterable[int]) -> typing.Set[int]:
+        """Replaces the unfound hints of newly checked locations with found ones.
+        Returns the slots whose hints changed."""
+        changed_slots: typing.Set[int] = set()
+        for location in locations:
+            for slot, hint in self.unfound_hints.pop((team, finding_player, location), ()):
+                found_hint = hint._replace(found=True)
+                for hints in (self.hints[team, slot], self.journal_hints[team, slot]):
+                    hints.discard(hint)
+                    hints.add(found_hint)
+                changed_slots.add(slot)
+        return changed_slots
 
     def get_players_package(self):
         return [NetworkPlayer(t, p, self.get_aliased_name(t, p), n) for (t, p), n in self.player_names.items()]
@@ -676,10 +842,10 @@ class Context:
                 # since hints are bidirectional, finding player and receiving player,
                 # we can check once if hint already exists
                 if hint not in self.hints[team, hint.finding_player]:
-                    self.hints[team, hint.finding_player].add(hint)
+                    self.add_hint(team, hint.finding_player, hint)
                     new_hint_events.add(hint.finding_player)
                     for player in self.slot_set(hint.receiving_player):
-                        self.hints[team, player].add(hint)
+                        self.add_hint(team, player, hint)
                         new_hint_events.add(player)
 
             logging.info("Notice (Team #%d): %s" % (team + 1, format_hint(self, team, hint)))
@@ -707,15 +873,18 @@ class Context:
         self.save()  # save goal completion flag
 
     def on_new_hint(self, team: int, slot: int):
-        key: str = f"_read_hints_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
-        if targets:
-            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.hints[team, slot]}])
+        self.on_changed_hints(team, slot)
         self.broadcast(self.clients[team][slot], [{
             "cmd": "RoomUpdate",
             "hint_points": get_slot_points(self, team, slot)
         }])
 
+    def on_changed_hints(self, team: int, slot: int):
+        key: str = f"_read_hints_{team}_{slot}"
+        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        if targets:
+            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.hints[team, slot]}])
+
     def on_client_status_change(self, team: int, slot: int):
         key: str = f"_read_client_status_{team}_{slot}"
         targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
@@ -878,6 +1047,50 @@ def get_status_string(ctx: Context, team: int, tag: str):
     return text
 
 
+save_journal_deltas = frozenset({"received_items", "location_checks", "hints", "stored_data"})
+"""entries of a save journal entry that only contain changes, everything else replaces the previous value"""
+
+
+def encode_save_journal_entry(entry: dict) -> bytes:
+    """Returns entry as appended to the journal, so it can be read with the entries before it."""
+    encoded_entry = zlib.compress(pickle.dumps(entry))
+    return len(encoded_entry).to_bytes(4, "little") + encoded_entry
+
+
+def read_save_journal(data: bytes) -> typing.List[dict]:
+    """Reads journal entries as written by encode_save_journal_entry, ignoring an incomplete entry at the end."""
+    entries = []
+    offset = 0
+    while offset + 4 <= len(data):
+        length = int.from_bytes(data[offset:offset + 4], "little")
+        if offset + 4 + length > len(data):
+            logging.warning("Ignoring incomplete save journal entry.")
+            break
+        entries.append(restricted_loads(zlib.decompress(data[offset + 4:offset + 4 + length])))
+        offset += 4 + length
+    return entries
+
+
+def apply_save_journal(savedata: dict, journal: typing.Iterable[dict]) -> dict:
+    """Folds journal entries, as returned by Context.get_save_journal_entry, into savedata from Context.get_save."""
+    for entry in journal:
+        for key, items in entry["received_items"].items():
+            savedata["received_items"].setdefault(key, []).extend(items)
+        for key, locations in entry["location_checks"].items():
+            savedata["location_checks"].setdefault(key, set()).update(locations)
+        for key, hints in entry["hints"].items():
+            saved_hints = savedata["hints"].setdefault(key, set())
+            for hint in hints:
+                if hint.found:  # replaces the unfound hint of an earlier entry
+                    saved_hints.discard(hint._replace(found=False))
+                saved_hints.add(hint)
+        savedata.setdefault("stored_data", {}).update(entry["stored_data"])
+        for key, value in entry.items():
+            if key not in save_journal_deltas:
+                savedata[key] = value
+    return savedata
+
+
 def get_received_items(ctx: Context, team: int, player: int, remote_items: bool) -> typing.List[NetworkItem]:
     return ctx.received_items.setdefault((team, player, remote_items), [])
 
@@ -887,25 +1100,61 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Sends pending team messages, new items of dirty slots and then the other pending sends, in that order.
+    Calls within one event loop iteration are coalesced into one send."""
+    if ctx.send_new_items_scheduled:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _send_new_items(ctx)
+    else:
+        ctx.send_new_items_scheduled = True
+        loop.call_soon(_send_new_items, ctx)
+
+
+def _send_new_items(ctx: Context):
+    ctx.send_new_items_scheduled = False
+    pending_team_messages, ctx.pending_team_messages = ctx.pending_team_messages, {}
+    for team, msgs in pending_team_messages.items():
+        ctx.broadcast_team(team, msgs)
+    dirty_item_slots, ctx.dirty_item_slots = ctx.dirty_item_slots, set()
+    for team, slot in dirty_item_slots:
+        for client in ctx.clients.get(team, {}).get(slot, ()):
+            if not client.no_items and not client.sending_items:
+                client.sending_items = True
+                async_start(send_received_items(ctx, client))
+    pending_sends, ctx.pending_sends = ctx.pending_sends, []
+    for send in pending_sends:
+        send()
+
+
+async def send_received_items(ctx: Context, client: Client):
+    """Sends ReceivedItems until the client is up-to-date, with at most one message in flight,
+    so items that arrive while a slow client is still receiving get merged into the next message."""
+    try:
+        while not client.no_items:
+            start_inventory = get_start_inventory(ctx, client.slot, client.remote_start_inventory)
+            items = get_received_items(ctx, client.team, client.slot, client.remote_items)
+            if len(start_inventory) + len(items) <= client.send_index:
+                break
+            first_new_item = max(0, client.send_index - len(start_inventory))
+            msg = {"cmd": "ReceivedItems",
+                   "index": client.send_index,
+                   "items": start_inventory[client.send_index:] + items[first_new_item:]}
+            client.send_index = len(start_inventory) + len(items)
+            if not await ctx.send_msgs(client, [msg]):
+                break
+    finally:
+        client.sending_items = False
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
-    ctx.broadcast(ctx.clients[team][slot],
-                  [{"cmd": "RoomUpdate", "checked_locations": get_checked_checks(ctx, team, slot)}])
+    # sent after the items and messages of checks registered before
+    ctx.pending_sends.append(functools.partial(
+        ctx.broadcast, ctx.clients[team][slot],
+        [{"cmd": "RoomUpdate", "checked_locations": get_checked_checks(ctx, team, slot)}]))
+    send_new_items(ctx)
 
 
 def release_player(ctx: Context, team: int, slot: int):
@@ -948,6 +1197,7 @@ def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
             get_received_items(ctx, team, target, True).append(item)
+        ctx.dirty_item_slots.add((team, target))
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
@@ -965,16 +1215,19 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             logging.info('(Team #%d) %s sent %s to %s (%s)' % (
                 team + 1, ctx.player_names[(team, slot)], ctx.item_names[item_id],
                 ctx.player_names[(team, target_player)], ctx.location_names[location]))
-            info_text = json_format_send_event(new_item, target_player)
-            ctx.broadcast_team(team, [info_text])
+            ctx.pending_team_messages.setdefault(team, []).append(json_format_send_event(new_item, target_player))
 
         ctx.location_checks[team, slot] |= new_locations
-        send_new_items(ctx)
-        ctx.broadcast(ctx.clients[team][slot], [{
+        ctx.journal_location_checks[team, slot] |= new_locations
+        # sent after the items and messages of these checks
+        ctx.pending_sends.append(functools.partial(ctx.broadcast, ctx.clients[team][slot], [{
             "cmd": "RoomUpdate",
             "hint_points": get_slot_points(ctx, team, slot),
             "checked_locations": new_locations,  # send back new checks only
-        }])
+        }]))
+        for hint_slot in ctx.mark_hints_found(team, slot, new_locations):
+            ctx.pending_sends.append(functools.partial(ctx.on_changed_hints, team, hint_slot))
+        send_new_items(ctx)
 
         ctx.save()
 
@@ -1046,6 +1299,10 @@ def json_format_send_event(net_item: NetworkItem, receiving_player: int):
 
 
 def get_intended_text(input_text: str, possible_answers) -> typing.Tuple[str, bool, str]:
+    if isinstance(possible_answers, Utils.FuzzyIndex) and len(possible_answers) > 1:
+        exact_match = possible_answers.get_exact_match(input_text)
+        if exact_match is not None:
+            return exact_match, True, "Perfect Match"
     picks = Utils.get_fuzzy_results(input_text, possible_answers, limit=2)
     if len(picks) > 1:
         dif = picks[0][1] - picks[1][1]
@@ -1404,12 +1661,13 @@ class ClientMessageProcessor(CommonCommandProcessor):
             names = self.ctx.item_names_for_game(self.ctx.games[self.client.slot])
             item_name, usable, response = get_intended_text(
                 item_name,
-                names
+                self.ctx.item_name_indexes[self.ctx.games[self.client.slot]]
             )
             if usable:
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.dirty_item_slots.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1428,9 +1686,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
         cost = self.ctx.get_hint_cost(self.client.slot)
 
         if not input_text:
-            hints = {hint.re_check(self.ctx, self.client.team) for hint in
-                     self.ctx.hints[self.client.team, self.client.slot]}
-            self.ctx.hints[self.client.team, self.client.slot] = hints
+            hints = self.ctx.hints[self.client.team, self.client.slot]
             self.ctx.notify_hints(self.client.team, list(hints), recipients=(self.client.slot,))
             self.output(f"A hint costs {self.ctx.get_hint_cost(self.client.slot)} points. "
                         f"You have {points_available} points.")
@@ -1461,9 +1717,9 @@ class ClientMessageProcessor(CommonCommandProcessor):
             if game not in self.ctx.all_item_and_group_names:
                 self.output("Can't look up item/location for unknown game. Hint for ID instead.")
                 return False
-            names = self.ctx.all_location_and_group_names[game] \
+            names = self.ctx.location_and_group_name_indexes[game] \
                 if for_location else \
-                self.ctx.all_item_and_group_names[game]
+                self.ctx.item_and_group_name_indexes[game]
             hint_name, usable, response = get_intended_text(input_text, names)
 
             if usable:
@@ -1810,6 +2066,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
             ctx.stored_data[args["key"]] = args["value"] = value
+            ctx.journal_stored_data_keys.add(args["key"])
             targets = set(ctx.stored_data_notification_clients[args["key"]])
             if args.get("want_reply", True):
                 targets.add(client)
@@ -1982,7 +2239,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             team, slot = self.ctx.player_name_lookup[seeked_player]
             item_name = " ".join(item_name)
             names = self.ctx.item_names_for_game(self.ctx.games[slot])
-            item_name, usable, response = get_intended_text(item_name, names)
+            item_name, usable, response = get_intended_text(item_name, self.ctx.item_name_indexes[self.ctx.games[slot]])
             if usable:
                 amount: int = int(amount)
                 new_items = [NetworkItem(names[item_name], -1, 0) for _ in range(int(amount))]
@@ -2015,7 +2272,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(full_name, self.ctx.location_name_indexes[game])
             else:
                 self.output("Can't look up location for unknown game. Send by ID instead.")
                 return False
@@ -2046,7 +2303,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 item, usable, response = int(full_name), True, None
             elif game in self.ctx.all_item_and_group_names:
-                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_names[game])
+                item, usable, response = get_intended_text(full_name, self.ctx.item_and_group_name_indexes[game])
             else:
                 self.output("Can't look up item for unknown game. Hint for ID instead.")
                 return False
@@ -2085,7 +2342,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(full_name, self.ctx.location_name_indexes[game])
             else:
                 self.output("Can't look up location for unknown game. Hint for ID instead.")
                 return False
@@ -2165,6 +2422,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--password', default=defaults["password"])
     parser.add_argument('--savefile', default=defaults["savefile"])
     parser.add_argument('--disable_save', default=defaults["disable_save"], action='store_true')
+    parser.add_argument('--save_journal', default=defaults["save_journal"], action='store_true',
+                        help="Append changes to a journal on autosave, instead of rewriting the full save file.")
     parser.add_argument('--cert', help="Path to a SSL Certificate for encryption.")
     parser.add_argument('--cert_key', help="Path to SSL Certificate Key file")
     parser.add_argument('--loglevel', default=defaults["loglevel"],
@@ -2282,6 +2541,7 @@ async def main(args: argparse.Namespace):
         logging.exception(f"Failed to read multiworld data ({e})")
         raise
 
+    ctx.save_journal = args.save_journal
     ctx.init_save(not args.disable_save)
 
     ssl_context = load_server_cert(args.cert, args.cert_key) if args.cert else None
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import typing
 import enum
+import pickle
+import struct
+import sys
 import warnings
+import zlib
 from json import JSONEncoder, JSONDecoder
 
 import websockets
 
-from Utils import ByValue, Version
+from Utils import ByValue, Version, restricted_loads
 
 
 class JSONMessagePart(typing.TypedDict, total=False):
@@ -346,6 +350,23 @@ class Hint(typing.NamedTuple):
         return self.receiving_player == self.finding_player
 
 
+location_table_entry = struct.Struct("<qIIqI4x")
+"""Entry of the location table in multidata format 4: location, sender, receiver, item, flags.
+Matches the memory layout of LocationEntry in _speedups on little endian platforms."""
+
+
+def pack_location_table(locations: typing.Mapping[int, typing.Mapping[int, typing.Sequence[int]]]) -> bytes:
+    """Packs sender -> location -> (item, receiver, flags) into a location table, sorted by sender and location."""
+    table = bytearray(location_table_entry.size * sum(len(player_locations) for _, player_locations in locations.items()))
+    offset = 0
+    for sender, player_locations in sorted(locations.items(), key=lambda entry: entry[0]):
+        for location, data in sorted(player_locations.items(), key=lambda entry: entry[0]):
+            location_table_entry.pack_into(table, offset, location, sender, data[1], data[0],
+                                           data[2] if len(data) > 2 else 0)
+            offset += location_table_entry.size
+    return bytes(table)
+
+
 class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
     def __init__(self, values: typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
         super().__init__(values)
@@ -359,6 +380,17 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if len(self.get(0, {})):
             raise ValueError("Invalid player id 0 for location")
 
+    @classmethod
+    def from_table(cls, table: typing.Any, players: int) -> _LocationStore:
+        """Creates a store from a location table of multidata format 4."""
+        locations: typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]] = {
+            player: {} for player in range(1, players + 1)}
+        for location, sender, receiver, item, flags in location_table_entry.iter_unpack(table):
+            if sender not in locations:
+                raise ValueError(f"Invalid player id {sender} for location")
+            locations[sender][location] = item, receiver, flags
+        return cls(locations)
+
     def find_item(self, slots: typing.Set[int], seeked_item_id: int
                   ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
         for finding_player, check_data in self.items():
@@ -426,3 +458,116 @@ else:
             warnings.warn("_speedups not available. Falling back to pure python LocationStore. "
                           "Install a matching C++ compiler for your platform to compile _speedups.")
             LocationStore = _LocationStore
+
+
+class MultidataSections(typing.MutableMapping[typing.Any, typing.Any]):
+    """Separately compressed sections of multidata format 4, each decompressed on first access."""
+    _unloaded: typing.ClassVar[object] = object()
+
+    def __init__(self, data: typing.Any, spans: typing.Dict[typing.Any, typing.Tuple[int, int]]):
+        self.data = data
+        self.spans = dict(spans)
+        self.sections = dict.fromkeys(spans, self._unloaded)
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        value = self.sections[key]
+        if value is self._unloaded:
+            value = self.sections[key] = restricted_loads(zlib.decompress(self.compressed(key)))
+            del self.spans[key]
+        return value
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        self.spans.pop(key, None)
+        self.sections[key] = value
+
+    def __delitem__(self, key: typing.Any) -> None:
+        self.spans.pop(key, None)
+        del self.sections[key]
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return iter(self.sections)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return dict, (dict(self),)
+
+    def compressed(self, key: typing.Any) -> typing.Optional[bytes]:
+        """Returns the compressed section, or None if it was loaded or replaced already."""
+        if key not in self.spans:
+            return None
+        offset, length = self.spans[key]
+        return bytes(self.data[offset:offset + length])
+
+
+multidata_lazy_sections = ("slot_data", "datapackage")
+"""multidata entries that are compressed per slot or per game in format 4"""
+
+
+def encode_multidata(multidata: typing.Dict[str, typing.Any]) -> bytes:
+    """
+    Encodes multidata in format 4:
+    format byte, 4 byte length of the compressed index, the index, padding to 8 bytes, then the sections.
+    Locations are stored as uncompressed location table that LocationStore can use in place,
+    slot_data and datapackage are compressed per slot and per game, everything else is compressed as one section.
+    """
+    main = dict(multidata)
+    locations = main.pop("locations")
+    blobs: typing.List[bytes] = [pack_location_table(locations)]
+    offset = len(blobs[0])
+
+    def add_blob(blob: bytes) -> typing.Tuple[int, int]:
+        nonlocal offset
+        blobs.append(blob)
+        offset += len(blob)
+        return offset - len(blob), len(blob)
+
+    index: typing.Dict[str, typing.Any] = {"players": len(locations), "locations": (0, offset)}
+    for name in multidata_lazy_sections:
+        sections = main.pop(name, {})
+        spans: typing.Dict[typing.Any, typing.Tuple[int, int]] = {}
+        for key in sections:
+            blob = sections.compressed(key) if isinstance(sections, MultidataSections) else None
+            spans[key] = add_blob(blob if blob is not None else zlib.compress(pickle.dumps(sections[key]), 9))
+        index[name] = spans
+    index["main"] = add_blob(zlib.compress(pickle.dumps(main), 9))
+
+    compressed_index = zlib.compress(pickle.dumps(index), 9)
+    header = bytes([4]) + len(compressed_index).to_bytes(4, "little") + compressed_index
+    return header + bytes(-len(header) % 8) + b"".join(blobs)
+
+
+def encode_multidata_format(multidata: typing.Dict[str, typing.Any], multidata_format: int) -> bytes:
+    """Encodes multidata in format 4 if multidata_format is at least 4, else in format 3, which all servers can load."""
+    if multidata_format >= 4:
+        return encode_multidata(multidata)
+    return bytes([3]) + zlib.compress(pickle.dumps(multidata), 9)  # version of format
+
+
+def decode_multidata(data: typing.Any) -> typing.Dict[str, typing.Any]:
+    """Decodes multidata in format 4, keeping references into data for the location table and lazy sections."""
+    view = memoryview(data)
+    if len(view) < 5:
+        raise ValueError("Multidata is truncated.")
+    index_length = int.from_bytes(view[1:5], "little")
+    index = restricted_loads(zlib.decompress(view[5:5 + index_length]))
+    start = 5 + index_length
+    start += -start % 8
+    spans = [index["main"], index["locations"], *(span for name in multidata_lazy_sections
+                                                  for span in index[name].values())]
+    if start + max(offset + length for offset, length in spans) > len(view):
+        raise ValueError("Multidata is truncated.")
+
+    offset, length = index["main"]
+    multidata = restricted_loads(zlib.decompress(view[start + offset:start + offset + length]))
+    offset, length = index["locations"]
+    table = view[start + offset:start + offset + length]
+    if sys.byteorder == "little":
+        multidata["locations"] = LocationStore.from_table(table, index["players"])
+    else:  # the table can't be used in place, so unpack it
+        multidata["locations"] = LocationStore(dict(_LocationStore.from_table(table, index["players"])))
+    for name in multidata_lazy_sections:
+        multidata[name] = MultidataSections(view, {key: (start + offset, length)
+                                                   for key, (offset, length) in index[name].items()})
+    return multidata
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import itertools
+import json
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from BaseClasses import CollectionState, Entrance, Location, MultiWorld, Region
+
+
+class ProfiledRule:
+    """Wraps an access rule or can_reach of a spot and sums up the time spent in it. Time spent in nested rules is
+    included."""
+    __slots__ = ("rule", "spot", "calls", "time")
+    rule: typing.Callable[[CollectionState], bool]
+    spot: typing.Union[Location, Entrance, Region]
+    calls: int
+    time: float
+
+    def __init__(self, rule: typing.Callable[[CollectionState], bool],
+                 spot: typing.Union[Location, Entrance, Region]) -> None:
+        self.rule = rule
+        self.spot = spot
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, state: CollectionState) -> bool:
+        start = time.perf_counter()
+        try:
+            return self.rule(state)
+        finally:
+            self.time += time.perf_counter() - start
+            self.calls += 1
+
+
+class GenerationProfile:
+    """
+    Collects timings and counters of a generation, to be written as a JSON report.
+    Set as MultiWorld.profile to enable it, timings are then gathered by AutoWorld, Fill and CollectionState.
+    """
+    start: float
+    phases: typing.Dict[str, float]
+    """time per phase of Main.main, in the order they ran"""
+    current_phase: typing.Optional[str]
+    phase_start: float
+    stage_times: typing.Dict[str, typing.Dict[int, float]]
+    """time per stage method name per player"""
+    stage_world_types: typing.Dict[str, typing.Dict[str, float]]
+    """time per stage method name per world type, for stage_ class methods"""
+    fill_steps: typing.Dict[str, typing.Dict[str, float]]
+    sphere_sweeps: typing.Dict[str, typing.Dict[str, float]]
+    """spheres swept and time taken per SphereSweep name"""
+    sweep_from_pool_calls: int
+    state_copies: int
+    balancing_swaps: int
+    balancing_spheres_swept: int
+    balancing_spheres_reused: int
+    rules: typing.List[ProfiledRule]
+    reach_checks: typing.List[ProfiledRule]
+    """can_reach of each location, entrance and region"""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.current_phase = None
+        self.phase_start = self.start
+        self.stage_times = {}
+        self.stage_world_types = {}
+        self.fill_steps = {}
+        self.sphere_sweeps = {}
+        self.sweep_from_pool_calls = 0
+        self.state_copies = 0
+        self.balancing_swaps = 0
+        self.balancing_spheres_swept = 0
+        self.balancing_spheres_reused = 0
+        self.rules = []
+        self.reach_checks = []
+
+    def start_phase(self, name: typing.Optional[str]) -> None:
+        """Ends the running phase, adding its time, and starts the named one. None only ends the running phase."""
+        now = time.perf_counter()
+        if self.current_phase:
+            self.phases[self.current_phase] = self.phases.get(self.current_phase, 0.0) + now - self.phase_start
+        self.current_phase = name
+        self.phase_start = now
+
+    def add_stage_time(self, method: typing.Callable[..., typing.Any], player: typing.Optional[int],
+                       taken: float) -> None:
+        if player:
+            times = self.stage_times.setdefault(method.__name__, {})
+            times[player] = times.get(player, 0.0) + taken
+        else:
+            # stage_ class methods, bound to the world type they were called for
+            world_type = getattr(method, "__self__", method).__name__
+            times = self.stage_world_types.setdefault(method.__name__, {})
+            times[world_type] = times.get(world_type, 0.0) + taken
+
+    def add_fill_step(self, name: str, taken: float) -> None:
+        step = self.fill_steps.setdefault(name, {"calls": 0, "time": 0.0})
+        step["calls"] += 1
+        step["time"] += taken
+
+    def add_sphere(self, name: str, taken: float) -> None:
+        sweep = self.sphere_sweeps.setdefault(name, {"spheres": 0, "time": 0.0})
+        sweep["spheres"] += 1
+        sweep["time"] += taken
+
+    def profile_rules(self, multiworld: MultiWorld) -> None:
+        """Wraps all location and entrance access rules, and can_reach of all locations, entrances and regions,
+        with a ProfiledRule. Rules replaced later on are not profiled, but the reachability checks of their spot are."""
+        for spot in itertools.chain(multiworld.get_locations(), multiworld.get_entrances()):
+            if not isinstance(spot.access_rule, ProfiledRule):
+                profiled_rule = ProfiledRule(spot.access_rule, spot)
+                spot.access_rule = profiled_rule
+                self.rules.append(profiled_rule)
+        for spot in itertools.chain(multiworld.get_locations(), multiworld.get_entrances(), multiworld.get_regions()):
+            if not isinstance(vars(spot).get("can_reach"), ProfiledRule):
+                profiled_reach = ProfiledRule(spot.can_reach, spot)
+                spot.can_reach = profiled_reach
+                self.reach_checks.append(profiled_reach)
+
+    def to_dict(self, multiworld: MultiWorld, slowest_rules: int = 50) -> typing.Dict[str, typing.Any]:
+        def player_entry(player: int) -> typing.Dict[str, typing.Any]:
+            return {"player": player, "name": multiworld.player_name.get(player), "game": multiworld.game.get(player)}
+
+        from BaseClasses import Entrance, Location
+
+        def spot_type(spot: typing.Union[Location, Entrance, Region]) -> str:
+            return "Location" if isinstance(spot, Location) else "Entrance" if isinstance(spot, Entrance) else "Region"
+
+        rules = sorted(self.rules, key=lambda profiled_rule: profiled_rule.time, reverse=True)
+        reach_checks = sorted(self.reach_checks, key=lambda profiled_reach: profiled_reach.calls, reverse=True)
+        reach_evaluations = {"Location": 0, "Entrance": 0, "Region": 0}
+        for profiled_reach in self.reach_checks:
+            reach_evaluations[spot_type(profiled_reach.spot)] += profiled_reach.calls
+        return {
+            "seed": getattr(multiworld, "seed", None),  # generation may have failed before it was set
+            "total_time": time.perf_counter() - self.start,
+            "phases": self.phases,
+            "stages": {
+                stage: [{**player_entry(player), "time": taken} for player, taken in times.items()]
+                for stage, times in self.stage_times.items()
+            },
+            "world_type_stages": self.stage_world_types,
+            "fill_steps": self.fill_steps,
+            "sphere_sweeps": self.sphere_sweeps,
+            "counters": {
+                "sweep_from_pool": self.sweep_from_pool_calls,
+                "state_copies": self.state_copies,
+                "balancing_swaps": self.balancing_swaps,
+                "balancing_spheres_swept": self.balancing_spheres_swept,
+                "balancing_spheres_reused": self.balancing_spheres_reused,
+                "access_rule_evaluations": sum(profiled_rule.calls for profiled_rule in self.rules),
+                "can_reach_evaluations": reach_evaluations,
+            },
+            "slowest_rules": [{
+                **player_entry(profiled_rule.spot.player),
+                "type": spot_type(profiled_rule.spot),
+                "spot": profiled_rule.spot.name,
+                "calls": profiled_rule.calls,
+                "time": profiled_rule.time,
+            } for profiled_rule in rules[:slowest_rules] if profiled_rule.calls],
+            "most_checked_spots": [{
+                **player_entry(profiled_reach.spot.player),
+                "type": spot_type(profiled_reach.spot),
+                "spot": profiled_reach.spot.name,
+                "calls": profiled_reach.calls,
+                "time": profiled_reach.time,
+            } for profiled_reach in reach_checks[:slowest_rules] if profiled_reach.calls],
+        }
+
+    def write(self, multiworld: MultiWorld, path: str) -> None:
+        self.start_phase(None)
+        with open(path, "w", encoding="utf-8") as report:
+            json.dump(self.to_dict(multiworld), report, indent=2)
@@ -9,6 +9,7 @@ import subprocess
 import base64
 import logging
 import asyncio
+import bisect
 import enum
 import typing
 
@@ -510,7 +511,31 @@ async def snes_recv_loop(ctx: SNIContext) -> None:
             ctx.snes_autoreconnect_task = asyncio.create_task(snes_autoreconnect(ctx), name="snes auto-reconnect")
 
 
+snes_read_ranges_per_request = 8  # per GetAddress request of snes_read_many, more ranges are sent as more requests
+
+
+def merge_snes_ranges(reads: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[typing.Tuple[int, int]]:
+    """Sorts (address, size) ranges and merges adjacent and overlapping ones."""
+    merged: typing.List[typing.Tuple[int, int]] = []
+    for address, size in sorted(reads):
+        if merged and address <= merged[-1][0] + merged[-1][1]:
+            merged_address, merged_size = merged[-1]
+            merged[-1] = merged_address, max(merged_size, address + size - merged_address)
+        else:
+            merged.append((address, size))
+    return merged
+
+
 async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+    data = await snes_read_many(ctx, [(address, size)])
+    return None if data is None else data[0]
+
+
+async def snes_read_many(ctx: SNIContext, reads: typing.Sequence[typing.Tuple[int, int]]
+                         ) -> typing.Optional[typing.List[bytes]]:
+    """Reads several (address, size) ranges in one round trip, returns the data of each range in order.
+    Ranges are merged and packed into as few requests as possible, which are all sent before reading the replies."""
+    ranges = merge_snes_ranges(reads)
     try:
         await ctx.snes_request_lock.acquire()
 
@@ -522,16 +547,19 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
         ):
             return None
 
-        GetAddress_Request: SNESRequest = {
-            "Opcode": "GetAddress",
-            "Space": "SNES",
-            "Operands": [hex(address)[2:], hex(size)[2:]]
-        }
         try:
-            await ctx.snes_socket.send(dumps(GetAddress_Request))
+            for start in range(0, len(ranges), snes_read_ranges_per_request):
+                GetAddress_Request: SNESRequest = {
+                    "Opcode": "GetAddress",
+                    "Space": "SNES",
+                    "Operands": [operand for address, size in ranges[start:start + snes_read_ranges_per_request]
+                                 for operand in (hex(address)[2:], hex(size)[2:])]
+                }
+                await ctx.snes_socket.send(dumps(GetAddress_Request))
         except ConnectionClosed:
             return None
 
+        size = sum(size for address, size in ranges)
         data: bytes = bytes()
         while len(data) < size:
             try:
@@ -540,18 +568,32 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
                 break
 
         if len(data) != size:
-            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (hex(address), size, len(data)))
+            snes_logger.error('Error reading %s, requested %d bytes, received %d' %
+                              (", ".join(hex(address) for address, _ in ranges), size, len(data)))
             if len(data):
                 snes_logger.error(str(data))
                 snes_logger.warning('Communication Failure with SNI')
             if ctx.snes_socket is not None and not ctx.snes_socket.closed:
                 await ctx.snes_socket.close()
             return None
-
-        return data
     finally:
         ctx.snes_request_lock.release()
 
+    # split the reply back into the requested ranges
+    range_starts: typing.List[int] = []
+    range_offsets: typing.List[int] = []
+    offset = 0
+    for address, size in ranges:
+        range_starts.append(address)
+        range_offsets.append(offset)
+        offset += size
+    results: typing.List[bytes] = []
+    for address, size in reads:
+        index = bisect.bisect_right(range_starts, address) - 1
+        offset = range_offsets[index] + address - range_starts[index]
+        results.append(data[offset:offset + size])
+    return results
+
 
 async def snes_write(ctx: SNIContext, write_list: typing.List[typing.Tuple[int, bytes]]) -> bool:
     try:
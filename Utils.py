@@ -13,6 +13,7 @@ import functools
 import io
 import collections
 import importlib
+import math
 import logging
 import warnings
 
@@ -600,6 +601,8 @@ def get_fuzzy_results(input_word: str, wordlist: typing.Sequence[str], limit: ty
         return (1 - jellyfish.damerau_levenshtein_distance(word1.lower(), word2.lower())
                 / max(len(word1), len(word2)))
 
+    if limit and isinstance(wordlist, FuzzyIndex):
+        return wordlist.get_results(input_word, limit)
     limit: int = limit if limit else len(wordlist)
     return list(
         map(
@@ -614,6 +617,174 @@ def get_fuzzy_results(input_word: str, wordlist: typing.Sequence[str], limit: ty
     )
 
 
+class FuzzyIndex(typing.Sequence[str]):
+    """
+    A fixed word list that get_fuzzy_results with a limit can search without computing the distance to every word,
+    with the same results. Words are indexed by their lowercase trigrams on first search. As one edit changes at most
+    4 trigrams, the shared trigrams and the length difference bound the distance, so words are checked from most
+    trigrams shared to least, until none left can beat the best results found.
+    jellyfish measures the distance in grapheme clusters, so the bounds only hold for ASCII without carriage returns.
+    Other words are always checked and other input words are searched without the index.
+    """
+    gram_size: typing.ClassVar[int] = 3
+
+    words: typing.List[str]
+    _lowered: typing.List[str]
+    _postings: typing.Dict[str, typing.List[typing.List[int]]]
+    """indices of the words containing a trigram, per occurrence of the trigram"""
+    _length_groups: typing.Dict[int, typing.List[int]]
+    _irregular: typing.List[int]
+    """indices of the words the bounds don't hold for"""
+    _exact: typing.Dict[str, int]
+    """index of the first word of each lowercase spelling"""
+    _distance: typing.Callable[[str, str], int]
+    """distance function for the other words, the same as jellyfish's for them"""
+
+    def __init__(self, words: typing.Iterable[str]) -> None:
+        self.words = list(words)
+        self._lowered = []
+        self._postings = {}
+        self._length_groups = {}
+        self._irregular = []
+        self._exact = {}
+
+    def __getitem__(self, index):
+        return self.words[index]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @staticmethod
+    def _is_regular(word: str) -> bool:
+        return word.isascii() and "\r" not in word
+
+    def _build(self) -> None:
+        try:
+            from _speedups import damerau_levenshtein_distance
+        except ImportError:
+            from jellyfish import damerau_levenshtein_distance
+        lowered = [word.lower() for word in self.words]
+        word_grams = [max(len(lower_word) - self.gram_size + 1, 0) for lower_word in lowered]
+        postings: typing.Dict[str, typing.List[typing.List[int]]] = {}
+        length_groups: typing.Dict[int, typing.List[int]] = {}
+        irregular: typing.List[int] = []
+        for index, (word, lower_word) in enumerate(zip(self.words, lowered)):
+            if not self._is_regular(word):
+                irregular.append(index)
+                continue
+            length_groups.setdefault(len(word), []).append(index)
+            grams = collections.Counter(lower_word[start:start + self.gram_size]
+                                        for start in range(word_grams[index]))
+            for gram, count in grams.items():
+                occurrences = postings.setdefault(gram, [])
+                while len(occurrences) < count:
+                    occurrences.append([])
+                for occurrence in occurrences[:count]:
+                    occurrence.append(index)
+        exact: typing.Dict[str, int] = {}
+        for index, lower_word in enumerate(lowered):
+            exact.setdefault(lower_word, index)
+        # searches may run in the console thread as well, so only publish the complete index
+        self._postings, self._length_groups, self._irregular, self._exact, self._distance = \
+            postings, length_groups, irregular, exact, damerau_levenshtein_distance
+        self._lowered = lowered
+
+    def get_exact_match(self, input_word: str) -> typing.Optional[str]:
+        """the first word equal to input_word ignoring case, which get_fuzzy_results ranks first at 100%"""
+        if not self._lowered and self.words:
+            self._build()
+        index = self._exact.get(input_word.lower())
+        return None if index is None else self.words[index]
+
+    def get_results(self, input_word: str, limit: int) -> typing.List[typing.Tuple[str, int]]:
+        import bisect
+        import jellyfish
+
+        if not self._is_regular(input_word):
+            return get_fuzzy_results(input_word, self.words, limit)
+        lower_input = input_word.lower()
+        if not self._lowered and self.words:
+            self._build()
+        words, lowered, distance_function = self.words, self._lowered, self._distance
+        length = len(input_word)
+        input_grams = max(length - self.gram_size + 1, 0)
+        max_gram_changes = self.gram_size + 1  # a transposition changes one more than the other edits
+        best: typing.List[typing.Tuple[float, int]] = []  # negative ratio and index, sorted like get_fuzzy_results
+
+        def can_beat(bound: float, index: int = -1) -> bool:
+            """if a word with a ratio of at most bound, at index, can be among the best"""
+            return len(best) < limit or (-bound, index) < best[-1]
+
+        def check(index: int, distance: typing.Callable[[str, str], int] = distance_function) -> None:
+            ratio = 1 - distance(lower_input, lowered[index]) / max(length, len(words[index]))
+            if len(best) < limit or (-ratio, index) < best[-1]:
+                bisect.insort(best, (-ratio, index))
+                del best[limit:]
+
+        for index in self._irregular:
+            check(index, jellyfish.damerau_levenshtein_distance)
+
+        shared: typing.Counter[int] = collections.Counter()
+        grams = collections.Counter(lower_input[start:start + self.gram_size] for start in range(input_grams))
+        for gram, count in grams.items():
+            for occurrence in self._postings.get(gram, ())[:count]:
+                shared.update(occurrence)
+
+        def least_shared(word_length: int) -> typing.Tuple[float, float]:
+            """the fewest trigrams a word of this length has to share to beat, and to tie, the worst best result"""
+            if len(best) < limit:
+                return -math.inf, -math.inf
+            worst_ratio = -best[-1][0]
+            longest = max(length, word_length, 1)
+            most_grams = max(input_grams, word_length - self.gram_size + 1, 0)
+            # the most edits away a word of this length can tie and beat it with
+            to_tie = int((1 - worst_ratio) * longest) + 1
+            while to_tie >= 0 and 1 - to_tie / longest < worst_ratio:
+                to_tie -= 1
+            to_beat = to_tie if 1 - to_tie / longest > worst_ratio else to_tie - 1
+            length_difference = abs(length - word_length)
+            return (most_grams - max_gram_changes * to_beat if to_beat >= length_difference else math.inf,
+                    most_grams - max_gram_changes * to_tie if to_tie >= length_difference else math.inf)
+
+        # the words sharing the most trigrams are likely closest, so they set the bar for the others
+        seeds = [index for index, _ in shared.most_common(limit)]
+        for index in seeds:
+            check(index)
+        needed = {word_length: least_shared(word_length) for word_length in self._length_groups}
+        needed_worst = best[-1] if len(best) == limit else None
+        candidates = [index for index, shared_grams in shared.items()
+                      if shared_grams >= needed[len(lowered[index])][1] and index not in seeds]
+        candidates.sort(key=shared.__getitem__, reverse=True)
+        for index in candidates:
+            if len(best) == limit and best[-1] != needed_worst:
+                needed = {}
+                needed_worst = best[-1]
+            shared_grams = shared[index]
+            word_length = len(lowered[index])
+            if word_length not in needed:
+                needed[word_length] = least_shared(word_length)
+            to_beat, to_tie = needed[word_length]
+            if shared_grams >= to_beat or (shared_grams >= to_tie and (len(best) < limit or index < best[-1][1])):
+                check(index)
+
+        def unshared_bound(word_length: int) -> float:
+            word_length_grams = max(word_length - self.gram_size + 1, 0)
+            distance = max(abs(length - word_length), -(-max(input_grams, word_length_grams) // max_gram_changes))
+            return 1 - distance / max(length, word_length, 1)
+
+        for word_length in sorted(self._length_groups, key=unshared_bound, reverse=True):
+            bound = unshared_bound(word_length)
+            if not can_beat(bound):
+                break
+            for index in self._length_groups[word_length]:
+                if not can_beat(bound, index):
+                    break  # indices are ascending, so later ones lose ties as well
+                if index not in shared:
+                    check(index)
+
+        return [(words[index], int(-negative_ratio * 100)) for negative_ratio, index in best]
+
+
 def open_filename(title: str, filetypes: typing.Sequence[typing.Tuple[str, typing.Sequence[str]]], suggest: str = "") \
         -> typing.Optional[str]:
     def run(*args: str):
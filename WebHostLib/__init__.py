@@ -24,9 +24,14 @@ app.jinja_env.filters['all'] = all
 app.config["SELFHOST"] = True  # application process is in charge of running the websites
 app.config["GENERATORS"] = 8  # maximum concurrent world gens
 app.config["SELFLAUNCH"] = True  # application process is in charge of launching Rooms.
+# processes hosting many Rooms each on one event loop, sharing static game data. 0 launches a process per Room.
+app.config["HOSTERS"] = 0
 app.config["SELFLAUNCHCERT"] = None  # can point to a SSL Certificate to encrypt Room websocket connections
 app.config["SELFLAUNCHKEY"] = None  # can point to a SSL Certificate Key to encrypt Room websocket connections
 app.config["SELFGEN"] = True  # application process is in charge of scheduling Generations.
+# local UDP port the frontend notifies the autolauncher on, instead of it polling the database. None polls.
+# only for setups running both on the same machine, as notifications are sent to 127.0.0.1.
+app.config["NOTIFY_PORT"] = None
 app.config["DEBUG"] = False
 app.config["PORT"] = 80
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
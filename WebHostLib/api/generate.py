@@ -10,6 +10,7 @@ from WebHostLib import app
 from WebHostLib.check import get_yaml_data, roll_options
 from WebHostLib.generate import get_meta
 from WebHostLib.models import Generation, STATE_QUEUED, Seed, STATE_ERROR
+from WebHostLib.notifier import notify
 from . import api_endpoints
 
 
@@ -61,6 +62,7 @@ def generate_api():
                 meta=json.dumps(meta), state=STATE_QUEUED,
                 owner=session["_id"])
             commit()
+            notify("generation")
             return {"text": f"Generation of seed {gen.id} started successfully.",
                     "detail": gen.id,
                     "encoded": app.url_map.converters["suuid"].to_url(None, gen.id),
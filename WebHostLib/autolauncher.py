@@ -3,15 +3,18 @@ from __future__ import annotations
 import json
 import logging
 import multiprocessing
+import queue
 import threading
 import time
 import typing
 from datetime import timedelta, datetime
+from uuid import UUID
 
 from pony.orm import db_session, select, commit
 
 from Utils import restricted_loads
 from .locker import Locker, AlreadyRunningException
+from .notifier import get_listener, poll_interval
 
 
 def launch_room(room: Room, config: dict):
@@ -63,14 +66,30 @@ def autohost(config: dict):
         try:
             with Locker("autohost"):
                 run_guardian()
+                # rooms are launched when notified of their activity, polling only catches lost notifications
+                listener = get_listener(config["NOTIFY_PORT"])
+                woken_rooms: queue.Queue[UUID] = queue.Queue()
+                if listener:
+                    listener.subscribe("room", lambda key: woken_rooms.put(UUID(key)))
+                    listener.subscribe("commands", lambda key: notify_commands(UUID(key)))
+                interval = poll_interval if listener else 0.1
+                next_poll = time.monotonic() + interval
                 while 1:
-                    time.sleep(0.1)
-                    with db_session:
-                        rooms = select(
-                            room for room in Room if
-                            room.last_activity >= datetime.utcnow() - timedelta(days=3))
-                        for room in rooms:
-                            launch_room(room, config)
+                    try:
+                        room_id = woken_rooms.get(timeout=max(0.0, next_poll - time.monotonic()))
+                    except queue.Empty:
+                        with db_session:
+                            rooms = select(
+                                room for room in Room if
+                                room.last_activity >= datetime.utcnow() - timedelta(days=3))
+                            for room in rooms:
+                                launch_room(room, config)
+                        next_poll = time.monotonic() + interval
+                    else:
+                        with db_session:
+                            room = Room.get(id=room_id)
+                            if room:
+                                launch_room(room, config)
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -83,6 +102,12 @@ def autogen(config: dict):
     def keep_running():
         try:
             with Locker("autogen"):
+                # generations are started when notified of them, polling only catches lost notifications
+                listener = get_listener(config["NOTIFY_PORT"])
+                generations_queued = threading.Event()
+                if listener:
+                    listener.subscribe("generation", lambda key: generations_queued.set())
+                interval = poll_interval if listener else 0.1
 
                 with multiprocessing.Pool(config["GENERATORS"], initializer=init_db,
                                           initargs=(config["PONY"],), maxtasksperchild=10) as generator_pool:
@@ -102,7 +127,8 @@ def autogen(config: dict):
                         select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
 
                     while 1:
-                        time.sleep(0.1)
+                        generations_queued.wait(interval)
+                        generations_queued.clear()
                         with db_session:
                             # for update locks the database row(s) during transaction, preventing writes from elsewhere
                             to_start = select(
@@ -120,12 +146,78 @@ def autogen(config: dict):
 multiworlds: typing.Dict[type(Room.id), MultiworldInstance] = {}
 
 
+def notify_commands(room_id):
+    multiworld = multiworlds.get(room_id, None)
+    if multiworld:
+        multiworld.notify_commands()
+
+
+class MultiworldHoster():
+    """A process hosting many rooms on one event loop, sharing static server data between them."""
+
+    def __init__(self, config: dict):
+        self.room_queue = multiprocessing.Queue()
+        self.done_queue = multiprocessing.Queue()
+        self.rooms: typing.Set[type(Room.id)] = set()  # rooms hosted currently
+        self.lock = threading.Lock()
+        self.process = multiprocessing.Process(group=None, target=run_hoster_process,
+                                               args=(config["PONY"], get_static_server_data(),
+                                                     config["SELFLAUNCHCERT"], config["SELFLAUNCHKEY"],
+                                                     config["HOST_ADDRESS"], self.room_queue, self.done_queue,
+                                                     get_listener(config["NOTIFY_PORT"]) is not None),
+                                               name="MultiHoster")
+        self.process.start()
+
+    def add_room(self, room_id):
+        with self.lock:
+            self.rooms.add(room_id)
+        self.room_queue.put(("host", room_id))
+
+    def notify_commands(self, room_id):
+        self.room_queue.put(("commands", room_id))
+
+    def update_rooms(self):
+        """Removes the rooms that stopped from rooms."""
+        with self.lock:
+            while True:
+                try:
+                    self.rooms.discard(self.done_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+    def room_done(self, room_id) -> bool:
+        if not self.process.is_alive():
+            return True
+        self.update_rooms()
+        return room_id not in self.rooms
+
+    def remove_room(self, room_id):
+        with self.lock:
+            self.rooms.discard(room_id)
+
+
+hosters: typing.List[MultiworldHoster] = []
+
+
+def get_hoster(config: dict) -> MultiworldHoster:
+    """Returns the hoster with the fewest rooms, replacing ones that died and starting new ones up to HOSTERS."""
+    hosters[:] = [hoster for hoster in hosters if hoster.process.is_alive()]
+    if len(hosters) < config["HOSTERS"]:
+        hosters.append(MultiworldHoster(config))
+    for hoster in hosters:
+        hoster.update_rooms()
+    return min(hosters, key=lambda hoster: len(hoster.rooms))
+
+
 class MultiworldInstance():
     def __init__(self, room: Room, config: dict):
         self.room_id = room.id
         self.process: typing.Optional[multiprocessing.Process] = None
+        self.hoster: typing.Optional[MultiworldHoster] = None
+        self.commands_waiting: typing.Optional[multiprocessing.synchronize.Event] = None
         with guardian_lock:
             multiworlds[self.room_id] = self
+        self.config = config
         self.ponyconfig = config["PONY"]
         self.cert = config["SELFLAUNCHCERT"]
         self.key = config["SELFLAUNCHKEY"]
@@ -134,25 +226,50 @@ class MultiworldInstance():
     def start(self):
         if self.process and self.process.is_alive():
             return False
+        if self.hoster:
+            if not self.hoster.room_done(self.room_id):
+                return False
+            self.collect()
+
+        if self.config["HOSTERS"]:
+            logging.info(f"Hosting {self.room_id}")
+            hoster = get_hoster(self.config)
+            hoster.add_room(self.room_id)
+            self.hoster = hoster
+            return
 
         logging.info(f"Spinning up {self.room_id}")
+        if get_listener(self.config["NOTIFY_PORT"]):
+            self.commands_waiting = multiprocessing.Event()
         process = multiprocessing.Process(group=None, target=run_server_process,
                                           args=(self.room_id, self.ponyconfig, get_static_server_data(),
-                                                self.cert, self.key, self.host),
+                                                self.cert, self.key, self.host, self.commands_waiting),
                                           name="MultiHost")
         process.start()
         # bind after start to prevent thread sync issues with guardian.
         self.process = process
 
+    def notify_commands(self):
+        if self.hoster:
+            self.hoster.notify_commands(self.room_id)
+        elif self.commands_waiting:
+            self.commands_waiting.set()
+
     def stop(self):
         if self.process:
             self.process.terminate()
             self.process = None
 
     def done(self):
+        if self.hoster:
+            return self.hoster.room_done(self.room_id)
         return self.process and not self.process.is_alive()
 
     def collect(self):
+        if self.hoster:
+            self.hoster.remove_room(self.room_id)
+            self.hoster = None
+            return
         self.process.join()  # wait for process to finish
         self.process = None
 
@@ -192,5 +309,5 @@ def run_guardian():
 
 
 from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed
-from .customserver import run_server_process, get_static_server_data
+from .customserver import run_hoster_process, run_server_process, get_static_server_data
 from .generate import gen_game
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import collections
+import contextvars
 import datetime
 import functools
 import logging
+import multiprocessing
+import os
 import pickle
 import random
 import socket
@@ -18,10 +22,12 @@ from pony.orm import commit, db_session, select
 
 import Utils
 
-from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, load_server_cert
+from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, \
+    load_server_cert, apply_save_journal, encode_save_journal_entry, read_save_journal
 from Utils import restricted_loads, cache_argsless
-from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .locker import AlreadyRunningException, Locker
+from .models import Command, GameDataPackage, Room, SaveJournalEntry, TrackerSnapshot, db
+from .notifier import command_poll_interval
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -56,28 +62,58 @@ class DBCommandProcessor(ServerCommandProcessor):
         logging.info(text)
 
 
+tracker_state_keys = ("location_checks", "hints", "client_game_state", "name_aliases", "client_activity_timers",
+                      "video")
+"""parts of the save written to the TrackerSnapshot, received items are added filtered to the ones trackers show"""
+
+shared_game_names: typing.Dict[str, tuple] = {}
+"""name sets and indexes of each game in static server data, shared by all rooms of a process"""
+hosted_room: contextvars.ContextVar[typing.Optional[int]] = contextvars.ContextVar("hosted_room", default=None)
+"""id of the room the running task belongs to in a hoster process, to write its log records to the room's log"""
+
+
 class WebHostContext(Context):
     room_id: int
+    tracker_data_packages: typing.Dict[str, str]
+    """checksum of each game's data package, for trackers to look up GameDataPackage"""
 
-    def __init__(self, static_server_data: dict):
+    def __init__(self, static_server_data: dict, commands_waiting: typing.Optional[threading.Event] = None):
         # static server data is used during _load_game_data to load required data,
         # without needing to import worlds system, which takes quite a bit of memory
         self.static_server_data = static_server_data
+        self.static_gamespackage = static_server_data["gamespackage"]
         super(WebHostContext, self).__init__("", 0, "", "", 1, 40, True, "enabled", "enabled", "enabled", 0, 2)
         del self.static_server_data
-        self.main_loop = asyncio.get_running_loop()
         self.video = {}
         self.tags = ["AP", "WebHost"]
+        self.save_journal = True  # autosaves add SaveJournalEntry rows, instead of rewriting multisave
+        # set when the autolauncher was notified of new commands, the slower polling only catches lost notifications
+        self.commands_waiting = commands_waiting if commands_waiting else threading.Event()
+        self.command_poll_interval = command_poll_interval if commands_waiting else 5
 
     def _load_game_data(self):
+        # top level is copied, as embedded data packages replace games per room, the data of each game stays shared
         for key, value in self.static_server_data.items():
-            setattr(self, key, value)
+            setattr(self, key, dict(value))
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
+    def _init_game_data(self):
+        super(WebHostContext, self)._init_game_data()
+        for game_name, game_package in self.gamespackage.items():
+            if game_package is self.static_gamespackage.get(game_name):
+                (self.all_item_and_group_names[game_name], self.all_location_and_group_names[game_name],
+                 self.item_name_indexes[game_name], self.location_name_indexes[game_name],
+                 self.item_and_group_name_indexes[game_name], self.location_and_group_name_indexes[game_name]) = \
+                    shared_game_names.setdefault(game_name, (
+                        self.all_item_and_group_names[game_name], self.all_location_and_group_names[game_name],
+                        self.item_name_indexes[game_name], self.location_name_indexes[game_name],
+                        self.item_and_group_name_indexes[game_name], self.location_and_group_name_indexes[game_name]))
+
     def listen_to_db_commands(self):
         cmdprocessor = DBCommandProcessor(self)
 
         while not self.exit_event.is_set():
+            self.commands_waiting.clear()  # before reading, so commands added meanwhile are read next
             with db_session:
                 commands = select(command for command in Command if command.room.id == self.room_id)
                 if commands:
@@ -85,7 +121,7 @@ class WebHostContext(Context):
                         self.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
                         command.delete()
                     commit()
-            time.sleep(5)
+            self.commands_waiting.wait(self.command_poll_interval)
 
     @db_session
     def load(self, room_id: int):
@@ -98,9 +134,11 @@ class WebHostContext(Context):
 
         multidata = self.decompress(room.seed.multidata)
         game_data_packages = {}
+        self.tracker_data_packages = {}
         for game in list(multidata.get("datapackage", {})):
             game_data = multidata["datapackage"][game]
             if "checksum" in game_data:
+                self.tracker_data_packages[game] = game_data["checksum"]
                 if self.gamespackage.get(game, {}).get("checksum") == game_data["checksum"]:
                     # non-custom. remove from multidata
                     # games package could be dropped from static data once all rooms embed data package
@@ -116,26 +154,68 @@ class WebHostContext(Context):
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
-            savegame_data = Room.get(id=self.room_id).multisave
-            if savegame_data:
-                self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
+            room = Room.get(id=self.room_id)
+            if room.multisave:
+                journal = read_save_journal(room.get_save_journal_data())
+                self.set_save(apply_save_journal(restricted_loads(room.multisave), journal))
             self._start_async_saving()
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
+        # run in a copy of the room's context, so commands log to the room's log in a hoster process
+        threading.Thread(target=contextvars.copy_context().run, args=(self.listen_to_db_commands,),
+                         daemon=True).start()
 
-    @db_session
     def _save(self, exit_save: bool = False) -> bool:
-        room = Room.get(id=self.room_id)
-        room.multisave = pickle.dumps(self.get_save())
-        # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
-        if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
-            room.last_activity = datetime.datetime.utcnow()
+        # read before opening a db_session, which the event loop could be waiting on
+        if self.save_journal and not self.journal_needs_snapshot(exit_save):
+            journal_entry = encode_save_journal_entry(self.call_on_loop(self.get_save_journal_entry))
+            snapshot = None
+        else:
+            journal_entry = None
+            snapshot = self.call_on_loop(self.encode_save_and_tracker_snapshot)
+        with db_session:
+            room = Room.get(id=self.room_id)
+            if snapshot:
+                room.multisave, tracker_state = snapshot
+                room.save_journal.select().delete(bulk=True)  # folded into the snapshot
+                self.save_tracker_snapshot(room, tracker_state)
+            else:
+                SaveJournalEntry(room=room, data=journal_entry)
+            # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
+            if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
+                room.last_activity = datetime.datetime.utcnow()
         return True
 
-    def get_save(self) -> dict:
-        d = super(WebHostContext, self).get_save()
+    def encode_save_and_tracker_snapshot(self) -> typing.Tuple[bytes, bytes]:
+        """Returns the pickled get_save and the tracker state from it, resetting the save journal to start from them.
+        Call through call_on_loop."""
+        self.reset_save_journal()
+        save = self.get_save()
+        state = {key: save[key] for key in tracker_state_keys}
+        state["received_items"] = {key: items for key, items in save["received_items"].items() if key[2]}
+        return pickle.dumps(save), pickle.dumps(state)
+
+    def get_small_save_data(self) -> dict:
+        d = super(WebHostContext, self).get_small_save_data()
         d["video"] = [(tuple(playerslot), videodata) for playerslot, videodata in self.video.items()]
         return d
 
+    def get_tracker_static_data(self) -> dict:
+        """Returns the parts of multidata needed to render the generic trackers."""
+        return {
+            "seed_name": self.seed_name,
+            "slot_info": self.slot_info,
+            "locations": {slot: tuple(self.locations[slot]) for slot in self.locations},
+            "precollected_items": {slot: [item.item for item in self.start_inventory.get(slot, ())]
+                                   for slot in self.slot_info},
+            "datapackage": self.tracker_data_packages,
+        }
+
+    def save_tracker_snapshot(self, room: Room, state: bytes):
+        """Writes the pickled parts of the save shown on trackers, so they can be rendered without loading multidata."""
+        if room.tracker_snapshot:
+            room.tracker_snapshot.state = state
+        else:
+            TrackerSnapshot(room=room, static_data=pickle.dumps(self.get_tracker_static_data()), state=state)
+
 
 def get_random_port():
     return random.randint(49152, 65535)
@@ -159,9 +239,66 @@ def get_static_server_data() -> dict:
     return data
 
 
+@db_session
+def mark_room_stopped(room_id, failed: bool = False):
+    """Ensures the Room does not spin up again on its own, minute of safety buffer."""
+    room = Room.get(id=room_id)
+    if failed:
+        room.last_port = -1
+    room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+
+
+async def host_room(ctx: WebHostContext, room_id, cert_file: typing.Optional[str],
+                    cert_key_file: typing.Optional[str], host: str):
+    """Loads the room into ctx and hosts it until it shuts down due to inactivity."""
+    import gc
+    # database and multidata work would block the other rooms of a hoster process, so it runs in the executor,
+    # in a copy of the room's context for its logging
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, contextvars.copy_context().run, ctx.load, room_id)
+    await loop.run_in_executor(None, contextvars.copy_context().run, ctx.init_save)
+    ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
+    gc.collect()  # free intermediate objects used during setup
+    try:
+        ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, ctx.port, ssl=ssl_context)
+
+        await ctx.server
+    except OSError:  # likely port in use
+        ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, 0, ssl=ssl_context)
+
+        await ctx.server
+    port = 0
+    for wssocket in ctx.server.ws_server.sockets:
+        socketname = wssocket.getsockname()
+        if wssocket.family == socket.AF_INET6:
+            # Prefer IPv4, as most users seem to not have working ipv6 support
+            if not port:
+                port = socketname[1]
+        elif wssocket.family == socket.AF_INET:
+            port = socketname[1]
+    if port:
+        logging.info(f'Hosting game at {host}:{port}')
+        with db_session:
+            room = Room.get(id=ctx.room_id)
+            room.last_port = port
+    else:
+        logging.exception("Could not determine port. Likely hosting failure.")
+    with db_session:
+        ctx.auto_shutdown = Room.get(id=room_id).timeout
+    ctx.shutdown_task = asyncio.create_task(auto_shutdown(ctx, []))
+    await ctx.shutdown_task
+
+    # ensure auto launch is on the same page in regard to room activity.
+    with db_session:
+        room: Room = Room.get(id=ctx.room_id)
+        room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(seconds=room.timeout + 60)
+
+    logging.info("Shutting down")
+
+
 def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
-                       host: str):
+                       host: str, commands_waiting: typing.Optional[multiprocessing.synchronize.Event] = None):
     # establish DB connection for multidata and multisave
     db.bind(**ponyconfig)
     db.generate_mapping(check_tables=False)
@@ -170,61 +307,104 @@ def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
         if "worlds" in sys.modules:
             raise Exception("Worlds system should not be loaded in the custom server.")
 
-        import gc
         Utils.init_logging(str(room_id), write_mode="a")
-        ctx = WebHostContext(static_server_data)
-        ctx.load(room_id)
-        ctx.init_save()
-        ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
-        gc.collect()  # free intermediate objects used during setup
-        try:
-            ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, ctx.port, ssl=ssl_context)
-
-            await ctx.server
-        except OSError:  # likely port in use
-            ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, 0, ssl=ssl_context)
-
-            await ctx.server
-        port = 0
-        for wssocket in ctx.server.ws_server.sockets:
-            socketname = wssocket.getsockname()
-            if wssocket.family == socket.AF_INET6:
-                # Prefer IPv4, as most users seem to not have working ipv6 support
-                if not port:
-                    port = socketname[1]
-            elif wssocket.family == socket.AF_INET:
-                port = socketname[1]
-        if port:
-            logging.info(f'Hosting game at {host}:{port}')
-            with db_session:
-                room = Room.get(id=ctx.room_id)
-                room.last_port = port
-        else:
-            logging.exception("Could not determine port. Likely hosting failure.")
-        with db_session:
-            ctx.auto_shutdown = Room.get(id=room_id).timeout
-        ctx.shutdown_task = asyncio.create_task(auto_shutdown(ctx, []))
-        await ctx.shutdown_task
-
-        # ensure auto launch is on the same page in regard to room activity.
-        with db_session:
-            room: Room = Room.get(id=ctx.room_id)
-            room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(seconds=room.timeout + 60)
-
-        logging.info("Shutting down")
+        ctx = WebHostContext(static_server_data, commands_waiting)
+        await host_room(ctx, room_id, cert_file, cert_key_file, host)
 
     with Locker(room_id):
         try:
             asyncio.run(main())
         except (KeyboardInterrupt, SystemExit):
-            with db_session:
-                room = Room.get(id=room_id)
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+            mark_room_stopped(room_id)
         except Exception:
-            with db_session:
-                room = Room.get(id=room_id)
-                room.last_port = -1
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+            mark_room_stopped(room_id, failed=True)
             raise
+
+
+async def host_hosted_room(room_id, static_server_data: dict, cert_file: typing.Optional[str],
+                           cert_key_file: typing.Optional[str], host: str,
+                           commands_waiting: typing.Optional[threading.Event] = None):
+    """Hosts a room of a hoster process, writing its log records to the room's log.
+    Failures only stop this room and every room saves on shutdown, as a process per room would at exit."""
+    hosted_room.set(room_id)
+    handler = logging.FileHandler(os.path.join(Utils.user_path("logs"), f"{room_id}.txt"), "a",
+                                  encoding="utf-8-sig")
+    handler.setFormatter(logging.Formatter("[%(name)s at %(asctime)s]: %(message)s"))
+    handler.addFilter(lambda record: hosted_room.get() == room_id)
+    logging.getLogger().addHandler(handler)
+    ctx: typing.Optional[WebHostContext] = None
+    try:
+        with Locker(room_id):
+            ctx = WebHostContext(static_server_data, commands_waiting)
+            await host_room(ctx, room_id, cert_file, cert_key_file, host)
+    except AlreadyRunningException:
+        logging.info(f"Room {room_id} is already hosted elsewhere.")
+    except asyncio.CancelledError:
+        mark_room_stopped(room_id)
+        raise
+    except Exception as e:
+        logging.exception(e)
+        mark_room_stopped(room_id, failed=True)
+    finally:
+        if ctx:
+            ctx.exit_event.set()  # stops the saving and command threads
+            ws_server = getattr(ctx.server, "ws_server", None)
+            if ws_server:
+                ws_server.close()
+            if ctx.saving:
+                atexit.unregister(ctx._save)
+                await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run,
+                                                                 ctx._save, True)
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+
+
+def run_hoster_process(ponyconfig: dict, static_server_data: dict, cert_file: typing.Optional[str],
+                       cert_key_file: typing.Optional[str], host: str,
+                       room_queue: multiprocessing.Queue, done_queue: multiprocessing.Queue, push_commands: bool):
+    """Hosts every room whose ("host", id) is received from room_queue on one event loop, sharing static_server_data.
+    Room ids are put into done_queue when their room stopped.
+    With push_commands, ("commands", id) tells the room to read its new commands."""
+    # establish DB connection for multidata and multisave
+    db.bind(**ponyconfig)
+    db.generate_mapping(check_tables=False)
+
+    async def main():
+        if "worlds" in sys.modules:
+            raise Exception("Worlds system should not be loaded in the custom server.")
+
+        Utils.init_logging(f"Hoster_{os.getpid()}")
+        loop = asyncio.get_running_loop()
+        tasks: typing.Set[asyncio.Task] = set()
+        commands_waiting: typing.Dict[typing.Any, threading.Event] = {}
+
+        def room_done(room_id, task: asyncio.Task):
+            tasks.discard(task)
+            commands_waiting.pop(room_id, None)
+            done_queue.put(room_id)
+
+        def start_room(room_id):
+            if push_commands:
+                commands_waiting[room_id] = threading.Event()
+            task = asyncio.create_task(host_hosted_room(room_id, static_server_data, cert_file, cert_key_file, host,
+                                                        commands_waiting.get(room_id)))
+            tasks.add(task)
+            task.add_done_callback(functools.partial(room_done, room_id))
+
+        def notify_commands(room_id):
+            if room_id in commands_waiting:
+                commands_waiting[room_id].set()
+
+        def receive_rooms():
+            # only the event loop touches tasks and commands_waiting, this thread just hands rooms over to it
+            while True:
+                kind, room_id = room_queue.get()
+                loop.call_soon_threadsafe(start_room if kind == "host" else notify_commands, room_id)
+
+        threading.Thread(target=receive_rooms, daemon=True).start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, SystemExit):
+        pass  # rooms were marked as stopped when their tasks got cancelled
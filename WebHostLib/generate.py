@@ -4,7 +4,6 @@ import os
 import pickle
 import random
 import tempfile
-import zipfile
 from collections import Counter
 from typing import Any, Dict, List, Optional, Union
 
@@ -19,7 +18,8 @@ from WebHostLib import app
 from worlds.alttp.EntranceRandomizer import parse_arguments
 from .check import get_yaml_data, roll_options
 from .models import Generation, STATE_ERROR, STATE_QUEUED, Seed, UUID
-from .upload import upload_zip_to_db
+from .notifier import notify
+from .upload import upload_output_to_db
 
 
 def get_meta(options_source: dict, race: bool = False) -> Dict[str, Union[List[str], Dict[str, Any]]]:
@@ -85,6 +85,7 @@ def generate(race=False):
                         state=STATE_QUEUED,
                         owner=session["_id"])
                     commit()
+                    notify("generation")
 
                     return redirect(url_for("wait_seed", seed=gen.id))
                 else:
@@ -147,9 +148,10 @@ def gen_game(gen_options: dict, meta: Optional[Dict[str, Any]] = None, owner=Non
             erargs.name[player] = handle_name(erargs.name[player], player, name_counter)
         if len(set(erargs.name.values())) != len(erargs.name):
             raise Exception(f"Names have to be unique. Names: {Counter(erargs.name.values())}")
-        ERmain(erargs, seed, baked_server_options=meta["server_options"])
-
-        return upload_to_db(target.name, sid, owner, race)
+        seed_ids = []
+        ERmain(erargs, seed, baked_server_options=meta["server_options"],
+               output_handler=lambda *output: seed_ids.append(upload_to_db(*output, sid, owner, race)))
+        return seed_ids[0]
     thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
     thread = thread_pool.submit(task)
 
@@ -195,19 +197,15 @@ def wait_seed(seed: UUID):
     return render_template("waitSeed.html", seed_id=seed_id)
 
 
-def upload_to_db(folder, sid, owner, race):
-    for file in os.listdir(folder):
-        file = os.path.join(folder, file)
-        if file.endswith(".zip"):
-            with db_session:
-                with zipfile.ZipFile(file) as zfile:
-                    res = upload_zip_to_db(zfile, owner, {"race": race}, sid)
-                if type(res) == "str":
-                    raise Exception(res)
-                elif res:
-                    seed = res
-                    gen = Generation.get(id=seed.id)
-                    if gen is not None:
-                        gen.delete()
-                    return seed.id
-    raise Exception("Generation zipfile not found.")
+def upload_to_db(folder: str, multidata: Dict[str, Any], spoiler: str, sid, owner, race):
+    with db_session:
+        res = upload_output_to_db(folder, multidata, spoiler, owner, {"race": race}, sid)
+        if type(res) == str:
+            raise Exception(res)
+        elif res:
+            seed = res
+            gen = Generation.get(id=seed.id)
+            if gen is not None:
+                gen.delete()
+            return seed.id
+    raise Exception("Generation output could not be stored.")
@@ -9,6 +9,7 @@ from pony.orm import count, commit, db_session
 from worlds.AutoWorld import AutoWorldRegister
 from . import app, cache
 from .models import Seed, Room, Command, UUID, uuid4
+from .notifier import notify
 
 
 def get_world_theme(game_name: str):
@@ -156,12 +157,15 @@ def host_room(room: UUID):
             if cmd:
                 Command(room=room, commandtext=cmd)
                 commit()
+                notify("commands", str(room.id))
 
     now = datetime.datetime.utcnow()
     # indicate that the page should reload to get the assigned port
     should_refresh = not room.last_port and now - room.creation_time < datetime.timedelta(seconds=3)
     with db_session:
         room.last_activity = now  # will trigger a spinup, if it's not already running
+        commit()
+    notify("room", str(room.id))
 
     return render_template("hostRoom.html", room=room, should_refresh=should_refresh)
 
@@ -29,9 +29,27 @@ class Room(db.Entity):
     show_spoiler = Required(int, default=0)  # 0 -> never, 1 -> after completion, -> 2 always
     timeout = Required(int, default=lambda: 2 * 60 * 60)  # seconds since last activity to shutdown
     tracker = Optional(UUID, index=True)
+    tracker_snapshot = Optional('TrackerSnapshot', cascade_delete=True)
+    save_journal = Set('SaveJournalEntry', cascade_delete=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
 
+    def get_save_journal_data(self) -> bytes:
+        """Returns the journal written since multisave and the tracker snapshot, for MultiServer.read_save_journal."""
+        return b"".join(entry.data for entry in self.save_journal.order_by(SaveJournalEntry.id))
+
+
+class TrackerSnapshot(db.Entity):
+    room = PrimaryKey(Room)
+    static_data = Required(buffer, lazy=True)  # parts of multidata used by trackers, written once
+    state = Required(buffer, lazy=True)  # parts of multisave used by trackers, written with it
+
+
+class SaveJournalEntry(db.Entity):
+    id = PrimaryKey(int, auto=True)  # order in which the entries were written
+    room = Required(Room, index=True)
+    data = Required(buffer, lazy=True)  # compressed changes to multisave since the previous entry
+
 
 class Seed(db.Entity):
     id = PrimaryKey(UUID, default=uuid4)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+import typing
+
+poll_interval = 10
+"""seconds between database polls of the autolauncher when notifications are received, to catch lost ones"""
+command_poll_interval = 30
+"""seconds between Command polls of a room when commands are pushed to it, to catch lost notifications"""
+
+
+class NotificationListener:
+    """Receives notifications sent by send_notification on a local UDP socket and passes their key to the handlers
+    subscribed to their kind. Notifications only tell what to look up in the database, which stays authoritative."""
+
+    def __init__(self, port: int):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", port))
+        self.port: int = self.socket.getsockname()[1]
+        self.handlers: typing.Dict[str, typing.List[typing.Callable[[str], typing.Any]]] = {}
+        self.thread: typing.Optional[threading.Thread] = None
+
+    def subscribe(self, kind: str, handler: typing.Callable[[str], typing.Any]):
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def start(self):
+        if not self.thread:
+            self.thread = threading.Thread(target=self.listen, name="AP_Notifications", daemon=True)
+            self.thread.start()
+
+    def listen(self):
+        while 1:
+            data = self.socket.recv(1024)
+            try:
+                kind, key = data.decode("utf-8").split(":", 1)
+            except ValueError:
+                logging.warning(f"Ignoring malformed notification {data!r}")
+                continue
+            for handler in self.handlers.get(kind, ()):
+                try:
+                    handler(key)
+                except Exception as e:
+                    logging.exception(e)
+
+
+def send_notification(port: int, kind: str, key: str = ""):
+    """Sends a notification to the NotificationListener on port. Delivery is not guaranteed, listeners poll for
+    anything missed."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as notification_socket:
+            notification_socket.sendto(f"{kind}:{key}".encode("utf-8"), ("127.0.0.1", port))
+    except OSError as e:
+        logging.debug(f"Could not send notification {kind}: {e}")
+
+
+def notify(kind: str, key: str = ""):
+    """Notifies the autolauncher, if NOTIFY_PORT is configured. Changes have to be committed before notifying."""
+    from . import app
+    if app.config["NOTIFY_PORT"]:
+        send_notification(app.config["NOTIFY_PORT"], kind, key)
+
+
+listener: typing.Optional[NotificationListener] = None
+listener_failed = False
+listener_lock = threading.Lock()
+
+
+def get_listener(port: typing.Optional[int]) -> typing.Optional[NotificationListener]:
+    """Returns the started listener of this process, or None if notifications are disabled or the port is taken."""
+    global listener, listener_failed
+    if not port:
+        return None
+    with listener_lock:
+        if not listener and not listener_failed:
+            try:
+                listener = NotificationListener(port)
+            except OSError as e:
+                logging.warning(f"Could not listen for notifications on port {port}, polling instead: {e}")
+                listener_failed = True
+                return None
+            listener.start()
+    return listener
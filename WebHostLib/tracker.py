@@ -1,13 +1,14 @@
 import datetime
 import collections
+import functools
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
 from flask import render_template
 from werkzeug.exceptions import abort
 
-from MultiServer import Context, get_saving_second
+from MultiServer import Context, apply_save_journal, get_saving_second, read_save_journal
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
@@ -17,6 +18,7 @@ from .models import GameDataPackage, Room
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
 
 _multidata_cache = {}
+_data_package_lookups: Dict[str, Tuple[Dict[int, str], Dict[int, str], Dict[str, int]]] = {}
 _multiworld_trackers: Dict[str, Callable] = {}
 _player_trackers: Dict[str, Callable] = {}
 
@@ -24,6 +26,19 @@ TeamPlayer = Tuple[int, int]
 ItemMetadata = Tuple[int, int, int]
 
 
+def _get_data_package_lookups(checksum: str) -> Tuple[Dict[int, str], Dict[int, str], Dict[str, int]]:
+    """Returns item id to name, location id to name and item name to id tables of a GameDataPackage.
+    Packages are immutable per checksum, so the tables are kept for the lifetime of the process."""
+    if checksum not in _data_package_lookups:
+        game_package = restricted_loads(GameDataPackage.get(checksum=checksum).data)
+        _data_package_lookups[checksum] = (
+            {id: name for name, id in game_package["item_name_to_id"].items()},
+            {id: name for name, id in game_package["location_name_to_id"].items()},
+            game_package["item_name_to_id"],
+        )
+    return _data_package_lookups[checksum]
+
+
 def _cache_results(func: Callable) -> Callable:
     """Stores the results of any computationally expensive methods after the initial call in TrackerData.
     If called again, returns the cached result instead, as results will not change for the lifetime of TrackerData.
@@ -46,17 +61,32 @@ class TrackerData:
 
     Provides helper methods to lazily load necessary data that each tracker require and caches any results so any
     subsequent helper method calls do not need to recompute results during the lifetime of this instance.
+
+    If the room server wrote a TrackerSnapshot, the generic trackers are rendered from it without loading multidata.
     """
     room: Room
-    _multidata: Dict[str, Any]
+    _static_data: Dict[str, Any]
     _multisave: Dict[str, Any]
     _tracker_cache: Dict[str, Any]
 
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        if room.tracker_snapshot:
+            self._static_data = restricted_loads(room.tracker_snapshot.static_data)
+            self._multisave = restricted_loads(room.tracker_snapshot.state)
+        else:
+            self._static_data = {
+                "seed_name": self._multidata["seed_name"],
+                "slot_info": self._multidata["slot_info"],
+                "locations": self._multidata["locations"],
+                "precollected_items": self._multidata["precollected_items"],
+                "datapackage": {game: game_package["checksum"]
+                                for game, game_package in self._multidata["datapackage"].items()},
+            }
+            self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        if self._multisave:  # changes autosaved since
+            self._multisave = apply_save_journal(self._multisave, read_save_journal(room.get_save_journal_data()))
         self._tracker_cache = {}
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
@@ -69,20 +99,24 @@ class TrackerData:
         self.location_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
         })
-        for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
+        for game, checksum in self._static_data["datapackage"].items():
+            item_id_to_name, location_id_to_name, item_name_to_id = _get_data_package_lookups(checksum)
+            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", item_id_to_name)
+            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})",
+                                                              location_id_to_name)
 
             # Normal lookup tables as well.
-            self.item_name_to_id[game] = game_package["item_name_to_id"]
-            self.location_name_to_id[game] = game_package["item_name_to_id"]
+            self.item_name_to_id[game] = item_name_to_id
+            self.location_name_to_id[game] = item_name_to_id
+
+    @functools.cached_property
+    def _multidata(self) -> Dict[str, Any]:
+        """The full multidata of the seed, only loaded if a tracker needs more than the generic ones."""
+        return Context.decompress(self.room.seed.multidata)
 
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
-        return self._multidata["seed_name"]
+        return self._static_data["seed_name"]
 
     def get_slot_data(self, team: int, player: int) -> Dict[str, Any]:
         """Retrieves the slot data for a given player."""
@@ -90,7 +124,7 @@ class TrackerData:
 
     def get_slot_info(self, team: int, player: int) -> NetworkSlot:
         """Retrieves the NetworkSlot data for a given player."""
-        return self._multidata["slot_info"][player]
+        return self._static_data["slot_info"][player]
 
     def get_player_name(self, team: int, player: int) -> str:
         """Retrieves the slot name for a given player."""
@@ -104,9 +138,13 @@ class TrackerData:
         """Retrieves all locations with their containing item's metadata for a given player."""
         return self._multidata["locations"][player]
 
+    def get_player_location_ids(self, team: int, player: int) -> Collection[int]:
+        """Retrieves the ids of all locations of a given player."""
+        return self._static_data["locations"][player]
+
     def get_player_starting_inventory(self, team: int, player: int) -> List[int]:
         """Retrieves a list of all item codes a given slot starts with."""
-        return self._multidata["precollected_items"][player]
+        return self._static_data["precollected_items"][player]
 
     def get_player_checked_locations(self, team: int, player: int) -> Set[int]:
         """Retrieves the set of all locations marked complete by this player."""
@@ -115,7 +153,7 @@ class TrackerData:
     @_cache_results
     def get_player_missing_locations(self, team: int, player: int) -> Set[int]:
         """Retrieves the set of all locations not marked complete by this player."""
-        return set(self.get_player_locations(team, player)) - self.get_player_checked_locations(team, player)
+        return set(self.get_player_location_ids(team, player)) - self.get_player_checked_locations(team, player)
 
     def get_player_received_items(self, team: int, player: int) -> List[NetworkItem]:
         """Returns all items received to this player in order of received."""
@@ -175,7 +213,7 @@ class TrackerData:
     def get_team_locations_total_count(self) -> Dict[int, int]:
         """Retrieves a dictionary of total player locations each team has."""
         return {
-            team: sum(len(self.get_player_locations(team, player)) for player in players)
+            team: sum(len(self.get_player_location_ids(team, player)) for player in players)
             for team, players in self.get_all_players().items()
         }
 
@@ -194,7 +232,7 @@ class TrackerData:
         """Retrieves a dictionary of all players ids on each team."""
         return {
             0: [
-                player for player, slot_info in self._multidata["slot_info"].items()
+                player for player, slot_info in self._static_data["slot_info"].items()
             ]
         }
 
@@ -205,7 +243,7 @@ class TrackerData:
         """Retrieves a dictionary of all player slot-type players ids on each team."""
         return {
             0: [
-                player for player, slot_info in self._multidata["slot_info"].items()
+                player for player, slot_info in self._static_data["slot_info"].items()
                 if self.get_slot_info(0, player).type == SlotType.player
             ]
         }
@@ -219,10 +257,10 @@ class TrackerData:
         return get_saving_second(self.get_seed_name())
 
     @_cache_results
-    def get_room_locations(self) -> Dict[TeamPlayer, Dict[int, ItemMetadata]]:
-        """Retrieves a dictionary of all locations and their associated item metadata per player."""
+    def get_room_locations(self) -> Dict[TeamPlayer, Collection[int]]:
+        """Retrieves a dictionary of all location ids per player."""
         return {
-            (team, player): self.get_player_locations(team, player)
+            (team, player): self.get_player_location_ids(team, player)
             for team, players in self.get_all_players().items() for player in players
         }
 
@@ -371,7 +409,7 @@ def render_generic_tracker(tracker_data: TrackerData, team: int, player: int) ->
         player=player,
         player_name=tracker_data.get_room_long_player_names()[team, player],
         inventory=tracker_data.get_player_inventory_counts(team, player),
-        locations=tracker_data.get_player_locations(team, player),
+        locations=tracker_data.get_player_location_ids(team, player),
         checked_locations=tracker_data.get_player_checked_locations(team, player),
         received_items=received_items_in_order,
         saving_second=tracker_data.get_room_saving_second(),
@@ -1,5 +1,7 @@
 import base64
+import functools
 import json
+import os
 import pickle
 import typing
 import uuid
@@ -14,8 +16,9 @@ from pony.orm.core import TransactionIntegrityError
 import schema
 
 import MultiServer
-from NetUtils import SlotType
+from NetUtils import SlotType, encode_multidata, encode_multidata_format
 from Utils import VersionException, __version__
+from settings import get_settings
 from worlds import GamesPackage
 from worlds.Files import AutoPatchRegister
 from worlds.AutoWorld import data_package_checksum
@@ -49,9 +52,20 @@ def banned_file(filename: str) -> bool:
 
 
 def process_multidata(compressed_multidata, files={}):
-    game_data: GamesPackage
-
     decompressed_multidata = MultiServer.Context.decompress(compressed_multidata)
+    slots = process_decompressed_multidata(decompressed_multidata, files)
+
+    if compressed_multidata[0] >= 4:
+        compressed_multidata = encode_multidata(decompressed_multidata)
+    else:
+        compressed_multidata = compressed_multidata[0:1] + zlib.compress(pickle.dumps(decompressed_multidata), 9)
+    return slots, compressed_multidata
+
+
+def process_decompressed_multidata(decompressed_multidata: typing.Dict[str, typing.Any],
+                                   files: typing.Dict[int, bytes]) -> typing.Set[Slot]:
+    """Stores the data packages of multidata, replacing them with their checksums, and creates its Slots."""
+    game_data: GamesPackage
 
     slots: typing.Set[Slot] = set()
     if "datapackage" in decompressed_multidata:
@@ -59,6 +73,7 @@ def process_multidata(compressed_multidata, files={}):
         game_data_packages: typing.List[GameDataPackage] = []
         for game, game_data in decompressed_multidata["datapackage"].items():
             if game_data.get("checksum"):
+                game_data = dict(game_data)  # may be the generator's own data package
                 original_checksum = game_data.pop("checksum")
                 game_data = games_package_schema.validate(game_data)
                 game_data = {key: value for key, value in sorted(game_data.items())}
@@ -90,9 +105,7 @@ def process_multidata(compressed_multidata, files={}):
                            player_id=slot,
                            game=slot_info.game))
         flush()  # commit slots
-
-    compressed_multidata = compressed_multidata[0:1] + zlib.compress(pickle.dumps(decompressed_multidata), 9)
-    return slots, compressed_multidata
+    return slots
 
 
 def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, sid=None):
@@ -104,74 +117,106 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
                      'Did you mean to <a href="/generate">generate a game</a>?'))
         return
 
+    loaded = load_files([(file.filename, functools.partial(zfile.read, file)) for file in infolist])
+    if not isinstance(loaded, tuple):
+        return loaded
+    files, spoiler, multidata = loaded
+
+    # Load multi data.
+    if multidata:
+        slots, multidata = process_multidata(multidata, files)
+        return store_seed(multidata, slots, spoiler, owner, meta, sid)
+    else:
+        flash("No multidata was found in the zip file, which is required.")
+
+
+def upload_output_to_db(folder: str, multidata: typing.Dict[str, typing.Any], spoiler: str, owner,
+                        meta={"race": False}, sid=None):
+    """Stores the output Main.main handed to its output_handler, so multidata is encoded once, in its stored form."""
+    loaded = load_files([(entry.name, functools.partial(read_file, entry.path)) for entry in os.scandir(folder)])
+    if not isinstance(loaded, tuple):
+        return loaded
+    files, _, _ = loaded
+    slots = process_decompressed_multidata(multidata, files)
+    multidata_format = get_settings().generator.multidata_format
+    return store_seed(encode_multidata_format(multidata, multidata_format), slots, spoiler, owner, meta, sid)
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_files(entries: typing.List[typing.Tuple[str, typing.Callable[[], bytes]]]) \
+        -> typing.Union[str, None, typing.Tuple[typing.Dict[int, bytes], str, typing.Optional[bytes]]]:
+    """Sorts uploaded files, given as names with a function reading them, into slot files by slot, spoiler and
+    multidata. Returns an error message for banned files, None after flashing an unexpected file."""
     spoiler = ""
     files = {}
     multidata = None
 
     # Load files.
-    for file in infolist:
-        handler = AutoPatchRegister.get_handler(file.filename)
-        if banned_file(file.filename):
+    for filename, read in entries:
+        handler = AutoPatchRegister.get_handler(filename)
+        if banned_file(filename):
             return "Uploaded data contained a rom file, which is likely to contain copyrighted material. " \
                    "Your file was deleted."
 
         # AP Container
         elif handler:
-            data = zfile.open(file, "r").read()
+            data = read()
             patch = handler(BytesIO(data))
             patch.read()
             files[patch.player] = data
 
         # Spoiler
-        elif file.filename.endswith(".txt"):
-            spoiler = zfile.open(file, "r").read().decode("utf-8-sig")
+        elif filename.endswith(".txt"):
+            spoiler = read().decode("utf-8-sig")
 
         # Multi-data
-        elif file.filename.endswith(".archipelago"):
+        elif filename.endswith(".archipelago"):
             try:
-                multidata = zfile.open(file).read()
+                multidata = read()
             except:
                 flash("Could not load multidata. File may be corrupted or incompatible.")
                 multidata = None
 
         # Minecraft
-        elif file.filename.endswith(".apmc"):
-            data = zfile.open(file, "r").read()
+        elif filename.endswith(".apmc"):
+            data = read()
             metadata = json.loads(base64.b64decode(data).decode("utf-8"))
             files[metadata["player_id"]] = data
 
         # Factorio
-        elif file.filename.endswith(".zip"):
+        elif filename.endswith(".zip"):
             try:
-                _, _, slot_id, *_ = file.filename.split('_')[0].split('-', 3)
+                _, _, slot_id, *_ = filename.split('_')[0].split('-', 3)
             except ValueError:
-                flash("Error: Unexpected file found in .zip: " + file.filename)
+                flash("Error: Unexpected file found in .zip: " + filename)
                 return
-            data = zfile.open(file, "r").read()
+            data = read()
             files[int(slot_id[1:])] = data
 
         # All other files using the standard MultiWorld.get_out_file_name_base method
         else:
             try:
-                _, _, slot_id, *_ = file.filename.split('.')[0].split('_', 3)
+                _, _, slot_id, *_ = filename.split('.')[0].split('_', 3)
             except ValueError:
-                flash("Error: Unexpected file found in .zip: " + file.filename)
+                flash("Error: Unexpected file found in .zip: " + filename)
                 return
-            data = zfile.open(file, "r").read()
+            data = read()
             files[int(slot_id[1:])] = data
 
-    # Load multi data.
-    if multidata:
-        slots, multidata = process_multidata(multidata, files)
+    return files, spoiler, multidata
 
-        seed = Seed(multidata=multidata, spoiler=spoiler, slots=slots, owner=owner, meta=json.dumps(meta),
-                    id=sid if sid else uuid.uuid4())
-        flush()  # create seed
-        for slot in slots:
-            slot.seed = seed
-        return seed
-    else:
-        flash("No multidata was found in the zip file, which is required.")
+
+def store_seed(multidata: bytes, slots: typing.Set[Slot], spoiler: str, owner, meta, sid) -> Seed:
+    seed = Seed(multidata=multidata, spoiler=spoiler, slots=slots, owner=owner, meta=json.dumps(meta),
+                id=sid if sid else uuid.uuid4())
+    flush()  # create seed
+    for slot in slots:
+        slot.seed = seed
+    return seed
 
 
 @app.route("/uploads", methods=["GET", "POST"])
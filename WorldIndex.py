@@ -0,0 +1,123 @@
+"""
+Persisted index of the installed worlds, so the worlds package only has to import the worlds a process looks up.
+It is written by the worlds package whenever it had to import worlds missing from it,
+and is invalidated by changes to any world source.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import typing
+
+import Utils
+
+if typing.TYPE_CHECKING:
+    from worlds import GamesPackage
+    from worlds.AutoWorld import World
+
+index_version = 3
+
+
+class WorldIndexEntry(typing.TypedDict):
+    module: str
+    data_package: GamesPackage
+    hint_blacklist: typing.List[str]
+    hidden: bool
+    settings_key: str
+    settings: typing.Optional[str]  # module.ClassName of the world, if it has a settings group
+
+
+class IndexData(typing.TypedDict):
+    games: typing.Dict[str, WorldIndexEntry]
+    failed_sources: typing.List[str]  # paths of world sources that could not be imported, tried again on next start
+    component_sources: typing.List[str]  # paths of world sources that register launcher components or icons
+
+
+def get_index_path() -> str:
+    return Utils.cache_path("world_index.json")
+
+
+def _source_signature(path: str) -> typing.List[float]:
+    """Latest modification time and number of files of a world source, so removing a file changes it too."""
+    if not os.path.isdir(path):
+        return [os.stat(path).st_mtime, 1]
+    mtime = 0.
+    count = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [folder for folder in dirs if folder != "__pycache__"]
+        for file in files:
+            mtime = max(mtime, os.stat(os.path.join(root, file)).st_mtime)
+        count += len(files)
+    return [mtime, count]
+
+
+def get_source_signatures(folders: typing.Iterable[typing.Optional[str]]) -> typing.Dict[str, typing.List[float]]:
+    """Returns the signature of each world source in folders, found the same way as the worlds package does."""
+    signatures: typing.Dict[str, typing.List[float]] = {}
+    for folder in (folder for folder in folders if folder):
+        for entry in os.scandir(folder):
+            if not entry.name.startswith(("_", ".")) and \
+                    (entry.is_dir() or entry.is_file() and entry.name.endswith(".apworld")):
+                signatures[os.path.abspath(entry.path)] = _source_signature(entry.path)
+    return signatures
+
+
+def build_index(world_types: typing.Mapping[str, typing.Type[World]],
+                games: typing.Dict[str, GamesPackage]) -> typing.Dict[str, WorldIndexEntry]:
+    """Returns the index entry of each loaded world type, with its data package from games."""
+    index: typing.Dict[str, WorldIndexEntry] = {}
+    for game, data_package in games.items():
+        world_type = world_types[game]
+        annotation = world_type.__annotations__.get("settings", None)
+        has_settings = annotation is not None and annotation != "ClassVar[Optional['Group']]"
+        index[game] = {"module": world_type.__module__,
+                       "data_package": data_package,
+                       "hint_blacklist": sorted(world_type.hint_blacklist),
+                       "hidden": world_type.hidden,
+                       "settings_key": world_type.settings_key,
+                       "settings": f"{world_type.__module__}.{world_type.__name__}" if has_settings else None}
+    return index
+
+
+def load_index(folders: typing.Iterable[typing.Optional[str]],
+               path: typing.Optional[str] = None) -> typing.Optional[IndexData]:
+    """Returns the index entries and sources, or None if there is no index for the worlds in folders."""
+    try:
+        with open(path or get_index_path(), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != index_version or index.get("archipelago_version") != Utils.__version__ or \
+                index.get("sources") != get_source_signatures(folders):
+            return None
+    except (OSError, ValueError):
+        return None
+    return {"games": index["games"], "failed_sources": index["failed_sources"],
+            "component_sources": index["component_sources"]}
+
+
+def write_index(data: IndexData, folders: typing.Iterable[typing.Optional[str]],
+                path: typing.Optional[str] = None) -> None:
+    """Writes the index entries and sources of the worlds in folders."""
+    path = path or get_index_path()
+    try:
+        index = {
+            "version": index_version,
+            "archipelago_version": Utils.__version__,
+            "sources": get_source_signatures(folders),
+            "games": data["games"],
+            "failed_sources": data["failed_sources"],
+            "component_sources": data["component_sources"],
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # a file per process, as several processes may rebuild the index at once
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(path), suffix=".tmp",
+                                         delete=False) as f:
+            json.dump(index, f)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.remove(f.name)
+            raise
+    except OSError as e:
+        logging.debug(f"Could not write world index: {e}")
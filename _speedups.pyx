@@ -8,11 +8,13 @@ This is deliberately .pyx because using a non-compiled "pure python" may be slow
 
 # pip install cython cymem
 import cython
+import sys
 import warnings
 from cpython cimport PyObject
 from typing import Any, Dict, Iterable, Iterator, Generator, Sequence, Tuple, TypeVar, Union, Set, List, TYPE_CHECKING
 from cymem.cymem cimport Pool
 from libc.stdint cimport int64_t, uint32_t
+from libc.string cimport memcpy
 from libcpp.set cimport set as std_set
 from collections import defaultdict
 
@@ -67,6 +69,7 @@ cdef class LocationStore:
     cdef list _items  # ~64KB/1000 players, speed up items (56 per tuple + 8 per list entry)
     cdef list _proxies  # ~92KB/1000 players, speed up self[player] (56 per struct + 28 per len + 8 per list entry)
     cdef PyObject** _raw_proxies  # 8K/1000 players, faster access to _proxies, but does not keep a ref
+    cdef object _table  # keeps the buffer entries point into alive, if created from_table
 
     def get_size(self):
         from sys import getsizeof
@@ -137,7 +140,12 @@ cdef class LocationStore:
                 self.sender_index[sender].count += 1
                 i += 1
 
+        self._build_caches(max_sender, count)
+
+    cdef void _build_caches(self, size_t max_sender, size_t count) except *:
         # build pyobject caches
+        cdef object key
+        cdef size_t i
         self._proxies.append(None)  # player 0
         assert self.sender_index[0].count == 0
         for i in range(1, max_sender + 1):
@@ -153,7 +161,58 @@ cdef class LocationStore:
 
         self.sender_index_size = max_sender + 1
         self.entry_count = count
-        self._len = sender_count
+        self._len = max_sender
+
+    @staticmethod
+    def from_table(table: Any, players: int) -> LocationStore:
+        """Creates a store from a location table of multidata format 4 without copying it, if possible.
+        The table has to stay unmodified for the lifetime of the store."""
+        if sys.byteorder != "little":
+            raise ValueError("Location tables are little endian and can only be used in place on little endian")
+        if players < 1 or players > MAX_PLAYER_ID:
+            raise ValueError(f"Invalid player count {players}")
+        cdef const unsigned char[::1] view = table
+        cdef size_t count = view.shape[0] // sizeof(LocationEntry)
+        if view.shape[0] % sizeof(LocationEntry):
+            raise ValueError("Location table size is not a multiple of its entry size")
+        cdef LocationStore store = LocationStore.__new__(LocationStore)
+        store._mem = Pool()
+        store._keys = []
+        store._items = []
+        store._proxies = []
+        if count and (<size_t>&view[0]) % sizeof(ap_id_t) == 0:
+            store._table = view
+            store.entries = <LocationEntry*>&view[0]
+        else:  # misaligned, so copy it
+            store.entries = <LocationEntry*>store._mem.alloc(count, sizeof(LocationEntry))
+            if count:
+                memcpy(store.entries, &view[0], count * sizeof(LocationEntry))
+        store.sender_index = <IndexEntry*>store._mem.alloc(players + 1, sizeof(IndexEntry))
+        store._raw_proxies = <PyObject**>store._mem.alloc(players + 1, sizeof(PyObject*))
+
+        # validate ordering and build index
+        cdef size_t i
+        cdef LocationEntry* entry
+        cdef LocationEntry* previous = NULL
+        for i in range(count):
+            entry = store.entries + i
+            if entry.sender < 1 or entry.sender > players:
+                raise ValueError(f"Invalid player id {entry.sender} for location")
+            if entry.receiver < 1 or entry.receiver > MAX_PLAYER_ID:
+                raise ValueError(f"Invalid player id {entry.receiver} for item")
+            if previous and (entry.sender < previous.sender or
+                             (entry.sender == previous.sender and entry.location <= previous.location)):
+                raise ValueError("Location table is not sorted")
+            if not store.sender_index[entry.sender].count:
+                store.sender_index[entry.sender].start = i
+            store.sender_index[entry.sender].count += 1
+            previous = entry
+
+        if not count:
+            warnings.warn("Game has no locations")
+
+        store._build_caches(players, count)
+        return store
 
     # fake dict access
     def __len__(self) -> int:
@@ -315,6 +374,9 @@ cdef class PlayerLocationProxy:
                 return entry
         return NULL
 
+    def __contains__(self, key: int) -> bool:
+        return self._get(key) != NULL
+
     def __getitem__(self, key: int) -> Tuple[int, int, int]:
         cdef LocationEntry* entry = self._get(key)
         if entry:
@@ -335,3 +397,178 @@ cdef class PlayerLocationProxy:
         count = self._store.sender_index[self._player].count
         for entry in self._store.entries[start:start+count]:
             yield entry.location, (entry.item, entry.receiver, entry.flags)
+
+
+# OoT ROM output. The reference implementations are worlds/oot/crc.py and worlds/oot/N64Patch.py,
+# which fall back to pure python if these are not available.
+
+cdef inline uint32_t _read_uint32(const unsigned char[::1] buffer, size_t address) noexcept nogil:
+    return (<uint32_t>buffer[address] << 24) | (<uint32_t>buffer[address + 1] << 16) | \
+           (<uint32_t>buffer[address + 2] << 8) | <uint32_t>buffer[address + 3]
+
+
+def n64_crc(const unsigned char[::1] buffer) -> bytes:
+    """CIC-6105 checksum of a ROM, as written to its header."""
+    if buffer.shape[0] < 0x101000:
+        raise ValueError("ROM is too small to calculate its CRC")
+    cdef uint32_t t1, t2, t3, t4, t5, t6, d, r, shift
+    cdef size_t i
+    t1 = t2 = t3 = t4 = t5 = t6 = 0xDF26F436
+    with nogil:
+        for i in range(0x40000):
+            d = _read_uint32(buffer, 0x1000 + i * 4)
+            if <uint32_t>(t6 + d) < t6:
+                t4 += 1
+            t6 += d
+            t3 ^= d
+            shift = d & 0x1F
+            r = (d << shift) | (d >> (32 - shift)) if shift else d
+            t5 += r
+            if t2 > d:
+                t2 ^= r
+            else:
+                t2 ^= t6 ^ d
+            t1 += _read_uint32(buffer, 0x750 + (i & 0x3F) * 4) ^ d
+    return (t6 ^ t4 ^ t3).to_bytes(4, "big") + (t5 ^ t2 ^ t1).to_bytes(4, "big")
+
+
+cdef inline size_t _zpf_key_next(const unsigned char[::1] key_buffer, size_t key_address,
+                                 size_t range_start, size_t range_end) noexcept nogil:
+    # skips 0s, the same as N64Patch.key_next
+    while True:
+        key_address += 1
+        if key_address > range_end:
+            key_address = range_start
+        if key_buffer[key_address]:
+            return key_address
+
+
+cdef void _zpf_write_section(bytearray out, uint32_t start, unsigned char key_skip,
+                             const unsigned char* data, size_t length, bint is_continue):
+    if is_continue:
+        out.append(0xFF)
+        out.append(key_skip)
+    else:
+        out += start.to_bytes(4, "big")
+    out += (length & 0xFFFF).to_bytes(2, "big")
+    out += data[:length]
+
+
+def zpf_write_block(const unsigned char[::1] key_buffer, size_t xor_address, size_t range_start, size_t range_end,
+                    uint32_t block_start, const unsigned char[::1] data) -> Tuple[bytes, int]:
+    """XORs a block of a Zelda Patch Format file, returns the encoded sections and the last XOR key address."""
+    if range_start > range_end or range_end >= <size_t>key_buffer.shape[0]:
+        raise ValueError("Invalid XOR key range")
+    cdef Pool mem = Pool()
+    cdef unsigned char* new_data = <unsigned char*>mem.alloc(data.shape[0] + 1, sizeof(unsigned char))
+    cdef bytearray out = bytearray()
+    cdef size_t length = 0
+    cdef size_t i
+    cdef unsigned char b, key
+    cdef unsigned char key_offset = 0
+    cdef bint continue_block = False
+    for i in range(<size_t>data.shape[0]):
+        b = data[i]
+        if b == 0:
+            # Leave 0s as 0s. Do not XOR
+            new_data[length] = 0
+            length += 1
+            continue
+        xor_address = _zpf_key_next(key_buffer, xor_address, range_start, range_end)
+        key = key_buffer[xor_address]
+        # if the XOR would result in 0, skip keys, which requires breaking up the block
+        if b == key:
+            _zpf_write_section(out, block_start, key_offset, new_data, length, continue_block)
+            length = 0
+            key_offset = 0
+            continue_block = True
+            while b == key:
+                key_offset += 1
+                xor_address = _zpf_key_next(key_buffer, xor_address, range_start, range_end)
+                key = key_buffer[xor_address]
+                if key_offset == 0xFF:
+                    _zpf_write_section(out, block_start, key_offset, new_data, length, continue_block)
+                    key_offset = 0
+        new_data[length] = b ^ key
+        length += 1
+        # Break the block if it's too long
+        if length == 0xFFFF:
+            _zpf_write_section(out, block_start, key_offset, new_data, length, continue_block)
+            length = 0
+            key_offset = 0
+            continue_block = True
+    _zpf_write_section(out, block_start, key_offset, new_data, length, continue_block)
+    return bytes(out), xor_address
+
+
+def zpf_read_block(const unsigned char[::1] key_buffer, size_t xor_address, size_t range_start, size_t range_end,
+                   size_t key_skip, const unsigned char[::1] data) -> Tuple[bytes, int]:
+    """Reverses zpf_write_block for one section, returns the decoded data and the last XOR key address."""
+    if range_start > range_end or range_end >= <size_t>key_buffer.shape[0]:
+        raise ValueError("Invalid XOR key range")
+    cdef bytearray out = bytearray(data)
+    cdef unsigned char* decoded = out
+    cdef size_t i
+    with nogil:
+        for i in range(key_skip):
+            xor_address = _zpf_key_next(key_buffer, xor_address, range_start, range_end)
+        for i in range(<size_t>data.shape[0]):
+            if decoded[i]:
+                # The XOR will always be safe and will never produce 0
+                xor_address = _zpf_key_next(key_buffer, xor_address, range_start, range_end)
+                decoded[i] ^= key_buffer[xor_address]
+    return bytes(out), xor_address
+
+
+# Fuzzy name matching. Utils.FuzzyIndex falls back to jellyfish if this is not available.
+
+def damerau_levenshtein_distance(str word1, str word2) -> int:
+    """
+    Unrestricted Damerau-Levenshtein distance between the characters of two words.
+    jellyfish.damerau_levenshtein_distance compares grapheme clusters instead, so this matches it where those are single
+    characters, such as in ASCII without carriage returns.
+    """
+    cdef Py_ssize_t length1 = len(word1)
+    cdef Py_ssize_t length2 = len(word2)
+    if not length1 or not length2:
+        return length1 + length2
+    cdef Pool mem = Pool()
+    cdef Py_UCS4* chars1 = <Py_UCS4*>mem.alloc(length1, sizeof(Py_UCS4))
+    cdef Py_UCS4* chars2 = <Py_UCS4*>mem.alloc(length2, sizeof(Py_UCS4))
+    # characters past latin-1 get an alphabet index after it
+    cdef dict extended = {}
+    cdef Py_ssize_t i, j, k, l, last_match, cost, distance
+    cdef Py_UCS4 char
+    for i, char in enumerate(word1):
+        chars1[i] = char if char < 256 else 256 + <Py_ssize_t>extended.setdefault(char, len(extended))
+    for j, char in enumerate(word2):
+        chars2[j] = char if char < 256 else 256 + <Py_ssize_t>extended.setdefault(char, len(extended))
+    # last row a character was seen in, and the distance matrix with a border of max_distance
+    cdef Py_ssize_t* last_row = <Py_ssize_t*>mem.alloc(256 + len(extended), sizeof(Py_ssize_t))
+    cdef Py_ssize_t width = length2 + 2
+    cdef Py_ssize_t* matrix = <Py_ssize_t*>mem.alloc((length1 + 2) * width, sizeof(Py_ssize_t))
+    cdef Py_ssize_t max_distance = length1 + length2
+    matrix[0] = max_distance
+    for i in range(length1 + 1):
+        matrix[(i + 1) * width] = max_distance
+        matrix[(i + 1) * width + 1] = i
+    for j in range(length2 + 1):
+        matrix[j + 1] = max_distance
+        matrix[width + j + 1] = j
+    for i in range(1, length1 + 1):
+        last_match = 0
+        for j in range(1, length2 + 1):
+            k = last_row[chars2[j - 1]]
+            l = last_match
+            if chars1[i - 1] == chars2[j - 1]:
+                cost = 0
+                last_match = j
+            else:
+                cost = 1
+            distance = matrix[i * width + j] + cost
+            distance = min(distance, matrix[(i + 1) * width + j] + 1)
+            distance = min(distance, matrix[i * width + j + 1] + 1)
+            distance = min(distance, matrix[k * width + l] + (i - k - 1) + 1 + (j - l - 1))
+            matrix[(i + 1) * width + j + 1] = distance
+        last_row[chars1[i - 1]] = i
+    return matrix[(length1 + 1) * width + length2 + 1]
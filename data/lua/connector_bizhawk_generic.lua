@@ -20,7 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ]]
 
-local SCRIPT_VERSION = 1
+local SCRIPT_VERSION = 2
 
 -- Set to log incoming requests
 -- Will cause lag due to large console output
@@ -189,6 +189,35 @@ Response:
     Additional Fields:
     - `value` (`number`): The number of seconds to set the interval to
 
+- `WATCH`  
+    Registers a section of memory to be checked for changes by `WATCH_POLL`.
+    Registering an existing `id` replaces it. Watches are cleared when a new
+    client connects.
+
+    Expected Response Type: `WATCH_RESPONSE`
+
+    Additional Fields:
+    - `id` (`int`): An id from 0 to 65535 for the watch
+    - `address` (`int`): The address of the memory to watch
+    - `size` (`int`): The number of bytes to watch
+    - `domain` (`string`): The name of the memory domain the address
+    corresponds to
+
+- `UNWATCH`  
+    Removes a watch registered by `WATCH`.
+
+    Expected Response Type: `UNWATCH_RESPONSE`
+
+    Additional Fields:
+    - `id` (`int`): The id of the watch
+
+- `WATCH_POLL`  
+    Reads every watched section of memory and returns the bytes that changed
+    since the last `WATCH_POLL`. The first poll after a `WATCH` returns the
+    whole section.
+
+    Expected Response Type: `WATCH_POLL_RESPONSE`
+
 
 ### Response Types
 
@@ -246,6 +275,20 @@ Response:
 - `SET_MESSAGE_INTERVAL_RESPONSE`  
     Acknowledges `SET_MESSAGE_INTERVAL`.
 
+- `WATCH_RESPONSE`  
+    Acknowledges `WATCH`.
+
+- `UNWATCH_RESPONSE`  
+    Acknowledges `UNWATCH`.
+
+- `WATCH_POLL_RESPONSE`  
+    Contains the changes to watched memory.
+
+    Additional Fields:
+    - `value` (`string`): A base64 string of changed runs of bytes. Each run
+    is the watch id (2 bytes), the offset into the watched section (4 bytes)
+    and the length (2 bytes), all big endian, followed by the new bytes
+
 - `ERROR`  
     Signifies that something has gone wrong while processing a request.
 
@@ -297,6 +340,8 @@ local locked = false
 
 local rom_hash = nil
 
+local watches = {}
+
 function queue_push (self, value)
     self[self.right] = value
     self.right = self.right + 1
@@ -450,6 +495,64 @@ request_handlers = {
         return res
     end,
 
+    ["WATCH"] = function (req)
+        local res = {}
+
+        res["type"] = "WATCH_RESPONSE"
+        watches[req["id"]] = {address = req["address"], size = req["size"], domain = req["domain"], data = nil}
+
+        return res
+    end,
+
+    ["UNWATCH"] = function (req)
+        local res = {}
+
+        res["type"] = "UNWATCH_RESPONSE"
+        watches[req["id"]] = nil
+
+        return res
+    end,
+
+    ["WATCH_POLL"] = function (req)
+        local res = {}
+        local changes = {}
+
+        for id, watch in pairs(watches) do
+            local data = memory.read_bytes_as_array(watch.address, watch.size, watch.domain)
+            local previous = watch.data
+            local i = 1
+            while i <= #data do
+                if previous == nil or data[i] ~= previous[i] then
+                    local run_start = i
+                    while i <= #data and i - run_start < 0xFFFF and (previous == nil or data[i] ~= previous[i]) do
+                        i = i + 1
+                    end
+                    local offset = run_start - 1
+                    local length = i - run_start
+                    for _, byte in ipairs({
+                        math.floor(id / 0x100) % 0x100, id % 0x100,
+                        math.floor(offset / 0x1000000) % 0x100, math.floor(offset / 0x10000) % 0x100,
+                        math.floor(offset / 0x100) % 0x100, offset % 0x100,
+                        math.floor(length / 0x100) % 0x100, length % 0x100
+                    }) do
+                        changes[#changes + 1] = byte
+                    end
+                    for j = run_start, i - 1 do
+                        changes[#changes + 1] = data[j]
+                    end
+                else
+                    i = i + 1
+                end
+            end
+            watch.data = data
+        end
+
+        res["type"] = "WATCH_POLL_RESPONSE"
+        res["value"] = base64.encode(changes)
+
+        return res
+    end,
+
     ["default"] = function (req)
         local res = {}
 
@@ -584,6 +687,7 @@ function main ()
                     print("Client connected")
                     current_state = STATE_CONNECTED
                     client_socket = client
+                    watches = {}
                     server:close()
                     server = nil
                     client_socket:settimeout(0)
@@ -34,12 +34,10 @@ def _update_cache() -> None:
         return
 
     try:
-        from worlds.AutoWorld import AutoWorldRegister
-        for world in AutoWorldRegister.world_types.values():
-            annotation = world.__annotations__.get("settings", None)
-            if annotation is None or annotation == "ClassVar[Optional['Group']]":
-                continue
-            _world_settings_name_cache[world.settings_key] = f"{world.__module__}.{world.__name__}"
+        from worlds import world_index  # avoids importing all worlds
+        for entry in world_index.values():
+            if entry["settings"]:
+                _world_settings_name_cache[entry["settings_key"]] = entry["settings"]
     finally:
         _world_settings_name_cache_updated = True
 
@@ -592,6 +590,7 @@ class ServerOptions(Group):
     multidata: Optional[str] = None
     savefile: Optional[str] = None
     disable_save: bool = False
+    save_journal: bool = False
     loglevel: str = "info"
     server_password: Optional[ServerPassword] = None
     disable_item_cheat: Union[DisableItemCheat, bool] = False
@@ -665,6 +664,15 @@ class GeneratorOptions(Group):
         OFF = 0
         ON = 1
 
+    class MultidataFormat(IntEnum):
+        """
+        Format of the .archipelago file
+        3 -> Can be loaded by all servers
+        4 -> Faster to load and smaller, but can only be loaded by servers of this version or newer
+        """
+        COMPATIBLE = 3
+        LOCATION_TABLE = 4
+
     enemizer_path: EnemizerPath = EnemizerPath("EnemizerCLI/EnemizerCLI.Core")  # + ".exe" is implied on Windows
     player_files_path: PlayerFilesPath = PlayerFilesPath("Players")
     players: Players = Players(0)
@@ -673,6 +681,7 @@ class GeneratorOptions(Group):
     spoiler: Spoiler = Spoiler(3)
     glitch_triforce_room: GlitchTriforceRoom = GlitchTriforceRoom(1)  # why is this here?
     race: Race = Race(0)
+    multidata_format: MultidataFormat = MultidataFormat(3)
     plando_options: PlandoOptions = PlandoOptions("bosses, connections, texts")
 
 
@@ -733,15 +742,14 @@ class Settings(Group):
             if key not in _world_settings_name_cache:
                 # find world that provides the settings class
                 _update_cache()
-                # check for missing keys to update _changed
-                for world_settings_name in _world_settings_name_cache:
-                    if world_settings_name not in dir(self):
-                        self._changed = True
             if key not in _world_settings_name_cache:
                 # not a world group
                 return super().__getattribute__(key)
             # directly import world and grab settings class
             world_mod, world_cls_name = _world_settings_name_cache[key].rsplit(".", 1)
+            if self._dumping and world_mod not in sys.modules and key in dir(self):
+                # written as read, as worlds may not be importable while auto-saving at exit
+                return super().__getattribute__(key)
             world = cast(type, getattr(__import__(world_mod, fromlist=[world_cls_name]), world_cls_name))
             assert getattr(world, "settings_key") == key
             try:
@@ -817,10 +825,12 @@ class Settings(Group):
         self._filename = location
 
     def dump(self, f: TextIO, level: int = 0) -> None:
-        # load all world setting classes
+        # load the setting classes of imported worlds, adding their sections if missing.
+        # the sections of other worlds are written as read, see __getattribute__, and added once their world is used
         _update_cache()
-        for key in _world_settings_name_cache:
-            self.__getattribute__(key)  # load all worlds
+        for key, world_settings_name in _world_settings_name_cache.items():
+            if world_settings_name.rsplit(".", 1)[0] in sys.modules:
+                self.__getattribute__(key)
         super().dump(f, level)
 
     @property
@@ -55,7 +55,9 @@ if __name__ == "__main__":
     import ModuleUpdate
     ModuleUpdate.update(yes="--yes" in sys.argv or "-y" in sys.argv)
 
+from worlds import load_component_worlds
 from worlds.LauncherComponents import components, icon_paths
+load_component_worlds()  # worlds register their components on import
 from Utils import version_tuple, is_windows, is_linux
 from Cython.Build import cythonize
 
@@ -5,3 +5,7 @@ if __name__ == "__main__":
     load_worlds.run_load_worlds_benchmark()
     import locations
     locations.run_locations_benchmark()
+    import oot_patch
+    oot_patch.run_oot_patch_benchmark()
+    import generation
+    generation.run_generation_benchmark()
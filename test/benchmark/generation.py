@@ -0,0 +1,297 @@
+import logging
+import typing
+
+default_games = ("Clique", "ChecksFinder", "Hollow Knight", "The Witness")
+
+
+def get_peak_rss() -> typing.Optional[float]:
+    """Peak resident set size of this process in MiB, if the platform can tell."""
+    import sys
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 2 ** 20
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB everywhere else
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def write_player_files(directory: str, players: int, games: typing.Sequence[str]) -> None:
+    """Writes one yaml with default options per player, cycling through the games."""
+    import os
+
+    import yaml
+
+    for player in range(1, players + 1):
+        game = games[(player - 1) % len(games)]
+        with open(os.path.join(directory, f"Player{player}.yaml"), "w", encoding="utf-8") as f:
+            yaml.dump({"name": f"Player{player}", "game": game, game: {}}, f)
+
+
+def simulate_server_load(multidata_path: str, checks_per_message: int, hint_interval: int,
+                         seed: int) -> typing.Dict[str, float]:
+    """
+    Connects one simulated client per slot to a MultiServer Context of the multidata and has them send their checks in
+    batches, round-robin, with a !hint after every hint_interval checks messages of a client.
+    Returns the time taken per kind of message and the counts of messages and bytes the server sent.
+    """
+    import asyncio
+    import random
+    import time
+
+    import MultiServer
+    from Utils import version_tuple
+
+    class BenchmarkSocket:
+        open = True
+
+        def __init__(self) -> None:
+            self.messages = 0
+            self.sent = 0
+
+        async def send(self, msg: str) -> None:
+            self.messages += 1
+            self.sent += len(msg)
+
+    class BenchmarkContext(MultiServer.Context):
+        async def broadcast_send_encoded_msgs(self, endpoints: typing.Iterable[MultiServer.Endpoint],
+                                              msg: str) -> bool:
+            for endpoint in endpoints:
+                if endpoint.socket and endpoint.socket.open:
+                    await endpoint.socket.send(msg)
+            return True
+
+    async def run() -> typing.Dict[str, float]:
+        ctx = BenchmarkContext("", 0, None, None, 1, 0, False, "enabled", "enabled", "enabled")
+        ctx.load(multidata_path)
+        random_source = random.Random(seed)
+        timings = {"connect": 0.0, "checks": 0.0, "hints": 0.0}
+        counts = {"checks": 0, "hints": 0}
+
+        async def handle(kind: str, client: MultiServer.Client, args: typing.Dict[str, typing.Any]) -> None:
+            start = time.perf_counter()
+            await MultiServer.process_client_cmd(ctx, client, args)
+            await asyncio.sleep(0)  # let the queued broadcasts run
+            timings[kind] += time.perf_counter() - start
+
+        clients: typing.List[MultiServer.Client] = []
+        for (team, slot), name in ctx.player_names.items():
+            if slot in ctx.groups:
+                continue
+            client = MultiServer.Client(BenchmarkSocket(), ctx)
+            ctx.endpoints.append(client)
+            clients.append(client)
+            await handle("connect", client, {"cmd": "Connect", "password": None, "game": ctx.games[slot],
+                                             "name": name, "uuid": f"benchmark-{slot}",
+                                             "version": max(version_tuple, ctx.minimum_client_versions[slot]),
+                                             "tags": [], "items_handling": 0b111, "slot_data": True})
+
+        missing = {}
+        hintable = {}
+        for client in clients:
+            missing[client] = MultiServer.get_missing_checks(ctx, client.team, client.slot)
+            random_source.shuffle(missing[client])
+            item_names = {item_id: item_name for item_name, item_id
+                          in ctx.item_names_for_game(ctx.games[client.slot]).items()}
+            hintable[client] = sorted({item_names[ctx.locations[source_slot][location_id][0]]
+                                       for source_slot, location_ids
+                                       in ctx.locations.get_for_player(client.slot).items()
+                                       for location_id in location_ids})
+
+        message = 0
+        while any(missing.values()):
+            message += 1
+            for client in clients:
+                if missing[client]:
+                    checks, missing[client] = missing[client][:checks_per_message], missing[client][checks_per_message:]
+                    await handle("checks", client, {"cmd": "LocationChecks", "locations": checks})
+                    counts["checks"] += 1
+                if message % hint_interval == 0 and hintable[client]:
+                    await handle("hints", client, {"cmd": "Say",
+                                                   "text": f"!hint {random_source.choice(hintable[client])}"})
+                    counts["hints"] += 1
+
+        return {
+            "server_connect": timings["connect"],
+            "server_checks": timings["checks"],
+            "server_hints": timings["hints"],
+            "server_checks_messages": counts["checks"],
+            "server_hints_messages": counts["hints"],
+            "server_messages_sent": sum(client.socket.messages for client in clients),
+            "server_bytes_sent": sum(client.socket.sent for client in clients),
+        }
+
+    return asyncio.run(run())
+
+
+def compare_to_baseline(results: typing.Dict[str, float], baseline: typing.Dict[str, float], tolerance: float,
+                        min_difference: float) -> typing.List[str]:
+    """Returns a description of every result that is more than tolerance (a fraction) and min_difference above its
+    baseline. Counts of messages and bytes sent are compared the same way."""
+    regressions = []
+    for name, value in results.items():
+        if name in baseline and value > baseline[name] * (1 + tolerance) and value - baseline[name] > min_difference:
+            regressions.append(f"{name}: {value:.4f}, baseline {baseline[name]:.4f} "
+                               f"(+{(value / baseline[name] - 1) * 100 if baseline[name] else float('inf'):.1f}%)")
+    return regressions
+
+
+def measure_generation(players: int, games: typing.Sequence[str], seed: int, spoiler: int, checks_per_message: int,
+                       hint_interval: int, logger: logging.Logger) -> typing.Dict[str, float]:
+    """Generates the multiworld once, then simulates the client load on its multidata, and returns the results."""
+    import json
+    import os
+    import sys
+    import tempfile
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    import Generate
+
+    results: typing.Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        player_files_path = os.path.join(temp_dir, "Players")
+        output_path = os.path.join(temp_dir, "Output")
+        report_path = os.path.join(temp_dir, "profile.json")
+        os.makedirs(player_files_path)
+        write_player_files(player_files_path, players, games)
+
+        argv = sys.argv
+        sys.argv = [argv[0], "--seed", str(seed), "--player_files_path", player_files_path,
+                    "--outputpath", output_path, "--spoiler", str(spoiler), "--profile_report", report_path]
+        try:
+            with TimeIt(f"Generating {players} players", logger) as generation_timer:
+                Generate.main()
+        finally:
+            sys.argv = argv
+        init_logging("Benchmark Runner")  # Generate initialized its own log
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        results["generation_total"] = generation_timer.dif
+        for phase, taken in report["phases"].items():
+            logger.info(f"{taken:.4f} seconds in phase {phase}.")
+            results[f"generation_{phase}"] = taken
+        results["generation_peak_rss_mib"] = get_peak_rss() or 0.0
+
+        multidata_path = next(os.path.join(output_path, file) for file in os.listdir(output_path)
+                              if file.endswith(".zip"))
+        with TimeIt("MultiServer simulated client load", logger):
+            server_results = simulate_server_load(multidata_path, checks_per_message, hint_interval, seed)
+        results.update(server_results)
+        results["server_peak_rss_mib"] = get_peak_rss() or 0.0
+    return results
+
+
+def median_results(runs: typing.Sequence[typing.Dict[str, float]]) -> typing.Dict[str, float]:
+    """Returns the median of each result over runs, so a single slow run, e.g. from other load on the machine,
+    does not count as a regression. Results missing from some runs are taken over the runs that have them."""
+    import statistics
+
+    names = {name: None for run in runs for name in run}
+    return {name: statistics.median(run[name] for run in runs if name in run) for name in names}
+
+
+def run_generation_benchmark(players: int = 12, games: typing.Sequence[str] = default_games, seed: int = 0,
+                             spoiler: int = 3, checks_per_message: int = 5, hint_interval: int = 10,
+                             baseline_path: typing.Optional[str] = None, write_baseline: bool = False,
+                             tolerance: float = 0.25, min_difference: float = 0.05, runs: int = 3) -> bool:
+    """
+    Generate a multiworld of players with default options, cycling through games, and time every phase of Main.main,
+    then time MultiServer handling the checks and hints of a simulated client per slot. Peak RSS is recorded after both.
+    This is repeated runs times and the median of each result is compared against the baseline stored for the same
+    players, games and seed in the JSON file at baseline_path, or stored there with write_baseline. Baselines are
+    machine specific, so write them on the machine that is compared. Returns False if any result regressed.
+    """
+    import json
+    import os
+
+    from Utils import init_logging, user_path
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+    if baseline_path is None:
+        baseline_path = user_path("benchmark_baselines", "generation.json")
+    config = f"{players} players, {', '.join(games)}, seed {seed}, spoiler {spoiler}"
+
+    run_results = []
+    for run in range(1, runs + 1):
+        logger.info(f"Run {run} of {runs} with {config}.")
+        run_results.append(measure_generation(players, games, seed, spoiler, checks_per_message, hint_interval,
+                                              logger))
+    results = median_results(run_results)
+
+    for name, value in results.items():
+        logger.info(f"{name}: {value:.4f}")
+
+    baselines: typing.Dict[str, typing.Dict[str, float]] = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baselines = json.load(f)
+    if write_baseline:
+        baselines[config] = results
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+        logger.info(f"Stored baseline for {config} in {baseline_path}.")
+        return True
+    if config not in baselines:
+        logger.warning(f"No baseline for {config} in {baseline_path}, run with --write_baseline to store one.")
+        return True
+    regressions = compare_to_baseline(results, baselines[config], tolerance, min_difference)
+    for regression in regressions:
+        logger.error(f"Regression in {regression}")
+    if not regressions:
+        logger.info(f"No regressions against the baseline for {config}.")
+    return not regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser(description="Times generation and MultiServer load of a synthetic multiworld.")
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--games", nargs="+", default=default_games)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spoiler", type=int, default=3)
+    parser.add_argument("--checks_per_message", type=int, default=5)
+    parser.add_argument("--hint_interval", type=int, default=10,
+                        help="Number of checks messages of a client between its hints.")
+    parser.add_argument("--baseline", default=None, help="Path of the JSON file with baselines.")
+    parser.add_argument("--write_baseline", action="store_true", help="Store results as the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Fraction the median of a result may exceed its baseline by before failing.")
+    parser.add_argument("--min_difference", type=float, default=0.05,
+                        help="Amount the median of a result has to exceed its baseline by before failing, "
+                             "so short phases don't fail on noise.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs to take the median of.")
+    benchmark_args = parser.parse_args()
+    if not run_generation_benchmark(benchmark_args.players, benchmark_args.games, benchmark_args.seed,
+                                    benchmark_args.spoiler, benchmark_args.checks_per_message,
+                                    benchmark_args.hint_interval, benchmark_args.baseline,
+                                    benchmark_args.write_baseline, benchmark_args.tolerance,
+                                    benchmark_args.min_difference, benchmark_args.runs):
+        sys.exit(1)
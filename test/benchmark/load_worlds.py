@@ -12,13 +12,15 @@ def run_load_worlds_benchmark():
 
     import BaseClasses, Launcher, Fill
 
-    from worlds import world_sources
+    from worlds import load_all_worlds, world_sources
+    load_all_worlds()
 
     init_logging("Benchmark Runner")
     logger = logging.getLogger("Benchmark")
 
     for module in world_sources:
-        logger.info(f"{module} took {module.time_taken:.4f} seconds.")
+        if module.time_taken is not None:
+            logger.info(f"{module} took {module.time_taken:.4f} seconds.")
 
 
 if __name__ == "__main__":
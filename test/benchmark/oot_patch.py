@@ -0,0 +1,66 @@
+def run_oot_patch_benchmark():
+    """Time OoT's ROM CRC and patch creation/application with _speedups against the pure python implementation.
+    Uses a random ROM, so no base ROM is required."""
+    import logging
+    import os
+    import random
+    import struct
+    import tempfile
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    import NetUtils  # sets up pyximport for _speedups
+    from worlds.oot import crc, N64Patch
+    from worlds.oot.Rom import Rom, DMADATA_START
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    if crc.n64_crc is None or N64Patch.zpf_write_block is None or N64Patch.zpf_read_block is None:
+        logger.warning("_speedups is not available, only timing the pure python implementation.")
+
+    def random_bytes(length: int) -> bytes:
+        return random.getrandbits(length * 8).to_bytes(length, "little")  # random.randbytes needs Python 3.9
+
+    random.seed(0)
+    buffer = bytearray(random_bytes(0x4000000))
+    for _ in range(100_000):
+        address, length = random.randrange(len(buffer) - 40), random.randrange(1, 40)
+        buffer[address:address + length] = bytes(length)
+    # minimal DMA table with the boot and dmadata entries
+    buffer[DMADATA_START:DMADATA_START + 0x30] = bytes(0x30)
+    buffer[DMADATA_START:DMADATA_START + 0x18] = struct.pack(">IIIIII", 0, DMADATA_START, 0, 0,
+                                                             DMADATA_START, DMADATA_START + 0x30)
+    rom = Rom()
+    rom.buffer = buffer
+    Rom.original = rom.copy()
+    for _ in range(20_000):
+        rom.write_bytes(random.randrange(0x10000, 0x3F00000), random_bytes(random.randrange(1, 200)))
+
+    implementations = {"_speedups": (crc.n64_crc, N64Patch.zpf_write_block, N64Patch.zpf_read_block),
+                       "python": (None, None, None)}
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        patch_file = os.path.join(temp_dir, "benchmark.zpf")
+        for name, (crc.n64_crc, N64Patch.zpf_write_block, N64Patch.zpf_read_block) in implementations.items():
+            with TimeIt(f"{name} calculate_crc", logger):
+                header = crc.calculate_crc(rom)
+            with TimeIt(f"{name} create_patch_file", logger):
+                patch = N64Patch.create_patch_file(rom.copy())
+            with open(patch_file, "wb") as f:
+                f.write(patch)
+            patched = Rom.original.copy()
+            with TimeIt(f"{name} apply_patch_file", logger):
+                N64Patch.apply_patch_file(patched, patch_file)
+            results[name] = header, patched.buffer == rom.buffer
+    crc.n64_crc, N64Patch.zpf_write_block, N64Patch.zpf_read_block = implementations["_speedups"]
+
+    if len(set(results.values())) != 1 or not all(applied for header, applied in results.values()):
+        logger.error(f"Implementations disagree: {results}")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_oot_patch_benchmark()
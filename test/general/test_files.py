@@ -0,0 +1,46 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+import zipfile
+
+from worlds.Files import APDeltaPatch
+
+
+class DeltaPatch(APDeltaPatch):
+    hash = "test"
+    patch_file_ending = ".aptest"
+
+    @classmethod
+    def get_source_data(cls) -> bytes:
+        return random.Random(0).getrandbits(0x10000 * 8).to_bytes(0x10000, "little")
+
+
+class TestDeltaPatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.patched = bytearray(DeltaPatch.get_source_data_with_cache())
+        self.patched[0x100:0x200] = bytes(0x100)
+        self.patched += b"patched"
+
+    def test_patched_data(self) -> None:
+        """Tests that a patch from data in memory matches one from a file and applies to the patched data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patched_path = os.path.join(temp_dir, "patched.sfc")
+            with open(patched_path, "wb") as f:
+                f.write(self.patched)
+            from_path = io.BytesIO()
+            DeltaPatch(player=1, player_name="Tester", patched_path=patched_path).write(from_path)
+        from_data = io.BytesIO()
+        DeltaPatch(player=1, player_name="Tester", patched_data=self.patched).write(from_data)
+        with zipfile.ZipFile(from_path) as path_zip, zipfile.ZipFile(from_data) as data_zip:
+            self.assertEqual(path_zip.read("delta.bsdiff4"), data_zip.read("delta.bsdiff4"))
+            self.assertEqual(path_zip.read("archipelago.json"), data_zip.read("archipelago.json"))
+
+        patch = DeltaPatch()
+        patch.read(from_data)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "result.sfc")
+            patch.patch(target)
+            with open(target, "rb") as f:
+                self.assertEqual(f.read(), self.patched)
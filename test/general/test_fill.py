@@ -1,13 +1,15 @@
 from typing import List, Iterable
 import unittest
+import unittest.mock
 
 import Options
 from Options import Accessibility
 from worlds.AutoWorld import World
-from Fill import FillError, balance_multiworld_progression, fill_restrictive, \
-    distribute_early_items, distribute_items_restrictive
+from Fill import AssumedFillState, FillError, balance_multiworld_progression, fill_restrictive, \
+    distribute_early_items, distribute_items_restrictive, sweep_from_pool
 from BaseClasses import Entrance, LocationProgressType, MultiWorld, Region, Item, Location, \
     ItemClassification, CollectionState
+from Profiling import GenerationProfile
 from worlds.generic.Rules import CollectionRule, add_item_rule, locality_rules, set_rule
 
 
@@ -515,6 +517,90 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertIsNot(loc0.item, player1.prog_items[0], "Filled item was still present in item pool")
 
 
+class TestAssumedFillState(unittest.TestCase):
+    def test_remove_matches_full_sweep(self):
+        """Test that removing items from the assumed state results in the same state as sweeping the remaining pool"""
+        multiworld = generate_multiworld(2)
+        player1 = generate_player_data(multiworld, 1, 3, 3)
+        player2 = generate_player_data(multiworld, 2, 3, 3)
+        set_rule(player1.locations[0], lambda state: state.has(player2.prog_items[0].name, player2.id))
+        item_pool = player1.prog_items + player2.prog_items
+        assumed_state = AssumedFillState(multiworld.state, item_pool)
+
+        removed = [player1.prog_items[1], player2.prog_items[0]]
+        for item in removed:
+            item_pool.remove(item)
+        assumed_state.remove(removed)
+        expected = sweep_from_pool(multiworld.state, item_pool)
+        self.assertEqual(expected.prog_items, assumed_state.sweep().prog_items)
+        self.assertFalse(assumed_state.sweep().can_reach(player1.locations[0]))
+
+        item_pool.append(removed[1])
+        assumed_state.collect(removed[1])
+        self.assertTrue(assumed_state.sweep().can_reach(player1.locations[0]))
+
+    def test_rebuild_without_matching_remove(self):
+        """Test that a world customizing collect without a matching remove gets its pool state rebuilt"""
+        class CollectOnlyWorld(World):
+            # not setting game, so it doesn't get registered as a world type
+            item_name_to_id = {}
+            location_name_to_id = {}
+
+            def collect(self, state: CollectionState, item: Item) -> bool:
+                changed = super().collect(state, item)
+                if changed:
+                    state.prog_items[self.player]["Collected"] += 1
+                return changed
+
+        multiworld = generate_multiworld()
+        multiworld.worlds[1].__class__ = CollectOnlyWorld
+        player1 = generate_player_data(multiworld, 1, 2, 2)
+        item_pool = player1.prog_items[:]
+        assumed_state = AssumedFillState(multiworld.state, item_pool)
+
+        assumed_state.remove([item_pool.pop()])
+        self.assertEqual(1, assumed_state.sweep().prog_items[1]["Collected"])
+
+    def test_rebuild_with_custom_state(self):
+        """Test that a world keeping LogicMixin state without a matching remove gets its pool state rebuilt"""
+        def init_mixin(state: CollectionState, multiworld: MultiWorld) -> None:
+            state.collected = {player: 0 for player in multiworld.get_all_ids()}
+
+        def copy_mixin(state: CollectionState, new_state: CollectionState) -> CollectionState:
+            new_state.collected = state.collected.copy()
+            return new_state
+
+        class CustomStateWorld(World):
+            # not setting game, so it doesn't get registered as a world type
+            item_name_to_id = {}
+            location_name_to_id = {}
+
+            def collect(self, state: CollectionState, item: Item) -> bool:
+                changed = super().collect(state, item)
+                if changed:
+                    state.collected[self.player] += 1
+                return changed
+
+        with unittest.mock.patch.object(CollectionState, "additional_init_functions", [init_mixin]), \
+                unittest.mock.patch.object(CollectionState, "additional_copy_functions", [copy_mixin]):
+            multiworld = generate_multiworld(2)
+            multiworld.worlds[1].__class__ = CustomStateWorld
+            player1 = generate_player_data(multiworld, 1, 2, 2)
+            player2 = generate_player_data(multiworld, 2, 2, 2)
+            item_pool = player1.prog_items + player2.prog_items
+            assumed_state = AssumedFillState(multiworld.state, item_pool)
+            self.assertEqual({2}, assumed_state.removable_players)
+
+            assumed_state.remove([item_pool.pop(0)])
+            self.assertEqual(1, assumed_state.sweep().collected[1])
+
+    def test_state_attributes_declared(self):
+        """Test that CollectionState declares all its own attributes, which are told apart from LogicMixin state"""
+        with unittest.mock.patch.object(CollectionState, "additional_init_functions", []):
+            state = CollectionState(generate_multiworld(2))
+        self.assertLessEqual(set(vars(state)), set(CollectionState.__annotations__))
+
+
 class TestDistributeItemsRestrictive(unittest.TestCase):
     def test_basic_distribute(self):
         """Test that distribute_items_restrictive is deterministic"""
@@ -885,6 +971,29 @@ class TestBalanceMultiworldProgression(unittest.TestCase):
         self.assertRegionContains(
             self.player1.regions[1], self.player2.prog_items[0])
 
+    def test_reports_balancing_counters(self) -> None:
+        """Test that progression balancing reports the items it swapped"""
+        self.multiworld.progression_balancing[self.player1.id].value = 50
+        self.multiworld.progression_balancing[self.player2.id].value = 50
+        self.multiworld.profile = GenerationProfile()
+
+        balance_multiworld_progression(self.multiworld)
+
+        self.assertEqual(self.multiworld.profile.balancing_swaps, 1)
+        self.assertGreater(self.multiworld.profile.balancing_spheres_swept, 0)
+
+    def test_reuses_balancing_spheres(self) -> None:
+        """Test that spheres found while balancing are reused as long as no items were swapped"""
+        self.multiworld.progression_balancing[self.player1.id].value = 50
+        self.multiworld.progression_balancing[self.player2.id].value = 50
+        self.multiworld.profile = GenerationProfile()
+        self.player2.prog_items[0].location.progress_type = LocationProgressType.PRIORITY
+
+        balance_multiworld_progression(self.multiworld)
+
+        self.assertEqual(self.multiworld.profile.balancing_swaps, 0)
+        self.assertGreater(self.multiworld.profile.balancing_spheres_reused, 0)
+
     def test_skips_balancing_progression(self) -> None:
         """Test that progression balancing is skipped when players have it disabled"""
         self.multiworld.progression_balancing[self.player1.id].value = 0
@@ -1,4 +1,6 @@
 import os
+import subprocess
+import sys
 import unittest
 from tempfile import TemporaryFile
 
@@ -30,3 +32,38 @@ class TestIDs(unittest.TestCase):
                 self.assertIn(option_key, utils_options)
                 for sub_option_key in option_set:
                     self.assertIn(sub_option_key, utils_options[option_key])
+
+    def test_dump_unloaded_worlds(self) -> None:
+        """Tests that dumping keeps the read sections of worlds that were not imported, instead of importing them"""
+        code = "import io, sys\n" \
+               "import ModuleUpdate\n" \
+               "ModuleUpdate.update_ran = True  # don't upgrade\n" \
+               "import settings\n" \
+               "settings._update_cache()\n" \
+               "host_settings = settings.Settings(None)\n" \
+               "host_settings.update({key: {} for key in settings._world_settings_name_cache})\n" \
+               "host_settings.update({'factorio_options': {'executable': 'factorio/bin/x64/test'}})\n" \
+               "f = io.StringIO()\n" \
+               "host_settings.dump(f)\n" \
+               "print('worlds.factorio' in sys.modules, 'factorio/bin/x64/test' in f.getvalue())"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                stdin=subprocess.DEVNULL).stdout.split()
+        self.assertEqual(output[-2:], ["False", "True"])
+
+    def test_only_used_world_added(self) -> None:
+        """Tests that looking up the settings of a world only imports that world and adds only its missing section"""
+        code = "import io, sys\n" \
+               "import ModuleUpdate\n" \
+               "ModuleUpdate.update_ran = True  # don't upgrade\n" \
+               "import settings\n" \
+               "host_settings = settings.Settings(None)\n" \
+               "host_settings.factorio_options\n" \
+               "print(host_settings.changed, 'worlds.alttp' in sys.modules)\n" \
+               "f = io.StringIO()\n" \
+               "host_settings.dump(f)\n" \
+               "print('factorio_options:' in f.getvalue(), 'lttp_options:' in f.getvalue())"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                stdin=subprocess.DEVNULL).stdout.split()
+        self.assertEqual(output[-4:], ["True", "False", "True", "False"])
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from Fill import distribute_items_restrictive
+from Profiling import GenerationProfile
+from worlds.AutoWorld import AutoWorldRegister, call_all
+from . import gen_steps, setup_solo_multiworld
+
+
+class TestGenerationProfile(unittest.TestCase):
+    def test_report(self) -> None:
+        """Tests that a profiled generation reports its stages, fill steps and rules"""
+        multiworld = setup_solo_multiworld(AutoWorldRegister.world_types["Clique"], ())
+        multiworld.profile = GenerationProfile()
+        for step in gen_steps:
+            call_all(multiworld, step)
+        multiworld.profile.profile_rules(multiworld)
+        distribute_items_restrictive(multiworld)
+
+        report = multiworld.profile.to_dict(multiworld)
+        self.assertLessEqual(set(gen_steps), set(report["stages"]))
+        self.assertEqual(report["stages"]["create_items"][0]["game"], "Clique")
+        self.assertIn("Progression", report["fill_steps"])
+        self.assertGreater(report["counters"]["sweep_from_pool"], 0)
+        self.assertGreater(report["counters"]["state_copies"], 0)
+        self.assertGreater(report["counters"]["access_rule_evaluations"], 0)
+        self.assertTrue(report["slowest_rules"])
+        for rule in report["slowest_rules"]:
+            self.assertIn(rule["type"], ("Location", "Entrance"))
+        self.assertGreater(report["counters"]["can_reach_evaluations"]["Location"], 0)
+        self.assertGreater(report["counters"]["can_reach_evaluations"]["Region"], 0)
+        self.assertTrue(report["most_checked_spots"])
+
+    def test_report_on_failure(self) -> None:
+        """Tests that the report is written when generation fails"""
+        import Main
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "profile.json")
+            with unittest.mock.patch.object(Main, "_generate", side_effect=Exception("generation failed")):
+                with self.assertRaisesRegex(Exception, "generation failed"):
+                    Main.main(argparse.Namespace(multi=1, profile_report=path))
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("phases", json.load(f))
+
+    def test_phases(self) -> None:
+        """Tests that phase times are summed up per phase and the running phase is ended when writing"""
+        profile = GenerationProfile()
+        profile.start_phase("fill")
+        profile.start_phase("balancing")
+        profile.start_phase("fill")
+        profile.start_phase(None)
+        self.assertEqual(list(profile.phases), ["fill", "balancing"])
+        self.assertIsNone(profile.current_phase)
+        fill_time = profile.phases["fill"]
+        profile.start_phase(None)
+        self.assertEqual(profile.phases["fill"], fill_time)
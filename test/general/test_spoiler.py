@@ -0,0 +1,86 @@
+import unittest
+import unittest.mock
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Region, SphereSweep, Spoiler
+from Options import Accessibility
+from worlds.AutoWorld import World
+
+
+class KeyGateTestBase(unittest.TestCase):
+    """A goal behind two of three keys, with junk progression items around them"""
+    def setUp(self) -> None:
+        self.multiworld = MultiWorld(1)
+        self.multiworld.player_name = {1: "Tester"}
+        self.multiworld.set_seed()
+        self.multiworld.game[1] = "Game"
+        self.multiworld.worlds[1] = World(self.multiworld, 1)
+        self.multiworld.state = CollectionState(self.multiworld)
+        menu = Region("Menu", 1, self.multiworld)
+        gated = Region("Gated", 1, self.multiworld)
+        self.multiworld.regions += [menu, gated]
+        menu.connect(gated, rule=lambda state: state.has("Key", 1, 2))
+        self.multiworld.completion_condition[1] = lambda state: state.has("Victory", 1)
+        self.multiworld.accessibility = {1: Accessibility(Accessibility.option_items)}
+
+        items = ["Key", "Junk", "Key", "Junk", "Junk", "Junk", "Key", "Junk"]
+        for index, name in enumerate(items):
+            self.place(menu, f"Location {index}", name)
+        self.place(gated, "Goal", "Victory")
+
+    def place(self, region: Region, location_name: str, item_name: str) -> None:
+        location = Location(1, location_name, None, region)
+        region.locations.append(location)
+        location.place_locked_item(Item(item_name, ItemClassification.progression, None, 1))
+
+
+class TestPlaythrough(KeyGateTestBase):
+    def test_culled(self) -> None:
+        """Tests that the playthrough only keeps the items needed to beat the game and restores the others"""
+        spoiler = Spoiler(self.multiworld)
+        spoiler.create_playthrough(create_paths=False)
+        spheres = [sphere for name, sphere in spoiler.playthrough.items() if name != "0"]
+        self.assertEqual([len(sphere) for sphere in spheres], [2, 1])
+        self.assertEqual(set(spheres[0].values()), {"Key"})
+        self.assertTrue(all(location.item for location in self.multiworld.get_locations()))
+
+    def test_replayed_spheres(self) -> None:
+        """Tests that the playthrough replays the spheres of the accessibility check, and sweeps once they differ"""
+        spheres = []
+        self.assertTrue(self.multiworld.fulfills_accessibility(CollectionState(self.multiworld), spheres))
+        expected = Spoiler(self.multiworld)
+        expected.create_playthrough(create_paths=False)
+
+        replayed = Spoiler(self.multiworld)
+        with unittest.mock.patch.object(SphereSweep, "step", autospec=True, side_effect=SphereSweep.step) as step:
+            replayed.create_playthrough(create_paths=False, spheres=spheres)
+        self.assertEqual(replayed.playthrough, expected.playthrough)
+        self.assertNotIn("playthrough", [call.args[0].name for call in step.call_args_list])
+
+        mismatched = Spoiler(self.multiworld)
+        mismatched.create_playthrough(create_paths=False, spheres=[spheres[0], set(), spheres[0] | spheres[1]])
+        self.assertEqual(mismatched.playthrough, expected.playthrough)
+        mismatched = Spoiler(self.multiworld)
+        mismatched.create_playthrough(create_paths=False, spheres=list(reversed(spheres)))
+        self.assertEqual(mismatched.playthrough, expected.playthrough)
+
+
+class TestSphereSweep(KeyGateTestBase):
+    def test_spheres(self) -> None:
+        """Tests that the sweep collects one sphere per step and stops once its condition is met"""
+        locations = [location for location in self.multiworld.get_locations()]
+        sweep = SphereSweep(self.multiworld, locations)
+        self.assertTrue(sweep.run(lambda current: current.beaten))
+        self.assertEqual([len(sphere) for sphere in sweep.spheres], [8, 1])
+        self.assertEqual(sweep.spheres, list(self.multiworld.get_spheres()))
+
+    def test_unreachable(self) -> None:
+        """Tests that the sweep stops when nothing more is reachable and that can_beat_game continues from it"""
+        for location in self.multiworld.get_locations():
+            if location.item.name == "Key":
+                location.item = Item("Junk", ItemClassification.progression, None, 1)
+        state = CollectionState(self.multiworld)
+        self.assertFalse(self.multiworld.fulfills_accessibility(state))
+        self.assertEqual(len(state.locations_checked), 8)
+        self.assertFalse(self.multiworld.can_beat_game(state))
+        spheres = list(self.multiworld.get_spheres())
+        self.assertEqual([len(sphere) for sphere in spheres], [8, 0, 1])
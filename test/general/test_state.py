@@ -0,0 +1,202 @@
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Region
+from worlds.AutoWorld import World
+from worlds.generic.Rules import DependencyTrackedRule, track_rule_dependencies, untrack_rule_dependencies
+
+
+class TestCollectionStateCopy(unittest.TestCase):
+    multiworld: MultiWorld
+
+    def setUp(self) -> None:
+        self.multiworld = MultiWorld(2)
+        self.multiworld.player_name = {1: "Tester 1", 2: "Tester 2"}
+        self.multiworld.set_seed()
+        for player in self.multiworld.player_ids:
+            self.multiworld.game[player] = f"Game {player}"
+            self.multiworld.worlds[player] = World(self.multiworld, player)
+            menu = Region("Menu", player, self.multiworld)
+            gated = Region("Gated", player, self.multiworld)
+            self.multiworld.regions += [menu, gated]
+            menu.connect(gated, rule=lambda state, p=player: state.has("Key", p))
+            gated.locations.append(Location(player, "Behind Key", None, gated))
+
+    def create_key(self, player: int) -> Item:
+        return Item("Key", ItemClassification.progression, None, player)
+
+    def test_copy_shares_until_modified(self) -> None:
+        """Tests that a copy shares per-player data with its parent until either of them modifies it"""
+        state = CollectionState(self.multiworld)
+        state.can_reach("Gated", "Region", 1)
+        copied = state.copy()
+        self.assertIs(state.prog_items[1], copied.prog_items[1])
+        self.assertIs(state.reachable_regions[1], copied.reachable_regions[1])
+
+        copied.collect(self.create_key(1), True)
+        self.assertIsNot(state.prog_items[1], copied.prog_items[1])
+        self.assertIs(state.prog_items[2], copied.prog_items[2])
+        self.assertFalse(state.has("Key", 1))
+        self.assertTrue(copied.has("Key", 1))
+
+        self.assertTrue(copied.can_reach("Gated", "Region", 1))
+        self.assertFalse(state.can_reach("Gated", "Region", 1))
+        self.assertIs(state.reachable_regions[2], copied.reachable_regions[2])
+
+    def test_parent_modification(self) -> None:
+        """Tests that modifying the parent after copying doesn't leak into the copy"""
+        state = CollectionState(self.multiworld)
+        copied = state.copy()
+        state.collect(self.create_key(2), True)
+        self.assertTrue(state.can_reach("Gated", "Region", 2))
+        self.assertFalse(copied.has("Key", 2))
+        self.assertFalse(copied.can_reach("Gated", "Region", 2))
+
+        state.remove(self.create_key(2))
+        self.assertFalse(state.has("Key", 2))
+        self.assertFalse(state.can_reach("Gated", "Region", 2))
+
+    def test_world_collect(self) -> None:
+        """Tests that calling World.collect on a copy directly doesn't leak into the parent"""
+        state = CollectionState(self.multiworld)
+        copied = state.copy()
+        self.multiworld.worlds[1].collect(copied, self.create_key(1))
+        self.assertTrue(copied.has("Key", 1))
+        self.assertFalse(state.has("Key", 1))
+
+
+class TestDependencyTrackedRule(unittest.TestCase):
+    multiworld: MultiWorld
+
+    def setUp(self) -> None:
+        self.multiworld = MultiWorld(1)
+        self.multiworld.player_name = {1: "Tester"}
+        self.multiworld.set_seed()
+        self.multiworld.game[1] = "Game"
+        self.multiworld.worlds[1] = World(self.multiworld, 1)
+        menu = Region("Menu", 1, self.multiworld)
+        gated = Region("Gated", 1, self.multiworld)
+        self.multiworld.regions += [menu, gated]
+        menu.connect(gated, rule=lambda state: state.has("Key", 1))
+        self.calls = 0
+
+    def counted(self, rule):
+        def counted_rule(state: CollectionState) -> bool:
+            self.calls += 1
+            return rule(state)
+        return counted_rule
+
+    def test_skips_until_read_item_changes(self) -> None:
+        """Tests that a failed rule is only evaluated again once an item it read was collected"""
+        rule = DependencyTrackedRule(self.counted(lambda state: state.has_all(["A", "B"], 1)))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(rule(state))
+        state.collect(Item("C", ItemClassification.progression, None, 1), True)
+        self.assertFalse(rule(state))
+        self.assertEqual(self.calls, 1)
+
+        state.collect(Item("A", ItemClassification.progression, None, 1), True)
+        self.assertFalse(rule(state))
+        self.assertEqual(self.calls, 2)
+        state.collect(Item("B", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(state))
+        self.assertTrue(rule(state))
+        self.assertEqual(self.calls, 4)
+
+    def test_reachability_is_untraceable(self) -> None:
+        """Tests that rules reading reachability are evaluated every time"""
+        rule = DependencyTrackedRule(self.counted(lambda state: state.can_reach("Gated", "Region", 1)))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(rule(state))
+        self.assertFalse(rule(state))
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(rule.traceable)
+        state.collect(Item("Key", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(state))
+
+    def test_state_data_is_untraceable(self) -> None:
+        """Tests that rules reading other state data than items, like events or mixin data, are evaluated every time"""
+        location = Location(1, "Event", None, self.multiworld.get_region("Menu", 1))
+        for rule_function in (lambda state: location in state.events, lambda state: state.path.get("Gated") is not None,
+                              lambda state: getattr(state, "custom_count", 0) > 0):
+            with self.subTest(rule=rule_function):
+                rule = DependencyTrackedRule(rule_function)
+                state = CollectionState(self.multiworld)
+                state.custom_count = 0
+                self.assertFalse(rule(state))
+                self.assertFalse(rule.traceable)
+                state.events.add(location)
+                state.path["Gated"] = ("Gated", None)
+                state.custom_count = 1
+                self.assertTrue(rule(state))
+
+    def test_nested(self) -> None:
+        """Tests that a traced rule evaluating another traced rule records what both read"""
+        inner = DependencyTrackedRule(lambda state: state.has("A", 1))
+        rule = DependencyTrackedRule(self.counted(lambda state: inner(state) and state.has("B", 1)))
+        state = CollectionState(self.multiworld)
+        state.collect(Item("B", ItemClassification.progression, None, 1), True)
+        self.assertFalse(rule(state))
+        self.assertFalse(rule(state))
+        self.assertEqual(self.calls, 1)
+        state.collect(Item("A", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(state))
+
+    def test_failed_per_state(self) -> None:
+        """Tests that a rule failing in one state is evaluated in other states, and copies keep their own record"""
+        rule = DependencyTrackedRule(self.counted(lambda state: state.has("A", 1)))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(rule(state))
+        other_state = CollectionState(self.multiworld)
+        other_state.collect(Item("A", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(other_state))
+        self.assertEqual(self.calls, 2)
+
+        copied = state.copy()
+        self.assertFalse(rule(copied))
+        self.assertEqual(self.calls, 2)
+        copied.collect(Item("A", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(copied))
+        self.assertFalse(rule(state))
+        self.assertEqual(self.calls, 3)
+
+    def test_remove(self) -> None:
+        """Tests that removing an item a failed rule read evaluates the rule again"""
+        rule = DependencyTrackedRule(self.counted(lambda state: state.count("A", 1) == 1))
+        state = CollectionState(self.multiworld)
+        item = Item("A", ItemClassification.progression, None, 1)
+        state.collect(item, True)
+        state.collect(item, True)
+        self.assertFalse(rule(state))
+        state.remove(item)
+        self.assertTrue(rule(state))
+        self.assertEqual(self.calls, 2)
+
+    def test_custom_collect(self) -> None:
+        """Tests that collecting an item of a world with its own collect forgets all failed rules reading its items"""
+        class TotalWorld(World):
+            # not setting game, so it doesn't get registered as a world type
+            item_name_to_id = {}
+            location_name_to_id = {}
+
+            def collect(self, state: CollectionState, item: Item) -> bool:
+                changed = super().collect(state, item)
+                if changed:
+                    state.prog_items[self.player]["Total"] += 1
+                return changed
+
+        self.multiworld.worlds[1].__class__ = TotalWorld
+        rule = DependencyTrackedRule(lambda state: state.has("Total", 1))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(rule(state))
+        state.collect(Item("A", ItemClassification.progression, None, 1), True)
+        self.assertTrue(rule(state))
+
+    def test_untrack(self) -> None:
+        """Tests that untracking restores the wrapped rules"""
+        entrance = self.multiworld.get_entrance("Menu -> Gated", 1)
+        rule = entrance.access_rule
+        self.multiworld.worlds[1].trace_rule_dependencies = True
+        track_rule_dependencies(self.multiworld)
+        self.assertIsInstance(entrance.access_rule, DependencyTrackedRule)
+        untrack_rule_dependencies(self.multiworld)
+        self.assertIs(entrance.access_rule, rule)
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import WorldIndex
+from worlds import local_folder, network_data_package, user_folder
+from worlds.AutoWorld import AutoWorldRegister
+
+
+class TestWorldIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "world_index.json")
+        self.folders = (user_folder, local_folder)
+        WorldIndex.write_index({"games": WorldIndex.build_index(AutoWorldRegister.world_types,
+                                                                network_data_package["games"]),
+                                "failed_sources": [], "component_sources": []}, self.folders, self.path)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_data_package(self) -> None:
+        """Tests that the index holds the same data package as loading all worlds"""
+        index_data = WorldIndex.load_index(self.folders, self.path)
+        self.assertIsNotNone(index_data)
+        world_index = index_data["games"]
+        for game, entry in world_index.items():
+            with self.subTest(game=game):
+                self.assertEqual(entry["data_package"], network_data_package["games"][game])
+                self.assertEqual(set(entry["hint_blacklist"]), AutoWorldRegister.world_types[game].hint_blacklist)
+        self.assertEqual(set(world_index), set(network_data_package["games"]))
+
+    def test_invalidated(self) -> None:
+        """Tests that the index is not used after a world source changed"""
+        with open(self.path, encoding="utf-8") as f:
+            index = json.load(f)
+        source = next(iter(index["sources"]))
+        index["sources"][source][1] -= 1
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        self.assertIsNone(WorldIndex.load_index(self.folders, self.path))
+
+    def test_missing_folder(self) -> None:
+        """Tests that worlds in a folder that doesn't exist, like in frozen builds, mean there is no index"""
+        missing_folder = os.path.join(self.temp_dir.name, "worlds")
+        self.assertIsNone(WorldIndex.load_index((missing_folder,), self.path))
+        WorldIndex.write_index({"games": {}, "failed_sources": [], "component_sources": []}, (missing_folder,),
+                               self.path)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["world_index.json"])
+
+    def test_lazy(self) -> None:
+        """Tests that with a current index, importing worlds imports only the worlds that are looked up"""
+        if WorldIndex.load_index(self.folders) is None:
+            self.skipTest("the world index could not be written")
+        code = "import sys\n" \
+               "from worlds import network_data_package, AutoWorldRegister\n" \
+               "print('worlds.timespinner' in sys.modules, 'Timespinner' in AutoWorldRegister.world_types)\n" \
+               "print(AutoWorldRegister.world_types['Timespinner'].__module__)\n" \
+               "print('worlds.alttp' in sys.modules, len(AutoWorldRegister.world_types))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(local_folder)).stdout.split()
+        self.assertEqual(output, ["False", "True", "worlds.timespinner", "False",
+                                  str(len(network_data_package["games"]))])
+
+    def test_component_worlds(self) -> None:
+        """Tests that with a current index, the worlds registering launcher components are imported without the rest"""
+        if WorldIndex.load_index(self.folders) is None:
+            self.skipTest("the world index could not be written")
+        code = "import sys\n" \
+               "import ModuleUpdate\n" \
+               "ModuleUpdate.update_ran = True  # don't upgrade\n" \
+               "from worlds import load_all_worlds, load_component_worlds\n" \
+               "from worlds.LauncherComponents import components\n" \
+               "load_component_worlds()\n" \
+               "print('worlds.factorio' in sys.modules, 'worlds.timespinner' in sys.modules)\n" \
+               "component_names = [component.display_name for component in components]\n" \
+               "load_all_worlds()\n" \
+               "print(component_names == [component.display_name for component in components])"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(local_folder), stdin=subprocess.DEVNULL).stdout.split()
+        self.assertEqual(output[-3:], ["True", "False", "True"])
@@ -2,7 +2,7 @@
 import typing
 import unittest
 import warnings
-from NetUtils import LocationStore, _LocationStore
+from NetUtils import LocationStore, _LocationStore, pack_location_table
 
 State = typing.Dict[typing.Tuple[int, int], typing.Set[int]]
 RawLocations = typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]
@@ -196,6 +196,13 @@ class TestPurePythonLocationStoreConstructor(Base.TestLocationStoreConstructor):
         super().setUp()
 
 
+class TestPurePythonLocationStoreFromTable(Base.TestLocationStore):
+    """Run base method tests for pure python implementation loaded from a location table."""
+    def setUp(self) -> None:
+        self.store = _LocationStore.from_table(pack_location_table(sample_data), len(sample_data))
+        super().setUp()
+
+
 @unittest.skipIf(LocationStore is _LocationStore, "_speedups not available")
 class TestSpeedupsLocationStore(Base.TestLocationStore):
     """Run base method tests for cython implementation."""
@@ -236,3 +243,26 @@ class TestSpeedupsLocationStoreConstructor(Base.TestLocationStoreConstructor):
             self.type({
                 1: {1: None},
             })
+
+
+@unittest.skipIf(LocationStore is _LocationStore, "_speedups not available")
+class TestSpeedupsLocationStoreFromTable(Base.TestLocationStore):
+    """Run base method tests for cython implementation loaded from a location table."""
+    def setUp(self) -> None:
+        self.store = LocationStore.from_table(pack_location_table(sample_data), len(sample_data))
+        super().setUp()
+
+    def test_misaligned(self) -> None:
+        table = memoryview(b"\0" + pack_location_table(sample_data))[1:]
+        store = LocationStore.from_table(table, len(sample_data))
+        self.assertEqual(store[1][11], (21, 2, 7))
+        self.assertEqual(store[4][9], (99, 3, 0))
+
+    def test_unsorted(self) -> None:
+        table = pack_location_table({1: {1: (1, 1, 0)}, 2: {1: (1, 1, 0)}})
+        with self.assertRaises(ValueError):
+            LocationStore.from_table(table[len(table) // 2:] + table[:len(table) // 2], 2)
+
+    def test_invalid_sender(self) -> None:
+        with self.assertRaises(ValueError):
+            LocationStore.from_table(pack_location_table({1: {}, 2: {1: (1, 1, 0)}}), 1)
@@ -0,0 +1,84 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+import unittest.mock
+import zlib
+
+from NetUtils import MultidataSections, decode_multidata, encode_multidata, encode_multidata_format
+
+sample_multidata = {
+    "locations": {
+        1: {11: (21, 2, 7), 12: (22, 2, 0)},
+        2: {},
+        3: {9: (99, 1, 0)},
+    },
+    "slot_data": {1: {"option": 1}, 2: {}, 3: {"option": [1, 2]}},
+    "datapackage": {"Game": {"item_name_to_id": {"Item": 1}}},
+    "seed_name": "12345",
+    "precollected_hints": {1: set(), 2: set(), 3: set()},
+}
+
+
+class TestMultidataFormat(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        data = encode_multidata(sample_multidata)
+        self.assertEqual(data[0], 4)
+        multidata = decode_multidata(data)
+        self.assertEqual(multidata["seed_name"], "12345")
+        self.assertEqual(multidata["precollected_hints"], sample_multidata["precollected_hints"])
+        self.assertEqual({player: dict(locations.items()) for player, locations in multidata["locations"].items()},
+                         sample_multidata["locations"])
+        self.assertEqual(dict(multidata["slot_data"]), sample_multidata["slot_data"])
+        self.assertEqual(dict(multidata["datapackage"]), sample_multidata["datapackage"])
+        self.assertEqual(encode_multidata(multidata), data)
+
+    def test_lazy_sections(self) -> None:
+        multidata = decode_multidata(encode_multidata(sample_multidata))
+        slot_data = multidata["slot_data"]
+        self.assertIsInstance(slot_data, MultidataSections)
+        self.assertEqual(list(slot_data), [1, 2, 3])
+        self.assertEqual(len(slot_data.spans), 3)
+        self.assertEqual(slot_data[3], {"option": [1, 2]})
+        self.assertEqual(set(slot_data.spans), {1, 2})
+
+        slot_data[1] = {"option": 2}
+        del slot_data[2]
+        self.assertEqual(decode_multidata(encode_multidata(multidata))["slot_data"][1], {"option": 2})
+        self.assertEqual(pickle.loads(pickle.dumps(slot_data)), {1: {"option": 2}, 3: {"option": [1, 2]}})
+
+    def test_format_3(self) -> None:
+        from MultiServer import Context
+        data = bytes([3]) + zlib.compress(pickle.dumps(sample_multidata), 9)
+        self.assertEqual(Context.decompress(data)["seed_name"], "12345")
+        self.assertEqual(Context.decompress(encode_multidata(sample_multidata))["seed_name"], "12345")
+
+    def test_format_setting(self) -> None:
+        from MultiServer import Context
+        for multidata_format, expected in ((3, 3), (4, 4)):
+            with self.subTest(multidata_format=multidata_format):
+                data = encode_multidata_format(sample_multidata, multidata_format)
+                self.assertEqual(data[0], expected)
+                self.assertEqual(Context.decompress(data)["seed_name"], "12345")
+
+    def test_big_endian(self) -> None:
+        with unittest.mock.patch.object(sys, "byteorder", "big"):
+            multidata = decode_multidata(encode_multidata(sample_multidata))
+        self.assertEqual({player: dict(locations.items()) for player, locations in multidata["locations"].items()},
+                         sample_multidata["locations"])
+
+    def test_truncated(self) -> None:
+        data = encode_multidata(sample_multidata)
+        for length in (0, 3, len(data) - 1):
+            with self.subTest(length=length):
+                with self.assertRaises(ValueError):
+                    decode_multidata(data[:length])
+
+    def test_load_empty_file(self) -> None:
+        from MultiServer import Context
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "empty.archipelago")
+            open(path, "wb").close()
+            with self.assertRaisesRegex(Exception, "empty or truncated"):
+                Context("", 0, "", "", 0, 0, False).load(path)
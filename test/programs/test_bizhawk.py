@@ -0,0 +1,119 @@
+import asyncio
+import base64
+import json
+import struct
+import typing
+import unittest
+
+from worlds import _bizhawk
+
+
+class FakeConnector:
+    """Stands in for BizHawk running connector_bizhawk_generic.lua, with a single memory domain"""
+    server: typing.Optional[asyncio.AbstractServer]
+
+    def __init__(self) -> None:
+        self.memory = bytearray(range(256)) * 16
+        self.watches: typing.Dict[int, typing.Tuple[int, int, typing.Optional[bytes]]] = {}
+        self.requests: typing.List[typing.Dict[str, typing.Any]] = []
+        self.server = None
+
+    async def start(self) -> None:
+        for port in range(_bizhawk.BIZHAWK_SOCKET_PORT_RANGE_START,
+                          _bizhawk.BIZHAWK_SOCKET_PORT_RANGE_START + _bizhawk.BIZHAWK_SOCKET_PORT_RANGE_SIZE):
+            try:
+                self.server = await asyncio.start_server(self.handle_client, "127.0.0.1", port)
+                return
+            except OSError:
+                continue
+        raise unittest.SkipTest("No free BizHawk connector port")
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.watches.clear()
+        while line := await reader.readline():
+            responses = [self.handle_request(request) for request in json.loads(line)]
+            writer.write(json.dumps(responses).encode("utf-8") + b"\n")
+            await writer.drain()
+        writer.close()
+
+    def handle_request(self, request: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        self.requests.append(request)
+        if request["type"] == "READ":
+            data = self.memory[request["address"]:request["address"] + request["size"]]
+            return {"type": "READ_RESPONSE", "value": base64.b64encode(data).decode("ascii")}
+        if request["type"] == "WATCH":
+            self.watches[request["id"]] = request["address"], request["size"], None
+            return {"type": "WATCH_RESPONSE"}
+        if request["type"] == "UNWATCH":
+            del self.watches[request["id"]]
+            return {"type": "UNWATCH_RESPONSE"}
+        if request["type"] == "WATCH_POLL":
+            changes = bytearray()
+            for watch_id, (address, size, previous) in self.watches.items():
+                data = bytes(self.memory[address:address + size])
+                index = 0
+                while index < size:
+                    if previous is None or data[index] != previous[index]:
+                        start = index
+                        while index < size and index - start < 0xFFFF and \
+                                (previous is None or data[index] != previous[index]):
+                            index += 1
+                        changes += struct.pack(">HIH", watch_id, start, index - start) + data[start:index]
+                    else:
+                        index += 1
+                self.watches[watch_id] = address, size, data
+            return {"type": "WATCH_POLL_RESPONSE", "value": base64.b64encode(changes).decode("ascii")}
+        return {"type": "ERROR", "err": f"Unknown command: {request['type']}"}
+
+
+class TestWatches(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.connector = FakeConnector()
+        await self.connector.start()
+        self.ctx = _bizhawk.BizHawkContext()
+        self.assertTrue(await _bizhawk.connect(self.ctx))
+
+    async def asyncTearDown(self) -> None:
+        _bizhawk.disconnect(self.ctx)
+        await self.connector.stop()
+
+    async def test_poll(self) -> None:
+        """Tests that polling returns watches only when their memory changed"""
+        first = _bizhawk.watch(self.ctx, 0x10, 8, "RAM")
+        second = _bizhawk.watch(self.ctx, 0x100, 4, "RAM")
+        self.assertEqual(await _bizhawk.poll_watches(self.ctx), {first: bytes(self.connector.memory[0x10:0x18]),
+                                                                 second: bytes(self.connector.memory[0x100:0x104])})
+        self.assertEqual(await _bizhawk.poll_watches(self.ctx), {})
+
+        self.connector.memory[0x12] = 0xFF
+        self.connector.memory[0x15:0x17] = b"\xAA\xBB"
+        self.assertEqual(await _bizhawk.poll_watches(self.ctx), {first: bytes(self.connector.memory[0x10:0x18])})
+        self.assertEqual(self.ctx.watch_data[second], self.connector.memory[0x100:0x104])
+        self.assertEqual(await _bizhawk.read(self.ctx, [(0x10, 8, "RAM")]), [self.ctx.watch_data[first]])
+        self.assertEqual(len([request for request in self.connector.requests if request["type"] == "WATCH"]), 2)
+        self.assertEqual(self.ctx.message_count, 4)
+        self.assertGreater(self.ctx.average_latency, 0)
+        self.assertGreater(self.ctx.throughput, 0)
+
+    async def test_unwatch(self) -> None:
+        """Tests that removed watches are not returned and their ids are reused"""
+        first = _bizhawk.watch(self.ctx, 0x10, 8, "RAM")
+        await _bizhawk.poll_watches(self.ctx)
+        _bizhawk.unwatch(self.ctx, first)
+        await _bizhawk.poll_watches(self.ctx)
+        self.assertNotIn(first, self.connector.watches)
+        second = _bizhawk.watch(self.ctx, 0x20, 2, "RAM")
+        self.assertEqual(first, second)
+        self.assertEqual(await _bizhawk.poll_watches(self.ctx), {second: bytes(self.connector.memory[0x20:0x22])})
+
+    async def test_reconnect(self) -> None:
+        """Tests that watches are registered again after reconnecting"""
+        watch_id = _bizhawk.watch(self.ctx, 0x10, 8, "RAM")
+        await _bizhawk.poll_watches(self.ctx)
+        _bizhawk.disconnect(self.ctx)
+        self.assertTrue(await _bizhawk.connect(self.ctx))
+        self.assertEqual(await _bizhawk.poll_watches(self.ctx), {watch_id: bytes(self.connector.memory[0x10:0x18])})
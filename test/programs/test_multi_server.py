@@ -1,5 +1,13 @@
+import asyncio
+import pickle
+import threading
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+import zlib
+
+from MultiServer import Client, Context, ServerCommandProcessor, apply_save_journal, read_save_journal, \
+    register_location_checks
+from NetUtils import Hint, LocationStore, NetworkItem, decode
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +46,186 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class FakeSocket:
+    open = True
+
+    def __init__(self) -> None:
+        self.sent: typing.List[str] = []
+        self.writable = asyncio.Event()
+        self.writable.set()
+
+    async def send(self, msg: str) -> None:
+        await self.writable.wait()
+        self.sent.append(msg)
+
+
+class TestSendNewItems(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({1: {1: (10, 2, 0), 2: (11, 2, 0), 3: (12, 2, 0)}, 2: {}})
+        self.ctx.player_names = {(0, 1): "Sender", (0, 2): "Receiver"}
+        self.ctx.clients = {0: {1: [], 2: []}}
+        self.client = Client(FakeSocket(), self.ctx)
+        self.client.auth = True
+        self.client.team = 0
+        self.client.slot = 2
+        self.client.items_handling = 0b111
+        self.ctx.clients[0][2].append(self.client)
+        self.team_broadcasts: typing.List[typing.List[dict]] = []
+        self.ctx.broadcast_team = lambda team, msgs: self.team_broadcasts.append(msgs)
+
+    def received_items(self) -> typing.List[dict]:
+        return [msg for sent in self.client.socket.sent for msg in decode(sent) if msg["cmd"] == "ReceivedItems"]
+
+    async def test_coalesced(self) -> None:
+        """Tests that checks within one event loop iteration send one ReceivedItems and one PrintJSON batch"""
+        register_location_checks(self.ctx, 0, 1, [1])
+        register_location_checks(self.ctx, 0, 1, [2])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(len(self.team_broadcasts), 1)
+        self.assertEqual([msg["cmd"] for msg in self.team_broadcasts[0]], ["PrintJSON", "PrintJSON"])
+        received_items = self.received_items()
+        self.assertEqual(len(received_items), 1)
+        self.assertEqual(received_items[0]["index"], 0)
+        self.assertEqual(sorted(item.item for item in received_items[0]["items"]), [10, 11])
+
+    async def test_order(self) -> None:
+        """Tests that a check sends its PrintJSON, ReceivedItems and RoomUpdate in that order"""
+        async def broadcast_send_encoded_msgs(endpoints: typing.Iterable[Client], msg: str) -> bool:
+            for endpoint in endpoints:
+                await endpoint.socket.send(msg)
+            return True
+
+        self.ctx.locations = LocationStore({1: {}, 2: {1: (10, 2, 0)}})
+        self.ctx.broadcast_send_encoded_msgs = broadcast_send_encoded_msgs
+        del self.ctx.broadcast_team
+        register_location_checks(self.ctx, 0, 2, [1])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual([msg["cmd"] for sent in self.client.socket.sent for msg in decode(sent)],
+                         ["PrintJSON", "ReceivedItems", "RoomUpdate"])
+
+    async def test_in_flight(self) -> None:
+        """Tests that items arriving while a send is in flight are merged into the next message"""
+        self.client.socket.writable.clear()
+        register_location_checks(self.ctx, 0, 1, [1])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertTrue(self.client.sending_items)
+        register_location_checks(self.ctx, 0, 1, [2])
+        await asyncio.sleep(0)
+        register_location_checks(self.ctx, 0, 1, [3])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.client.socket.writable.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        received_items = self.received_items()
+        self.assertEqual([msg["index"] for msg in received_items], [0, 1])
+        self.assertEqual([len(msg["items"]) for msg in received_items], [1, 2])
+        self.assertFalse(self.client.sending_items)
+
+
+class TestSaveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({1: {1: (10, 2, 0), 2: (11, 2, 0), 3: (12, 2, 0)}, 2: {}})
+        self.ctx.player_names = {(0, 1): "Sender", (0, 2): "Receiver"}
+        self.ctx.clients = {0: {1: [], 2: []}}
+        self.ctx.broadcast = lambda clients, msgs: None
+        self.ctx.broadcast_team = lambda team, msgs: None
+
+    def snapshot(self) -> dict:
+        self.ctx.reset_save_journal()
+        return pickle.loads(pickle.dumps(self.ctx.get_save()))
+
+    def test_journal_replay(self) -> None:
+        """Tests that a snapshot with the journal entries applied equals a full save"""
+        savedata = self.snapshot()
+        journal = []
+        register_location_checks(self.ctx, 0, 1, [1])
+        journal.append(self.ctx.get_save_journal_entry())
+        register_location_checks(self.ctx, 0, 1, [2, 3])
+        self.ctx.stored_data["key"] = 1
+        self.ctx.journal_stored_data_keys.add("key")
+        self.ctx.hints_used[0, 2] += 1
+        journal.append(self.ctx.get_save_journal_entry())
+
+        self.assertEqual(journal[0]["received_items"][0, 2, True], [NetworkItem(10, 1, 1, 0)])
+        self.assertEqual(journal[1]["location_checks"], {(0, 1): {2, 3}})
+        savedata = apply_save_journal(savedata, pickle.loads(pickle.dumps(journal)))
+        full_save = self.ctx.get_save()
+        for key in ("received_items", "location_checks", "stored_data", "hints_used"):
+            self.assertEqual(savedata[key], full_save[key], key)
+
+    def test_entry_on_loop(self) -> None:
+        """Tests that saving from another thread takes the journal entry on the event loop"""
+        async def main() -> None:
+            ctx = Context("", 0, "", "", 0, 0, False)
+            loop_thread = threading.get_ident()
+            entry_threads: typing.List[int] = []
+
+            def get_save_journal_entry() -> dict:
+                entry_threads.append(threading.get_ident())
+                return {}
+
+            ctx.get_save_journal_entry = get_save_journal_entry
+            await asyncio.get_running_loop().run_in_executor(None, ctx.call_on_loop, ctx.get_save_journal_entry)
+            self.assertEqual(entry_threads, [loop_thread])
+
+        asyncio.run(main())
+
+    def test_incomplete_entry(self) -> None:
+        """Tests that an entry cut off while writing is ignored"""
+        entries = [zlib.compress(pickle.dumps({"index": index})) for index in range(2)]
+        data = b"".join(len(entry).to_bytes(4, "little") + entry for entry in entries)
+        self.assertEqual(read_save_journal(data), [{"index": 0}, {"index": 1}])
+        self.assertEqual(read_save_journal(data[:-1]), [{"index": 0}])
+
+
+class TestHintStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({1: {1: (10, 2, 0), 2: (11, 2, 0), 3: (12, 1, 0), 4: (13, 2, 0)}, 2: {}})
+        self.ctx.player_names = {(0, 1): "Sender", (0, 2): "Receiver"}
+        self.ctx.clients = {0: {1: [], 2: []}}
+        self.broadcasts: typing.List[typing.List[dict]] = []
+        self.ctx.broadcast = lambda clients, msgs: self.broadcasts.append(msgs)
+        self.ctx.broadcast_team = lambda team, msgs: None
+        self.hints = [Hint(2, 1, 1, 10, False), Hint(2, 1, 2, 11, False), Hint(1, 1, 3, 12, False)]
+        self.ctx.notify_hints(0, self.hints)
+
+    def test_found(self) -> None:
+        """Tests that checking a location marks its hints found for every slot holding them, and only them"""
+        client = Client(FakeSocket(), self.ctx)
+        self.ctx.stored_data_notification_clients["_read_hints_0_2"].add(client)
+        self.broadcasts.clear()
+        register_location_checks(self.ctx, 0, 1, [1, 3])
+        found_hint = self.hints[0]._replace(found=True)
+        self.assertEqual(self.ctx.hints[0, 1], {found_hint, self.hints[1], self.hints[2]._replace(found=True)})
+        self.assertEqual(self.ctx.hints[0, 2], {found_hint, self.hints[1]})
+        hint_replies = [msg for msgs in self.broadcasts for msg in msgs if msg["cmd"] == "SetReply"]
+        self.assertEqual(hint_replies, [{"cmd": "SetReply", "key": "_read_hints_0_2",
+                                         "value": {found_hint, self.hints[1]}}])
+        # loading re-checks to the same hints
+        hints = {key: set(value) for key, value in self.ctx.hints.items()}
+        self.ctx.recheck_hints()
+        self.assertEqual(self.ctx.hints, hints)
+        self.assertEqual(self.ctx.unfound_hints, {(0, 1, 2): {(1, self.hints[1]), (2, self.hints[1])}})
+
+    def test_journal_replay(self) -> None:
+        """Tests that hints found after being journaled replay as found only"""
+        self.ctx.reset_save_journal()
+        savedata = pickle.loads(pickle.dumps(self.ctx.get_save()))
+        journal = []
+        self.ctx.notify_hints(0, [Hint(2, 1, 4, 13, False)])
+        journal.append(self.ctx.get_save_journal_entry())
+        register_location_checks(self.ctx, 0, 1, [1, 4])
+        journal.append(self.ctx.get_save_journal_entry())
+
+        self.assertEqual(journal[1]["hints"][0, 2], {Hint(2, 1, 1, 10, True), Hint(2, 1, 4, 13, True)})
+        savedata = apply_save_journal(savedata, pickle.loads(pickle.dumps(journal)))
+        self.assertEqual(savedata["hints"], self.ctx.get_save()["hints"])
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import typing
+import unittest
+from types import SimpleNamespace
+
+from SNIClient import SNESState, merge_snes_ranges, snes_read, snes_read_many
+
+
+class FakeSNISocket:
+    """Answers GetAddress requests from memory, splitting replies like SNI may do"""
+    open = True
+    closed = False
+
+    def __init__(self, ctx: SimpleNamespace, memory: bytes) -> None:
+        self.ctx = ctx
+        self.memory = memory
+        self.requests: typing.List[typing.List[str]] = []
+
+    async def send(self, message: str) -> None:
+        request = json.loads(message)
+        assert request["Opcode"] == "GetAddress"
+        operands = request["Operands"]
+        self.requests.append(operands)
+        reply = b"".join(self.memory[int(address, 16):int(address, 16) + int(size, 16)]
+                         for address, size in zip(operands[::2], operands[1::2]))
+        for start in range(0, len(reply), 7):
+            self.ctx.snes_recv_queue.put_nowait(reply[start:start + 7])
+
+
+class TestSNIRead(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.memory = bytes(range(256)) * 4
+        self.ctx = SimpleNamespace(snes_state=SNESState.SNES_ATTACHED, snes_request_lock=asyncio.Lock(),
+                                   snes_recv_queue=asyncio.Queue())
+        self.ctx.snes_socket = FakeSNISocket(self.ctx, self.memory)
+
+    def test_merge(self) -> None:
+        """Tests that adjacent and overlapping ranges are merged"""
+        self.assertEqual(merge_snes_ranges([(10, 2), (0, 4), (4, 2), (11, 5), (12, 1), (20, 1)]),
+                         [(0, 6), (10, 6), (20, 1)])
+
+    async def test_read_many(self) -> None:
+        """Tests that ranges are read with one request per batch and split back in the requested order"""
+        reads = [(0x300, 3), (0x10, 4), (0x12, 1), (0x14, 2)] + [(address, 1) for address in range(0x100, 0x200, 8)]
+        data = await snes_read_many(self.ctx, reads)
+        self.assertEqual(data, [self.memory[address:address + size] for address, size in reads])
+        self.assertEqual(len(self.ctx.snes_socket.requests), 5)
+        self.assertEqual(self.ctx.snes_socket.requests[0][:2], ["10", "6"])
+        self.assertEqual(await snes_read(self.ctx, 0x20, 3), self.memory[0x20:0x23])
+        self.assertTrue(self.ctx.snes_recv_queue.empty())
+
+    async def test_detached(self) -> None:
+        """Tests that nothing is read without an attached SNES"""
+        self.ctx.snes_state = SNESState.SNES_CONNECTED
+        self.assertIsNone(await snes_read_many(self.ctx, [(0, 1)]))
+        self.assertFalse(self.ctx.snes_socket.requests)
@@ -0,0 +1,75 @@
+# Tests for FuzzyIndex in Utils.py
+
+import random
+import unittest
+
+import jellyfish
+
+from Utils import FuzzyIndex, get_fuzzy_results
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.random = random.Random(0)
+        parts = ["Progressive", "Sword", "Bow", "Key", "Small Key", "Boss", "Hookshot", "(E1M1)", "-", "Chest", "Tower",
+                 "of", "the", "Heart", "Piece", "Container", "Ganon's", "Ąrena", "İnn", "1", "2", "AP-1-01"]
+        self.words = sorted({" ".join(self.random.choices(parts, k=self.random.randrange(1, 6))) for _ in range(400)})
+        self.index = FuzzyIndex(self.words)
+
+    def query(self) -> str:
+        word = list(self.random.choice(self.words))
+        for _ in range(self.random.randrange(4)):
+            position = self.random.randrange(len(word))
+            operation = self.random.randrange(4)
+            if operation == 0 and len(word) > 1:
+                del word[position]
+            elif operation == 1:
+                word.insert(position, self.random.choice("aeks -"))
+            elif operation == 2:
+                word[position] = word[position].swapcase()
+            elif position + 1 < len(word):
+                word[position], word[position + 1] = word[position + 1], word[position]
+        if self.random.random() < 0.2:
+            word = word[:self.random.randrange(1, len(word) + 1)]
+        return "".join(word)
+
+    def test_same_results(self) -> None:
+        """Tests that the index finds the same words, in the same order, with the same scores as a full search"""
+        for _ in range(100):
+            query = self.query()
+            for limit in (1, 2, 5):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(get_fuzzy_results(query, self.index, limit),
+                                     get_fuzzy_results(query, self.words, limit))
+
+    def test_ties(self) -> None:
+        """Tests that equally close words are returned in the order of the word list"""
+        words = [f"AP-{number:03}" for number in range(500, 0, -1)]
+        index = FuzzyIndex(words)
+        for query in ("AP", "AP-", "ap-00", "AP-99", "XX-123"):
+            with self.subTest(query=query):
+                self.assertEqual(index.get_results(query, 2), get_fuzzy_results(query, words, 2))
+
+    def test_exact_match(self) -> None:
+        """Tests that an exact match is the word a full search ranks first at 100%"""
+        words = self.words + [word.upper() for word in self.words[::7]]
+        index = FuzzyIndex(words)
+        for _ in range(100):
+            query = self.query()
+            with self.subTest(query=query):
+                best_word, score = get_fuzzy_results(query, words, 1)[0]
+                self.assertEqual(index.get_exact_match(query), best_word if score == 100 else None)
+
+    def test_distance(self) -> None:
+        """Tests that the compiled distance matches jellyfish where grapheme clusters are single characters"""
+        import NetUtils  # sets up pyximport for _speedups
+        try:
+            from _speedups import damerau_levenshtein_distance
+        except ImportError:
+            self.skipTest("_speedups is not available")
+        alphabet = "abcd AB€ąİ😀"
+        for _ in range(10000):
+            word1 = "".join(self.random.choices(alphabet, k=self.random.randrange(12)))
+            word2 = "".join(self.random.choices(alphabet, k=self.random.randrange(12)))
+            self.assertEqual(damerau_levenshtein_distance(word1, word2),
+                             jellyfish.damerau_levenshtein_distance(word1, word2), (word1, word2))
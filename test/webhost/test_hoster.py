@@ -0,0 +1,128 @@
+import asyncio
+import pickle
+import queue
+import threading
+import unittest
+import unittest.mock
+import zlib
+from uuid import uuid4
+
+import websockets
+
+from NetUtils import NetworkSlot, SlotType
+
+
+class TestHostedRooms(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room, Seed, db
+
+        if db.provider is None:
+            db.bind(provider="sqlite", filename=":memory:", create_db=True)
+            db.generate_mapping(create_tables=True)
+
+        cls.static_package = {"item_name_to_id": {"Item": 1}, "location_name_to_id": {"Location": 1},
+                              "checksum": "hoster-static"}
+        game_package = {"item_name_to_id": {"Custom Item": 2}, "location_name_to_id": {"Custom Location": 2},
+                        "item_name_groups": {}, "checksum": "hoster-custom"}
+
+        def make_multidata(package: dict) -> bytes:
+            multidata = {
+                "version": (0, 4, 4),
+                "minimum_versions": {"server": (0, 0, 0), "clients": {}},
+                "seed_name": "HostedRooms",
+                "slot_info": {1: NetworkSlot("Tester", "Hoster Test Game", SlotType.player)},
+                "connect_names": {"Tester": (0, 1)},
+                "locations": {1: {1: (1, 1, 0)}},
+                "slot_data": {1: {}},
+                "er_hint_data": {},
+                "precollected_items": {1: []},
+                "precollected_hints": {1: set()},
+                "server_options": {},
+                "datapackage": {"Hoster Test Game": package},
+            }
+            return bytes([3]) + zlib.compress(pickle.dumps(multidata))
+
+        with db_session:
+            cls.room_ids = [Room(seed=Seed(multidata=make_multidata(package), owner=uuid4()), owner=uuid4(),
+                                 timeout=0).id
+                            for package in ({"checksum": "hoster-static"}, {"checksum": "hoster-static"}, game_package)]
+            broken_seed = Seed(multidata=bytes([3]) + b"not multidata", owner=uuid4())
+            cls.broken_room_id = Room(seed=broken_seed, owner=uuid4(), timeout=0).id
+
+    def get_static_server_data(self) -> dict:
+        return {"non_hintable_names": {}, "gamespackage": {"Hoster Test Game": self.static_package},
+                "item_name_groups": {"Hoster Test Game": {}}, "location_name_groups": {}}
+
+    async def test_shared_data(self) -> None:
+        """Tests that rooms share the data of static games, without embedded data packages replacing it"""
+        from WebHostLib.customserver import WebHostContext
+
+        static_server_data = self.get_static_server_data()
+        contexts = []
+        for room_id in self.room_ids:
+            ctx = WebHostContext(static_server_data)
+            ctx.load(room_id)
+            contexts.append(ctx)
+        self.assertIs(static_server_data["gamespackage"]["Hoster Test Game"], self.static_package)
+        self.assertIs(contexts[0].item_name_indexes["Hoster Test Game"],
+                      contexts[1].item_name_indexes["Hoster Test Game"])
+        self.assertIsNot(contexts[0].item_name_indexes["Hoster Test Game"],
+                         contexts[2].item_name_indexes["Hoster Test Game"])
+        self.assertEqual(list(contexts[2].item_name_indexes["Hoster Test Game"]), ["Custom Item"])
+
+    async def test_failure(self) -> None:
+        """Tests that a room failing to load is marked as errored, without raising into the hoster"""
+        from pony.orm import db_session
+        from WebHostLib.customserver import host_hosted_room
+        from WebHostLib.models import Room
+
+        await host_hosted_room(self.broken_room_id, self.get_static_server_data(), None, None, "localhost")
+        with db_session:
+            self.assertEqual(Room.get(id=self.broken_room_id).last_port, -1)
+
+    async def test_isolation(self) -> None:
+        """Tests that rooms sharing a loop host and shut down independently of each other's failures"""
+        from pony.orm import db_session
+        from WebHostLib.customserver import host_hosted_room
+        from WebHostLib.models import Room
+
+        if int(websockets.__version__.split(".")[0]) >= 14:
+            self.skipTest("room servers use the legacy server of websockets < 14")
+        static_server_data = self.get_static_server_data()
+        await asyncio.wait_for(asyncio.gather(
+            *(host_hosted_room(room_id, static_server_data, None, None, "localhost") for room_id in self.room_ids),
+            host_hosted_room(self.broken_room_id, static_server_data, None, None, "localhost")), 30)
+
+        with db_session:
+            for room_id in self.room_ids:
+                room = Room.get(id=room_id)
+                self.assertGreater(room.last_port, 0)
+                self.assertTrue(room.multisave)  # saved on shutdown
+            self.assertEqual(Room.get(id=self.broken_room_id).last_port, -1)
+
+
+class TestHoster(unittest.TestCase):
+    def test_rooms_done(self) -> None:
+        """Tests that rooms are removed from their hoster once they stopped, so new rooms go to the least busy one"""
+        from WebHostLib import autolauncher
+
+        busy, idle = autolauncher.MultiworldHoster.__new__(autolauncher.MultiworldHoster), \
+            autolauncher.MultiworldHoster.__new__(autolauncher.MultiworldHoster)
+        for hoster in (busy, idle):
+            hoster.room_queue, hoster.done_queue = queue.Queue(), queue.Queue()
+            hoster.rooms = set()
+            hoster.lock = threading.Lock()
+            hoster.process = unittest.mock.Mock(is_alive=lambda: True)
+        for room_id in range(3):
+            busy.add_room(room_id)
+        idle.add_room(3)
+        idle.add_room(4)
+        with unittest.mock.patch.object(autolauncher, "hosters", [busy, idle]):
+            self.assertIs(autolauncher.get_hoster({"HOSTERS": 2}), idle)
+            self.assertFalse(busy.room_done(0))
+            busy.done_queue.put(0)
+            busy.done_queue.put(1)
+            self.assertTrue(busy.room_done(0))
+            self.assertIs(autolauncher.get_hoster({"HOSTERS": 2}), busy)
@@ -0,0 +1,30 @@
+import queue
+import unittest
+
+from WebHostLib.notifier import NotificationListener, get_listener, send_notification
+
+
+class TestNotifier(unittest.TestCase):
+    def test_delivery(self) -> None:
+        """Tests that notifications reach the handlers of their kind, skipping malformed ones"""
+        listener = NotificationListener(0)
+        received: queue.Queue = queue.Queue()
+        listener.subscribe("room", lambda key: received.put(("room", key)))
+        listener.subscribe("generation", lambda key: received.put(("generation", key)))
+        listener.subscribe("generation", lambda key: 1 / 0)  # failing handlers don't stop the listener
+        listener.start()
+
+        listener.socket.sendto(b"malformed", ("127.0.0.1", listener.port))
+        send_notification(listener.port, "commands", "no handler")
+        send_notification(listener.port, "generation")
+        send_notification(listener.port, "room", "0f8b:id")
+        self.assertEqual(received.get(timeout=5), ("generation", ""))
+        self.assertEqual(received.get(timeout=5), ("room", "0f8b:id"))
+        self.assertTrue(received.empty())
+
+    def test_disabled(self) -> None:
+        """Tests that notifications are opt-in, and no listener is started without a port"""
+        from WebHostLib import app
+        self.assertIsNone(app.config["NOTIFY_PORT"])
+        self.assertIsNone(get_listener(None))
+        self.assertIsNone(get_listener(0))
@@ -0,0 +1,118 @@
+import pickle
+import unittest
+import unittest.mock
+import zlib
+from uuid import uuid4
+
+from NetUtils import NetworkItem, NetworkSlot, SlotType
+
+
+class TestTrackerSnapshot(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import GameDataPackage, Room, Seed, db
+
+        if db.provider is None:
+            db.bind(provider="sqlite", filename=":memory:", create_db=True)
+            db.generate_mapping(create_tables=True)
+
+        game_package = {"item_name_to_id": {"Item": 1}, "location_name_to_id": {"Location 1": 1, "Location 2": 2},
+                        "item_name_groups": {}, "checksum": "tracker-test"}
+        multidata = {
+            "version": (0, 4, 4),
+            "minimum_versions": {"server": (0, 0, 0), "clients": {}},
+            "seed_name": "TrackerSnapshot",
+            "slot_info": {1: NetworkSlot("Tester", "Tracker Test Game", SlotType.player)},
+            "connect_names": {"Tester": (0, 1)},
+            "locations": {1: {1: (1, 1, 0), 2: (1, 1, 0)}},
+            "slot_data": {1: {}},
+            "er_hint_data": {},
+            "precollected_items": {1: [1]},
+            "precollected_hints": {1: set()},
+            "server_options": {},
+            "datapackage": {"Tracker Test Game": game_package},
+        }
+        with db_session:
+            GameDataPackage(checksum=game_package["checksum"], data=pickle.dumps(game_package))
+            seed = Seed(multidata=bytes([3]) + zlib.compress(pickle.dumps(multidata)), owner=uuid4())
+            cls.room_id = Room(seed=seed, owner=uuid4(), tracker=uuid4()).id
+            cls.journal_room_id = Room(seed=seed, owner=uuid4(), tracker=uuid4()).id
+
+    @staticmethod
+    def make_context():
+        from WebHostLib.customserver import WebHostContext
+
+        return WebHostContext({"non_hintable_names": {}, "gamespackage": {}, "item_name_groups": {},
+                               "location_name_groups": {}})
+
+    async def test_snapshot(self) -> None:
+        """Tests that trackers rendered from the room server's snapshot match ones rendered from multidata"""
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+
+        ctx = self.make_context()
+        ctx.load(self.room_id)
+        ctx.location_checks[0, 1].add(1)
+        ctx.received_items[0, 1, True] = [NetworkItem(1, 1, 1, 0)]
+        with db_session:
+            ctx._save()
+
+        with db_session:
+            room = Room.get(id=self.room_id)
+            snapshot_data = TrackerData(room)
+            room.tracker_snapshot.delete()
+            multidata_data = TrackerData(room)
+            for method in ("get_room_locations", "get_room_locations_complete", "get_team_locations_total_count",
+                           "get_room_games", "get_room_long_player_names", "get_all_players"):
+                self.assertEqual({key: list(value) if isinstance(value, tuple) else value
+                                  for key, value in getattr(snapshot_data, method)().items()},
+                                 {key: list(value) if isinstance(value, dict) else value
+                                  for key, value in getattr(multidata_data, method)().items()}, method)
+            self.assertEqual(snapshot_data.get_player_received_items(0, 1), [NetworkItem(1, 1, 1, 0)])
+            self.assertEqual(snapshot_data.get_player_missing_locations(0, 1), {2})
+            self.assertEqual(snapshot_data.get_player_starting_inventory(0, 1), [1])
+            self.assertEqual(snapshot_data.location_id_to_name["Tracker Test Game"][2], "Location 2")
+            self.assertNotIn("_multidata", snapshot_data.__dict__)
+
+    async def test_journal(self) -> None:
+        """Tests that autosaves after the first only add journal entries, which the room server and trackers apply"""
+        from pony.orm import db_session
+        from Utils import restricted_loads
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+
+        ctx = self.make_context()
+        ctx.load(self.journal_room_id)
+        ctx.location_checks[0, 1].add(1)
+        with db_session:
+            ctx._save()
+        ctx.location_checks[0, 1].add(2)
+        ctx.journal_location_checks[0, 1].add(2)
+        ctx.received_items[0, 1, True] = [NetworkItem(1, 1, 1, 0)]
+        with db_session:
+            ctx._save()
+
+        with db_session:
+            room = Room.get(id=self.journal_room_id)
+            self.assertEqual(len(room.save_journal), 1)
+            self.assertEqual(restricted_loads(room.multisave)["location_checks"], {(0, 1): {1}})
+            tracker_data = TrackerData(room)
+            self.assertEqual(tracker_data.get_player_received_items(0, 1), [NetworkItem(1, 1, 1, 0)])
+            self.assertEqual(tracker_data.get_player_missing_locations(0, 1), set())
+
+        restarted_ctx = self.make_context()
+        restarted_ctx.load(self.journal_room_id)
+        with unittest.mock.patch.object(restarted_ctx, "_start_async_saving"), db_session:
+            restarted_ctx.exit_event.set()  # stops listening to commands
+            restarted_ctx.init_save()
+        self.assertEqual(restarted_ctx.location_checks[0, 1], {1, 2})
+        self.assertEqual(restarted_ctx.received_items[0, 1, True], [NetworkItem(1, 1, 1, 0)])
+
+        with db_session:
+            ctx._save(True)
+        with db_session:
+            room = Room.get(id=self.journal_room_id)
+            self.assertFalse(room.save_journal)
+            self.assertEqual(restricted_loads(room.multisave)["location_checks"], {(0, 1): {1, 2}})
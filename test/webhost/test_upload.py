@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+import zipfile
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+
+class TestOutputUpload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from WebHostLib.models import db
+
+        if db.provider is None:
+            db.bind(provider="sqlite", filename=":memory:", create_db=True)
+            db.generate_mapping(create_tables=True)
+
+    def get_generation_args(self, output_path: str):
+        import Generate
+
+        player_files_path = os.path.join(os.path.dirname(__file__), "..", "programs", "data", "one_player")
+        argv = sys.argv
+        sys.argv = [argv[0], "--seed", "0", "--player_files_path", player_files_path, "--outputpath", output_path,
+                    "--spoiler", "2"]
+        try:
+            return Generate.main(callback=lambda args, seed: (args, seed))
+        finally:
+            sys.argv = argv
+
+    def test_output_handler(self) -> None:
+        """Tests that output handed to the uploader in memory is stored like the zip of the same generation"""
+        from pony.orm import db_session
+
+        import worlds
+        from Main import main as ERmain
+        from MultiServer import Context
+        from WebHostLib.models import Seed
+        from WebHostLib.upload import upload_output_to_db, upload_zip_to_db
+
+        owner = uuid4()
+        with TemporaryDirectory() as output_path:
+            ERmain(*self.get_generation_args(output_path))
+            zip_path = next(entry.path for entry in os.scandir(output_path) if entry.name.endswith(".zip"))
+            with zipfile.ZipFile(zip_path) as zfile, db_session:
+                zip_seed_id = upload_zip_to_db(zfile, owner).id
+
+            seed_ids = []
+            with db_session:
+                ERmain(*self.get_generation_args(output_path),
+                       output_handler=lambda *output: seed_ids.append(upload_output_to_db(*output, owner).id))
+            self.assertEqual(len(os.listdir(output_path)), 1, "no second zip is written")
+
+        with db_session:
+            seed = Seed.get(id=seed_ids[0])
+            zip_seed = Seed.get(id=zip_seed_id)
+            self.assertEqual(seed.spoiler, zip_seed.spoiler)
+            self.assertTrue(seed.spoiler)
+            self.assertEqual({(slot.player_id, slot.player_name, slot.game, slot.data) for slot in seed.slots},
+                             {(slot.player_id, slot.player_name, slot.game, slot.data) for slot in zip_seed.slots})
+            multidata = Context.decompress(seed.multidata)
+            zip_multidata = Context.decompress(zip_seed.multidata)
+            self.assertEqual(seed.multidata[0], zip_seed.multidata[0], "stored in the configured multidata_format")
+        self.assertEqual(multidata.keys(), zip_multidata.keys())
+        for key in ("slot_info", "connect_names", "precollected_hints", "er_hint_data", "minimum_versions"):
+            self.assertEqual(multidata[key], zip_multidata[key], key)
+        self.assertEqual(dict(multidata["datapackage"]), dict(zip_multidata["datapackage"]))
+        self.assertEqual(dict(multidata["slot_data"]), dict(zip_multidata["slot_data"]))
+        self.assertEqual({slot: {location: locations[location] for location in locations}
+                          for slot, locations in multidata["locations"].items()},
+                         {slot: {location: locations[location] for location in locations}
+                          for slot, locations in zip_multidata["locations"].items()})
+        # only the stored multidata had its data packages replaced by their checksums
+        self.assertIn("checksum", worlds.network_data_package["games"]["Timespinner"])
+        self.assertIn("item_name_to_id", worlds.network_data_package["games"]["Timespinner"])
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
 import pathlib
 import re
 import sys
+import threading
 import time
 from dataclasses import make_dataclass
-from typing import (Any, Callable, ClassVar, Dict, FrozenSet, List, Mapping,
+from typing import (Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Mapping,
                     Optional, Set, TextIO, Tuple, TYPE_CHECKING, Type, Union)
 
 from Options import PerGameCommonOptions
@@ -22,8 +24,85 @@ if TYPE_CHECKING:
 perf_logger = logging.getLogger("performance")
 
 
+def _unshare_state_items(method: Callable[[World, CollectionState, Item], bool]) \
+        -> Callable[[World, CollectionState, Item], bool]:
+    """Wraps World.collect and World.remove, so a prog_items Counter that is shared between copies of a
+    CollectionState gets copied before the world modifies it."""
+    @functools.wraps(method)
+    def wrapper(self: World, state: CollectionState, item: Item) -> bool:
+        state.unshare_items(self.player)
+        return method(self, state, item)
+    return wrapper
+
+
+class WorldTypes(Dict[str, Type["World"]]):
+    """Registered world types by game. Games known from the world index are only imported when they are looked up,
+    anything going through all games imports all of them."""
+    unloaded: Dict[str, Callable[[], Any]]
+    """game -> loader of its world source, for games not imported yet"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unloaded = {}
+        self.lock = threading.RLock()
+
+    def load(self, game: str) -> None:
+        with self.lock:
+            loader = self.unloaded.get(game)
+            if loader:
+                for other_game in [other for other, other_loader in self.unloaded.items() if other_loader == loader]:
+                    del self.unloaded[other_game]
+                loader()
+
+    def load_all(self) -> None:
+        while self.unloaded:
+            self.load(next(iter(self.unloaded)))
+
+    def __setitem__(self, game: str, world_type: Type[World]) -> None:
+        self.unloaded.pop(game, None)  # imported by another world
+        super().__setitem__(game, world_type)
+
+    def __getitem__(self, game: str) -> Type[World]:
+        if game in self.unloaded:
+            self.load(game)
+        return super().__getitem__(game)
+
+    def get(self, game: str, default: Any = None) -> Any:
+        if game in self.unloaded:
+            self.load(game)
+        return super().get(game, default)
+
+    def __contains__(self, game: object) -> bool:
+        return super().__contains__(game) or game in self.unloaded
+
+    def is_loaded(self, game: str) -> bool:
+        return super().__contains__(game)
+
+    def loaded_items(self) -> Iterable[Tuple[str, Type[World]]]:
+        return super().items()
+
+    def __iter__(self) -> Iterator[str]:
+        self.load_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self.unloaded)
+
+    def keys(self):  # type: ignore[override]
+        self.load_all()
+        return super().keys()
+
+    def values(self):  # type: ignore[override]
+        self.load_all()
+        return super().values()
+
+    def items(self):  # type: ignore[override]
+        self.load_all()
+        return super().items()
+
+
 class AutoWorldRegister(type):
-    world_types: Dict[str, Type[World]] = {}
+    world_types: WorldTypes = WorldTypes()
     __file__: str
     zip_path: Optional[str]
     settings_key: str
@@ -84,10 +163,14 @@ class AutoWorldRegister(type):
             dct["options_dataclass"] = make_dataclass(f"{name}Options", dct["option_definitions"].items(),
                                                       bases=(PerGameCommonOptions,))
 
+        for method_name in ("collect", "remove"):
+            if method_name in dct:
+                dct[method_name] = _unshare_state_items(dct[method_name])
+
         # construct class
         new_class = super().__new__(mcs, name, bases, dct)
         if "game" in dct:
-            if dct["game"] in AutoWorldRegister.world_types:
+            if AutoWorldRegister.world_types.is_loaded(dct["game"]):
                 raise RuntimeError(f"""Game {dct["game"]} already registered.""")
             AutoWorldRegister.world_types[dct["game"]] = new_class
         new_class.__file__ = sys.modules[new_class.__module__].__file__
@@ -122,6 +205,8 @@ def _timed_call(method: Callable[..., Any], *args: Any,
     start = time.perf_counter()
     ret = method(*args)
     taken = time.perf_counter() - start
+    if multiworld and multiworld.profile:
+        multiworld.profile.add_stage_time(method, player, taken)
     if taken > 1.0:
         if player and multiworld:
             perf_logger.info(f"Took {taken:.4f} seconds in {method.__qualname__} for player {player}, "
@@ -168,7 +253,7 @@ def call_stage(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
     for world_type in sorted(world_types, key=lambda world: world.__name__):
         stage_callable = getattr(world_type, f"stage_{method_name}", None)
         if stage_callable:
-            _timed_call(stage_callable, multiworld, *args)
+            _timed_call(stage_callable, multiworld, *args, multiworld=multiworld)
 
 
 class WebWorld:
@@ -264,6 +349,10 @@ class World(metaclass=AutoWorldRegister):
     hidden: ClassVar[bool] = False
     """Hide World Type from various views. Does not remove functionality."""
 
+    trace_rule_dependencies: ClassVar[bool] = False
+    """Allow generation to skip re-evaluating access rules that failed, until an item count they read changes.
+    Only enable this if all access rules of this world depend on nothing but items and reachability in the state."""
+
     web: ClassVar[WebWorld] = WebWorld()
     """see WebWorld for options"""
 
@@ -11,6 +11,7 @@ from typing import ClassVar, Dict, Tuple, Any, Optional, Union, BinaryIO
 import bsdiff4
 
 semaphore = threading.Semaphore(os.cpu_count() or 4)
+source_data_lock = threading.Lock()
 
 del threading
 del os
@@ -32,6 +33,8 @@ class AutoPatchRegister(abc.ABCMeta):
 
     @staticmethod
     def get_handler(file: str) -> Optional[AutoPatchRegister]:
+        from . import load_all_worlds
+        load_all_worlds()
         for file_ending, handler in AutoPatchRegister.file_endings.items():
             if file.endswith(file_ending):
                 return handler
@@ -149,8 +152,10 @@ class APDeltaPatch(APPatch):
     delta: Optional[bytes] = None
     source_data: bytes
 
-    def __init__(self, *args: Any, patched_path: str = "", **kwargs: Any) -> None:
+    def __init__(self, *args: Any, patched_path: str = "", patched_data: Optional[bytes] = None,
+                 **kwargs: Any) -> None:
         self.patched_path = patched_path
+        self.patched_data = patched_data
         super(APDeltaPatch, self).__init__(*args, **kwargs)
 
     def get_manifest(self) -> Dict[str, Any]:
@@ -168,14 +173,24 @@ class APDeltaPatch(APPatch):
     @classmethod
     def get_source_data_with_cache(cls) -> bytes:
         if not hasattr(cls, "source_data"):
-            cls.source_data = cls.get_source_data()
+            # output threads of the same game would otherwise all load the source at the same time
+            with source_data_lock:
+                if not hasattr(cls, "source_data"):
+                    cls.source_data = cls.get_source_data()
         return cls.source_data
 
+    def get_patched_data(self) -> bytes:
+        """Patched data given in memory, otherwise read from patched_path"""
+        if self.patched_data is not None:
+            return bytes(self.patched_data)
+        with open(self.patched_path, "rb") as f:
+            return f.read()
+
     def write_contents(self, opened_zipfile: zipfile.ZipFile):
         super(APDeltaPatch, self).write_contents(opened_zipfile)
-        # write Delta
+        # write Delta. bsdiff4 releases the GIL, so deltas of output threads are created in parallel
         opened_zipfile.writestr("delta.bsdiff4",
-                                bsdiff4.diff(self.get_source_data_with_cache(), open(self.patched_path, "rb").read()),
+                                bsdiff4.diff(self.get_source_data_with_cache(), self.get_patched_data()),
                                 compress_type=zipfile.ZIP_STORED)  # bsdiff4 is a format with integrated compression
 
     def read_contents(self, opened_zipfile: zipfile.ZipFile):
@@ -20,6 +20,9 @@ __all__ = {
     "user_folder",
     "GamesPackage",
     "DataPackage",
+    "world_index",
+    "load_all_worlds",
+    "load_component_worlds",
 }
 
 
@@ -42,6 +45,7 @@ class WorldSource:
     is_zip: bool = False
     relative: bool = True  # relative to regular world import folder
     time_taken: Optional[float] = None
+    loaded: bool = dataclasses.field(default=False, compare=False)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.path}, is_zip={self.is_zip}, relative={self.relative})"
@@ -53,6 +57,8 @@ class WorldSource:
         return self.path
 
     def load(self) -> bool:
+        if self.loaded:
+            return True
         try:
             start = time.perf_counter()
             if self.is_zip:
@@ -75,6 +81,7 @@ class WorldSource:
             else:
                 importlib.import_module(f".{self.path}", "worlds")
             self.time_taken = time.perf_counter()-start
+            self.loaded = True
             return True
 
         except Exception:
@@ -103,14 +110,68 @@ for folder in (folder for folder in (user_folder, local_folder) if folder):
             elif entry.is_file() and entry.name.endswith(".apworld"):
                 world_sources.append(WorldSource(file_name, is_zip=True, relative=relative))
 
-# import all submodules to trigger AutoWorldRegister
 world_sources.sort()
-for world_source in world_sources:
-    world_source.load()
 
-# Build the data package for each game.
 from .AutoWorld import AutoWorldRegister
+from .LauncherComponents import components, icon_paths
+import WorldIndex
+
+world_index: Dict[str, WorldIndex.WorldIndexEntry]
+"""index entry of each game, holding its data package without importing its world"""
+
+_world_folders = (user_folder, local_folder)
+_index_data = WorldIndex.load_index(_world_folders)
+if _index_data is None:
+    # import all submodules to trigger AutoWorldRegister
+    world_index = {}
+    _sources_to_load = world_sources
+    _component_sources: List[str] = []
+else:
+    # only import worlds once they are looked up, and retry the ones that failed before
+    world_index = _index_data["games"]
+    _component_sources = _index_data["component_sources"]
+    _sources_to_load = [world_source for world_source in world_sources
+                        if os.path.abspath(world_source.resolved_path) in _index_data["failed_sources"]]
+    _sources_by_module = {f"worlds.{os.path.basename(world_source.path).rsplit('.', 1)[0]}"
+                          if world_source.is_zip else f"worlds.{os.path.basename(world_source.path)}": world_source
+                          for world_source in world_sources}
+    for _game, _entry in world_index.items():
+        _world_source = _sources_by_module.get(".".join(_entry["module"].split(".", 2)[:2]))
+        if _world_source:
+            AutoWorldRegister.world_types.unloaded[_game] = _world_source.load
+
+_failed_sources: List[str] = []
+for _world_source in _sources_to_load:
+    _registered = len(components), len(icon_paths)
+    if not _world_source.load():
+        _failed_sources.append(os.path.abspath(_world_source.resolved_path))
+    elif (len(components), len(icon_paths)) != _registered:
+        _component_sources.append(os.path.abspath(_world_source.resolved_path))
 
+# Build the data package for each game.
 network_data_package: DataPackage = {
-    "games": {world_name: world.get_data_package_data() for world_name, world in AutoWorldRegister.world_types.items()},
+    "games": {world_name: entry["data_package"] for world_name, entry in world_index.items()},
 }
+_new_games = {world_name: world.get_data_package_data()
+              for world_name, world in AutoWorldRegister.world_types.loaded_items()
+              if world_name not in network_data_package["games"]}
+if _index_data is None or _new_games:
+    # Persist it, so the next start only has to import the worlds it uses.
+    network_data_package["games"].update(_new_games)
+    world_index.update(WorldIndex.build_index(AutoWorldRegister.world_types, _new_games))
+    WorldIndex.write_index({"games": world_index, "failed_sources": _failed_sources,
+                            "component_sources": _component_sources}, _world_folders)
+
+
+def load_all_worlds() -> None:
+    """Imports all worlds, for anything relying on the registrations worlds make on import,
+    like launcher components, patch types and client handlers."""
+    AutoWorldRegister.world_types.load_all()
+
+
+def load_component_worlds() -> None:
+    """Imports the world sources that register launcher components or icons on import,
+    so the launcher can list all components without importing every world."""
+    for world_source in world_sources:
+        if os.path.abspath(world_source.resolved_path) in _component_sources:
+            world_source.load()
@@ -9,7 +9,9 @@ import asyncio
 import base64
 import enum
 import json
+import struct
 import sys
+import time
 import typing
 
 
@@ -46,14 +48,42 @@ class SyncError(Exception):
 class BizHawkContext:
     streams: typing.Optional[typing.Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
     connection_status: ConnectionStatus
+    watches: typing.Dict[int, typing.Tuple[int, int, str]]
+    """Memory registered with `watch`, by watch id"""
+    watch_data: typing.Dict[int, bytearray]
+    """Contents of watched memory as of the last `poll_watches`"""
+    message_count: int
+    message_time: float
+    bytes_sent: int
+    bytes_received: int
     _lock: asyncio.Lock
     _port: typing.Optional[int]
+    _registered_watches: typing.Set[int]
+    _removed_watches: typing.Set[int]
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.watches = {}
+        self.watch_data = {}
+        self.message_count = 0
+        self.message_time = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
         self._lock = asyncio.Lock()
         self._port = None
+        self._registered_watches = set()
+        self._removed_watches = set()
+
+    @property
+    def average_latency(self) -> float:
+        """Average time in seconds between sending a message to the connector and receiving its response"""
+        return self.message_time / self.message_count if self.message_count else 0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes sent and received per second spent waiting on the connector"""
+        return (self.bytes_sent + self.bytes_received) / self.message_time if self.message_time else 0
 
     async def _send_message(self, message: str):
         async with self._lock:
@@ -62,10 +92,16 @@ class BizHawkContext:
 
             try:
                 reader, writer = self.streams
-                writer.write(message.encode("utf-8") + b"\n")
+                encoded_message = message.encode("utf-8") + b"\n"
+                start_time = time.perf_counter()
+                writer.write(encoded_message)
                 await asyncio.wait_for(writer.drain(), timeout=5)
 
                 res = await asyncio.wait_for(reader.readline(), timeout=5)
+                self.message_time += time.perf_counter() - start_time
+                self.message_count += 1
+                self.bytes_sent += len(encoded_message)
+                self.bytes_received += len(res)
 
                 if res == b"":
                     writer.close()
@@ -100,6 +136,10 @@ async def connect(ctx: BizHawkContext) -> bool:
             ctx.streams = await asyncio.open_connection("127.0.0.1", port)
             ctx.connection_status = ConnectionStatus.TENTATIVE
             ctx._port = port
+            # the connector forgets watches of previous connections
+            ctx._registered_watches.clear()
+            ctx._removed_watches.clear()
+            ctx.watch_data.clear()
             return True
         except (TimeoutError, ConnectionRefusedError):
             continue
@@ -324,3 +364,63 @@ async def write(ctx: BizHawkContext, write_list: typing.List[typing.Tuple[int, t
     - `value` is a list of bytes to write, in order, starting at `address`
     - `domain` is the name of the region of memory the address corresponds to"""
     await guarded_write(ctx, write_list, [])
+
+
+def watch(ctx: BizHawkContext, address: int, size: int, domain: str) -> int:
+    """Registers memory to be checked for changes by `poll_watches` and returns its watch id.
+
+    The watch is sent to the connector with the next `poll_watches`, and again after reconnecting."""
+    watch_id = next(watch_id for watch_id in range(len(ctx.watches) + 1) if watch_id not in ctx.watches)
+    if watch_id > 0xFFFF:
+        raise ValueError("Too many memory watches")
+    ctx.watches[watch_id] = (address, size, domain)
+    ctx._removed_watches.discard(watch_id)
+    return watch_id
+
+
+def unwatch(ctx: BizHawkContext, watch_id: int) -> None:
+    """Removes a watch registered by `watch`."""
+    del ctx.watches[watch_id]
+    ctx.watch_data.pop(watch_id, None)
+    if watch_id in ctx._registered_watches:
+        ctx._registered_watches.remove(watch_id)
+        ctx._removed_watches.add(watch_id)
+
+
+async def poll_watches(ctx: BizHawkContext) -> typing.Dict[int, bytes]:
+    """Checks all watched memory and returns the contents of watches that changed since the last poll, by watch id.
+
+    Only the changed bytes are sent by the connector, so polling memory that rarely changes is cheap. The first poll of
+    a watch always returns it. The contents of all watches are kept in `ctx.watch_data`."""
+    new_watches = [watch_id for watch_id in ctx.watches if watch_id not in ctx._registered_watches]
+    res = await send_requests(ctx, [{
+        "type": "UNWATCH",
+        "id": watch_id
+    } for watch_id in ctx._removed_watches] + [{
+        "type": "WATCH",
+        "id": watch_id,
+        "address": ctx.watches[watch_id][0],
+        "size": ctx.watches[watch_id][1],
+        "domain": ctx.watches[watch_id][2]
+    } for watch_id in new_watches] + [{
+        "type": "WATCH_POLL"
+    }])
+    ctx._removed_watches.clear()
+    ctx._registered_watches.update(new_watches)
+
+    if res[-1]["type"] != "WATCH_POLL_RESPONSE":
+        raise SyncError(f"Expected response of type WATCH_POLL_RESPONSE but got {res[-1]['type']}")
+
+    changes = base64.b64decode(res[-1]["value"])
+    changed: typing.Set[int] = set()
+    offset = 0
+    while offset < len(changes):
+        watch_id, start, length = struct.unpack_from(">HIH", changes, offset)
+        offset += 8
+        if watch_id in ctx.watches:
+            data = ctx.watch_data.setdefault(watch_id, bytearray(ctx.watches[watch_id][1]))
+            data[start:start + length] = changes[offset:offset + length]
+            changed.add(watch_id)
+        offset += length
+
+    return {watch_id: bytes(ctx.watch_data[watch_id]) for watch_id in changed}
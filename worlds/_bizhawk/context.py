@@ -19,7 +19,7 @@ from . import BizHawkContext, ConnectionStatus, NotConnectedError, RequestFailed
 from .client import BizHawkClient, AutoBizHawkClientRegister
 
 
-EXPECTED_SCRIPT_VERSION = 1
+EXPECTED_SCRIPT_VERSION = 2
 
 
 class AuthStatus(enum.IntEnum):
@@ -39,6 +39,10 @@ class BizHawkClientCommandProcessor(ClientCommandProcessor):
                 logger.info("BizHawk Connection Status: Tentatively Connected")
             elif self.ctx.bizhawk_ctx.connection_status == ConnectionStatus.CONNECTED:
                 logger.info("BizHawk Connection Status: Connected")
+            if self.ctx.bizhawk_ctx.message_count:
+                logger.info(f"{self.ctx.bizhawk_ctx.message_count} requests, "
+                            f"average latency {self.ctx.bizhawk_ctx.average_latency * 1000:.1f}ms, "
+                            f"throughput {self.ctx.bizhawk_ctx.throughput / 1024:.1f}KiB/s")
 
 
 class BizHawkClientContext(CommonContext):
@@ -566,11 +566,9 @@ class ALTTPWorld(World):
                                allowcollect=multiworld.allow_collect[player])
 
             rompath = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}.sfc")
-            rom.write_to_file(rompath)
             patch = LttPDeltaPatch(os.path.splitext(rompath)[0]+LttPDeltaPatch.patch_file_ending, player=player,
-                                   player_name=multiworld.player_name[player], patched_path=rompath)
+                                   player_name=multiworld.player_name[player], patched_data=rom.buffer)
             patch.write()
-            os.unlink(rompath)
             self.rom_name = rom.name
         except:
             raise
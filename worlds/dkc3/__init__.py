@@ -163,18 +163,15 @@ class DKC3World(World):
             self.active_level_list.append(LocationName.rocket_rush_region)
 
             rompath = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}.sfc")
-            rom.write_to_file(rompath)
             self.rom_name = rom.name
 
             patch = DKC3DeltaPatch(os.path.splitext(rompath)[0]+DKC3DeltaPatch.patch_file_ending, player=self.player,
-                                   player_name=self.multiworld.player_name[self.player], patched_path=rompath)
+                                   player_name=self.multiworld.player_name[self.player], patched_data=rom.buffer)
             patch.write()
         except:
             raise
         finally:
             self.rom_name_available_event.set()  # make sure threading continues and errors are collected
-            if os.path.exists(rompath):
-                os.unlink(rompath)
 
     def modify_multidata(self, multidata: dict):
         import base64
@@ -1,8 +1,9 @@
 import collections
+import itertools
 import logging
 import typing
 
-from BaseClasses import LocationProgressType, MultiWorld, Location, Region, Entrance
+from BaseClasses import CollectionState, LocationProgressType, MultiWorld, Location, Region, Entrance
 
 if typing.TYPE_CHECKING:
     import BaseClasses
@@ -193,3 +194,122 @@ def allow_self_locking_items(spot: typing.Union[Location, Region], *item_names:
                 add_allowed_rules(entrance, location)
     else:
         add_allowed_rules(spot, spot)
+
+
+class _RuleTrace:
+    """Item names read by a rule during one evaluation, or untraceable if it read state in any other way."""
+    __slots__ = ("reads", "untraceable")
+    reads: typing.List[typing.Tuple[int, str]]
+    untraceable: bool
+
+    def __init__(self) -> None:
+        self.reads = []
+        self.untraceable = False
+
+
+class _TracingState(CollectionState):
+    """
+    Passed to a rule in place of the CollectionState it is evaluated with, recording the item names the rule reads.
+    Methods of CollectionState and LogicMixins are bound to this, so their item lookups are recorded as well.
+    Any other access of the state's data, like prog_items, reachability, events or the data of a LogicMixin,
+    goes through to the evaluated state and marks the trace untraceable.
+    """
+    __slots__ = ("multiworld", "_state", "_trace")
+
+    def __init__(self, state: CollectionState, trace: _RuleTrace) -> None:
+        object.__setattr__(self, "multiworld", state.multiworld)
+        object.__setattr__(self, "_state", state)
+        object.__setattr__(self, "_trace", trace)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        self._trace.untraceable = True
+        return getattr(self._state, name)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        self._trace.untraceable = True
+        setattr(self._state, name, value)
+
+    def has(self, item: str, player: int, count: int = 1) -> bool:
+        self._trace.reads.append((player, item))
+        return self._state.has(item, player, count)
+
+    def has_all(self, items: typing.Iterable[str], player: int) -> bool:
+        items = tuple(items)
+        self._trace.reads.extend((player, item) for item in items)
+        return self._state.has_all(items, player)
+
+    def has_any(self, items: typing.Iterable[str], player: int) -> bool:
+        items = tuple(items)
+        self._trace.reads.extend((player, item) for item in items)
+        return self._state.has_any(items, player)
+
+    def count(self, item: str, player: int) -> int:
+        self._trace.reads.append((player, item))
+        return self._state.count(item, player)
+
+    def has_group(self, item_name_group: str, player: int, count: int = 1) -> bool:
+        self._trace.reads.extend((player, item) for item in
+                                 self.multiworld.worlds[player].item_name_groups[item_name_group])
+        return self._state.has_group(item_name_group, player, count)
+
+    def count_group(self, item_name_group: str, player: int) -> int:
+        self._trace.reads.extend((player, item) for item in
+                                 self.multiworld.worlds[player].item_name_groups[item_name_group])
+        return self._state.count_group(item_name_group, player)
+
+
+class DependencyTrackedRule:
+    """
+    Wraps an access rule and traces which item names it reads. When it returns False, it is recorded as failed in the
+    CollectionState it was evaluated with, indexed by those item names, see CollectionState.failed_rule_reads.
+    Until collecting or removing an item changes one of those item counts, it returns False again without being
+    evaluated. Rules that read any other state data, like reachability, events or LogicMixin data, are evaluated
+    every time.
+    """
+    __slots__ = ("rule", "traceable")
+    rule: CollectionRule
+    traceable: bool
+
+    def __init__(self, rule: CollectionRule) -> None:
+        self.rule = rule
+        self.traceable = True
+
+    def __call__(self, state: CollectionState) -> bool:
+        if not self.traceable or isinstance(state, _TracingState):
+            # evaluated by another traced rule, which records the reads of this one
+            return self.rule(state)
+        if self in state.failed_rules:
+            return False
+
+        trace = _RuleTrace()
+        result = self.rule(_TracingState(state, trace))
+        if trace.untraceable:
+            self.traceable = False
+        elif not result:
+            state.failed_rules.add(self)
+            failed_rule_reads = state.failed_rule_reads
+            for read_key in dict.fromkeys(trace.reads):
+                rules = failed_rule_reads.get(read_key, ())
+                if self not in rules:
+                    failed_rule_reads[read_key] = rules + (self,)
+        return result
+
+
+def track_rule_dependencies(multiworld: MultiWorld) -> None:
+    """Wraps the access rules of all worlds that opted into World.trace_rule_dependencies."""
+    for player in multiworld.player_ids:
+        if not multiworld.worlds[player].trace_rule_dependencies:
+            continue
+        spots: typing.Iterable[typing.Union[Location, Entrance]] = itertools.chain(
+            multiworld.get_locations(player), multiworld.get_entrances(player))
+        for spot in spots:
+            if spot.access_rule is not spot.__class__.access_rule \
+                    and not isinstance(spot.access_rule, DependencyTrackedRule):
+                spot.access_rule = DependencyTrackedRule(spot.access_rule)
+
+
+def untrack_rule_dependencies(multiworld: MultiWorld) -> None:
+    """Unwraps the access rules wrapped by track_rule_dependencies, once fill no longer benefits from them."""
+    for spot in itertools.chain(multiworld.get_locations(), multiworld.get_entrances()):
+        if isinstance(spot.access_rule, DependencyTrackedRule):
+            spot.access_rule = spot.access_rule.rule
@@ -285,24 +285,20 @@ class KDL3World(World):
                 self.boss_butch_bosses = [self.random.choice([True, False]) for _ in range(6)]
 
     def generate_output(self, output_directory: str):
-        rom_path = ""
         try:
             rom = RomData(get_base_rom_path())
             patch_rom(self, rom)
 
             rom_path = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}.sfc")
-            rom.write_to_file(rom_path)
             self.rom_name = rom.name
 
             patch = KDL3DeltaPatch(os.path.splitext(rom_path)[0] + KDL3DeltaPatch.patch_file_ending, player=self.player,
-                                   player_name=self.multiworld.player_name[self.player], patched_path=rom_path)
+                                   player_name=self.multiworld.player_name[self.player], patched_data=rom.file)
             patch.write()
         except Exception:
             raise
         finally:
             self.rom_name_available_event.set()  # make sure threading continues and errors are collected
-            if os.path.exists(rom_path):
-                os.unlink(rom_path)
 
     def modify_multidata(self, multidata: dict):
         # wait for self.rom_name to be available.
@@ -4,10 +4,18 @@ import io
 import array
 import zlib
 import copy
+import itertools
+import operator
 import zipfile
 from .ntype import BigStream
 
 
+try:
+    from _speedups import zpf_write_block, zpf_read_block
+except ImportError:
+    zpf_write_block = zpf_read_block = None
+
+
 # get the next XOR key. Uses some location in the source rom.
 # This will skip of 0s, since if we hit a block of 0s, the
 # patch data will be raw.
@@ -25,14 +33,19 @@ def key_next(rom, key_address, address_range):
 # multiple smaller blocks if there is a concern about the XOR key
 # or if it is too long.
 def write_block(rom, xor_address, xor_range, block_start, data, patch_data):
-    new_data = []
+    if zpf_write_block is not None:
+        block, xor_address = zpf_write_block(rom.original.buffer, xor_address, *xor_range, block_start, data)
+        patch_data.append_bytes(block)
+        return xor_address
+
+    new_data = bytearray()
     key_offset = 0
     continue_block = False
 
     for b in data:
         if b == 0:
             # Leave 0s as 0s. Do not XOR
-            new_data += [0]
+            new_data.append(0)
         else:
             # get the next XOR key
             key, xor_address = key_next(rom, xor_address, xor_range)
@@ -41,7 +54,7 @@ def write_block(rom, xor_address, xor_range, block_start, data, patch_data):
             # This requires breaking up the block.
             if b == key:
                 write_block_section(block_start, key_offset, new_data, patch_data, continue_block)
-                new_data = []
+                new_data = bytearray()
                 key_offset = 0
                 continue_block = True
 
@@ -52,17 +65,17 @@ def write_block(rom, xor_address, xor_range, block_start, data, patch_data):
                     # if we aren't able to find one quickly, we may need to break again
                     if key_offset == 0xFF:
                         write_block_section(block_start, key_offset, new_data, patch_data, continue_block)
-                        new_data = []
+                        new_data = bytearray()
                         key_offset = 0
                         continue_block = True
 
             # XOR the key with the byte
-            new_data += [b ^ key]
+            new_data.append(b ^ key)
 
             # Break the block if it's too long
             if (len(new_data) == 0xFFFF):
                 write_block_section(block_start, key_offset, new_data, patch_data, continue_block)
-                new_data = []
+                new_data = bytearray()
                 key_offset = 0
                 continue_block = True
 
@@ -84,6 +97,23 @@ def write_block_section(start, key_skip, in_data, patch_data, is_continue):
     patch_data.append_bytes(in_data)
 
 
+# reads a XOR block section of the patch, skipping key_skip XOR keys first.
+def read_block(rom, xor_address, xor_range, key_skip, block):
+    if zpf_read_block is not None:
+        return zpf_read_block(rom.original.buffer, xor_address, *xor_range, key_skip, block)
+
+    for _ in range(key_skip):
+        key, xor_address = key_next(rom, xor_address, xor_range)
+
+    data = bytearray(block)
+    for index, b in enumerate(block):
+        if b != 0:
+            # The XOR will always be safe and will never produce 0
+            key, xor_address = key_next(rom, xor_address, xor_range)
+            data[index] = b ^ key
+    return data, xor_address
+
+
 # This will create the patch file. Which can be applied to a source rom.
 # xor_range is the range the XOR key will read from. This range is not
 # too important, but I tried to choose from a section that didn't really
@@ -92,7 +122,7 @@ def create_patch_file(rom, xor_range=(0x00B8AD30, 0x00F029A0)):
     dma_start, dma_end = rom.get_dma_table_range()
 
     # add header
-    patch_data = BigStream([])
+    patch_data = BigStream(bytearray())
     patch_data.append_bytes(list(map(ord, 'ZPFv1')))
     patch_data.append_int32(dma_start)
     patch_data.append_int32(xor_range[0])
@@ -115,8 +145,7 @@ def create_patch_file(rom, xor_range=(0x00B8AD30, 0x00F029A0)):
         # We don't trust files that have modified DMA to have their
         # changed addresses tracked correctly, so we invalidate the
         # entire file
-        for address in range(start, start + size):
-            rom.changed_address[address] = rom.buffer[address]
+        rom.changed_address.update(zip(range(start, start + size), rom.buffer[start:start + size]))
 
         # Simulate moving the files to know which addresses have changed
         if from_file >= 0:
@@ -133,37 +162,26 @@ def create_patch_file(rom, xor_range=(0x00B8AD30, 0x00F029A0)):
 
     # filter down the addresses that will actually need to change.
     # Make sure to not include any of the DMA table addresses
+    force_patch = set(rom.force_patch)
     changed_addresses = [address for address,value in rom.changed_address.items() \
         if (address >= dma_end or address < dma_start) and \
-            (address in rom.force_patch or new_buffer[address] != value)]
+            (address in force_patch or new_buffer[address] != value)]
     changed_addresses.sort()
 
     # Write the address changes. We'll store the data with XOR so that
     # the patch data won't be raw data from the patched rom.
-    data = []
-    block_start = None
+    # A block is broken up where the gap to the next changed address
+    # is bigger than the header of a new block, otherwise the gap is
+    # written as part of the block.
     BLOCK_HEADER_SIZE = 7 # this is used to break up gaps
-    for address in changed_addresses:
-        # if there's a block to write and there's a gap, write it
-        if block_start:
-            block_end = block_start + len(data) - 1
-            if address > block_end + BLOCK_HEADER_SIZE:
-                xor_address = write_block(rom, xor_address, xor_range, block_start, data, patch_data)
-                data = []
-                block_start = None
-                block_end = None
-
-        # start a new block
-        if not block_start:
-            block_start = address
-            block_end = address - 1             
-
-        # save the new data
-        data += rom.buffer[block_end+1:address+1]
-
-    # if there was any left over blocks, write them out
-    if block_start:
-        xor_address = write_block(rom, xor_address, xor_range, block_start, data, patch_data)
+    block_starts = itertools.compress(range(1, len(changed_addresses)),
+        map(operator.gt, changed_addresses[1:], map(operator.add, changed_addresses, itertools.repeat(BLOCK_HEADER_SIZE))))
+    block_index = 0
+    for next_block_index in itertools.chain(block_starts, [len(changed_addresses)] if changed_addresses else []):
+        block_start = changed_addresses[block_index]
+        block_end = changed_addresses[next_block_index - 1]
+        xor_address = write_block(rom, xor_address, xor_range, block_start, rom.buffer[block_start:block_end+1], patch_data)
+        block_index = next_block_index
 
     # compress the patch file
     patch_data = bytes(patch_data.buffer)
@@ -244,24 +262,15 @@ def apply_patch_file(rom, file, sub_file=None):
             patch_data.seek_address(delta=-1)
             block_start = patch_data.read_int32()
             block_size = patch_data.read_int16()
+            key_skip = 0
         else:
             # continue writing from previous block
             key_skip = patch_data.read_byte()
             block_size = patch_data.read_int16()
-            # skip specified XOR keys
-            for _ in range(key_skip):
-                key, xor_address = key_next(rom, xor_address, xor_range)
 
         # read in the new data
-        data = []
-        for b in patch_data.read_bytes(length=block_size):
-            if b == 0:
-                # keep 0s as 0s
-                data += [0]
-            else:
-                # The XOR will always be safe and will never produce 0
-                key, xor_address = key_next(rom, xor_address, xor_range)
-                data += [b ^ key]
+        data, xor_address = read_block(rom, xor_address, xor_range, key_skip,
+                                       patch_data.read_bytes(length=block_size))
 
         # Save the new data to rom
         rom.write_bytes(block_start, data)
@@ -1,8 +1,15 @@
 import ast
 from collections import defaultdict
+import copy
 from inspect import signature, _ParameterKind
 import logging
+import marshal
+import os
+import pickle
 import re
+import sys
+import typing
+from types import CodeType
 
 from .Items import item_table
 from .Location import OOTLocation
@@ -10,6 +17,7 @@ from .Regions import TimeOfDay, OOTRegion
 from BaseClasses import CollectionState as State
 from .Utils import data_path, read_json
 
+import Utils
 from worlds.generic.Rules import set_rule
 
 
@@ -46,6 +54,73 @@ def load_aliases():
     nonaliases = escaped_items.keys() - rule_aliases.keys()
 
 
+# Transformed rules, shared between the players of a process and, with the rule_cache setting, between generations.
+# Transforming a rule depends on the spot it is parsed for and on the world settings it looks up. Each transformed rule
+# keeps the settings it looked up with their values, and is only reused by worlds having the same values for them.
+class TransformedRule(typing.NamedTuple):
+    settings: typing.Tuple[typing.Tuple[str, bool, typing.Any], ...]
+    """name, whether the world has the setting and its value"""
+    events: typing.Tuple[str, ...]
+    rule_str: str
+    """dump of the transformed ast, player independent"""
+
+
+SpotKey = typing.Optional[typing.Tuple[typing.Optional[str], typing.Optional[str]]]
+transformed_rules: typing.Dict[typing.Tuple[str, SpotKey], typing.List[TransformedRule]] = {}
+compiled_rules: typing.Dict[str, CodeType] = {}
+rule_cache_version = 1
+setting_types = (bool, int, float, str, type(None), list, tuple, set, frozenset, dict)
+
+
+def get_rule_cache_path():
+    return Utils.cache_path('oot', 'rule_cache.pickle')
+
+
+def get_rule_cache_signature():
+    sources = [__file__, os.path.join(os.path.dirname(__file__), 'Rules.py'),
+               os.path.join(os.path.dirname(__file__), 'Items.py'), data_path('LogicHelpers.json')]
+    return (rule_cache_version, Utils.__version__, sys.version_info[:2], sorted(State.__dict__),
+            [os.stat(source).st_mtime for source in sources])
+
+
+def load_rule_cache():
+    """Adds the transformed rules persisted by an earlier generation to the ones of this process."""
+    try:
+        with open(get_rule_cache_path(), 'rb') as f:
+            signature, rules, codes = pickle.load(f)
+        if signature != get_rule_cache_signature():
+            return
+        codes = {rule_str: marshal.loads(code) for rule_str, code in codes.items()}
+    except Exception as e:  # missing, outdated or corrupted cache file
+        logging.debug(f'Could not load OoT rule cache: {e}')
+        return
+    for key, entries in rules.items():
+        transformed_rules.setdefault(key, []).extend(entry for entry in entries
+                                                      if entry not in transformed_rules.get(key, ()))
+    for rule_str, code in codes.items():
+        compiled_rules.setdefault(rule_str, code)
+
+
+def save_rule_cache():
+    path = get_rule_cache_path()
+    try:
+        data = pickle.dumps((get_rule_cache_signature(), transformed_rules,
+                             {rule_str: marshal.dumps(code) for rule_str, code in compiled_rules.items()}))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+    except Exception as e:
+        logging.debug(f'Could not save OoT rule cache: {e}')
+
+
+def get_spot_key(spot) -> SpotKey:
+    if spot is None:
+        return None
+    region = spot if type(spot) == OOTRegion else spot.parent_region
+    return getattr(spot, 'type', None), region.name if region else None
+
+
 def isliteral(expr):
     return isinstance(expr, (ast.Num, ast.Str, ast.Bytes, ast.NameConstant))
 
@@ -67,6 +142,29 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         self.rule_cache = {}
         self.kwarg_defaults = kwarg_defaults.copy()  # otherwise this gets contaminated between players
         self.kwarg_defaults['player'] = self.player
+        # settings looked up and events added while transforming the current rule, kept with the transformed rule
+        self.settings_read = {}
+        self.events_added = []
+        self.cacheable = True
+
+    def has_setting(self, name):
+        present = name in self.multiworld.__dict__
+        if name not in self.settings_read:
+            value = self.multiworld.__dict__[name] if present else None
+            if isinstance(value, setting_types):
+                self.settings_read[name] = (present, copy.deepcopy(value))
+            else:
+                self.cacheable = False
+        return present
+
+    def get_setting(self, name):
+        value = self.multiworld.__dict__[name]
+        self.has_setting(name)
+        return value
+
+    def add_event(self, name):
+        self.events.add(name)
+        self.events_added.append(name)
 
 
     def visit_Name(self, node):
@@ -84,23 +182,23 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(escaped_items[node.id]), ast.Constant(self.player)],
+                args=[ast.Str(escaped_items[node.id]), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
-        elif node.id in self.multiworld.__dict__:
+        elif self.has_setting(node.id):
             # Settings are constant
-            return ast.parse('%r' % self.multiworld.__dict__[node.id], mode='eval').body
+            return ast.parse('%r' % self.get_setting(node.id), mode='eval').body
         elif node.id in State.__dict__:
             return self.make_call(node, node.id, [], [])
         elif node.id in self.kwarg_defaults or node.id in allowed_globals:
             return node
         elif event_name.match(node.id):
-            self.events.add(node.id.replace('_', ' '))
+            self.add_event(node.id.replace('_', ' '))
             return ast.Call(
                 func=ast.Attribute(
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(node.id.replace('_', ' ')), ast.Constant(self.player)],
+                args=[ast.Str(node.id.replace('_', ' ')), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
         else:
             raise Exception('Parse Error: invalid node name %s' % node.id, self.current_spot.name, ast.dump(node, False))
@@ -111,7 +209,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(node.s), ast.Constant(self.player)],
+            args=[ast.Str(node.s), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
 
     # python 3.8 compatibility: ast walking now uses visit_Constant for Constant subclasses
@@ -137,20 +235,20 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
         if isinstance(count, ast.Name):
             # Must be a settings constant
-            count = ast.parse('%r' % self.multiworld.__dict__[count.id], mode='eval').body
+            count = ast.parse('%r' % self.get_setting(count.id), mode='eval').body
 
         if iname in escaped_items:
             iname = escaped_items[iname]
 
         if iname not in item_table:
-            self.events.add(iname)
+            self.add_event(iname)
 
         return ast.Call(
             func=ast.Attribute(
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(iname), ast.Constant(self.player), count],
+            args=[ast.Str(iname), ast.Name(id='player', ctx=ast.Load()), count],
             keywords=[])
 
 
@@ -182,7 +280,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         new_args = []
         for child in node.args:
             if isinstance(child, ast.Name):
-                if child.id in self.multiworld.__dict__:
+                if self.has_setting(child.id):
                     # child = ast.Attribute(
                     #     value=ast.Attribute(
                     #         value=ast.Name(id='state', ctx=ast.Load()),
@@ -190,7 +288,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     #         ctx=ast.Load()),
                     #     attr=child.id,
                     #     ctx=ast.Load())
-                    child = ast.Constant(getattr(self.multiworld, child.id))
+                    child = ast.Constant(self.get_setting(child.id))
                 elif child.id in rule_aliases:
                     child = self.visit(child)
                 elif child.id in escaped_items:
@@ -221,7 +319,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                                 ctx=ast.Load()),
                             attr='worlds',
                             ctx=ast.Load()),
-                        slice=ast.Index(value=ast.Constant(self.player)),
+                        slice=ast.Index(value=ast.Name(id='player', ctx=ast.Load())),
                         ctx=ast.Load()),
                     attr=node.value.id,
                     ctx=ast.Load()),
@@ -242,7 +340,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         # Fast check for json can_use
         if (len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)
                 and isinstance(node.left, ast.Name) and isinstance(node.comparators[0], ast.Name)
-                and node.left.id not in self.multiworld.__dict__ and node.comparators[0].id not in self.multiworld.__dict__):
+                and not self.has_setting(node.left.id) and not self.has_setting(node.comparators[0].id)):
             return ast.NameConstant(node.left.id == node.comparators[0].id)
 
         node.left = escape_or_string(node.left)
@@ -325,7 +423,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has_any' if early_return else 'has_all',
                     ctx=ast.Load()),
-                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Constant(self.player)],
+                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])] + new_values
         else:
             node.values = new_values
@@ -341,8 +439,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         if not hasattr(State, name):
             raise Exception('Parse Error: No such function State.%s' % name, self.current_spot.name, ast.dump(node, False))
 
-        for (k, v) in self.kwarg_defaults.items():
-            keywords.append(ast.keyword(arg=f'{k}', value=ast.Constant(v)))
+        for k in self.kwarg_defaults.keys():
+            keywords.append(ast.keyword(arg=f'{k}', value=ast.Name(id=k, ctx=ast.Load())))
 
         return ast.Call(
             func=ast.Attribute(
@@ -354,6 +452,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def replace_subrule(self, target, node):
+        # subrules are numbered per world, so rules referring to them can't be shared
+        self.cacheable = False
         rule = ast.dump(node, False)
         if rule in self.replaced_rules[target]:
             return self.replaced_rules[target][rule]
@@ -367,7 +467,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(subrule_name), ast.Constant(self.player)],
+            args=[ast.Str(subrule_name), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
         # Cache the subrule for any others in this region
         # (and reserve the item name in the process)
@@ -400,28 +500,33 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         self.delayed_rules.clear()
 
 
-    def make_access_rule(self, body):
-        rule_str = ast.dump(body, False)
+    def make_access_rule(self, body, rule_str=None):
+        if rule_str is None:
+            rule_str = ast.dump(body, False)
         if rule_str not in self.rule_cache:
-            # requires consistent iteration on dicts
-            kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
-            kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
-            try:
-                self.rule_cache[rule_str] = eval(compile(
-                    ast.fix_missing_locations(
-                        ast.Expression(ast.Lambda(
-                            args=ast.arguments(
-                                posonlyargs=[],
-                                args=[ast.arg(arg='state')],
-                                defaults=[],
-                                kwonlyargs=kwargs,
-                                kw_defaults=kwd),
-                            body=body))),
-                    '<string>', 'eval'),
-                    # globals/locals. if undefined, everything in the namespace *now* would be allowed
-                    allowed_globals)
-            except TypeError as e:
-                raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+            code = compiled_rules.get(rule_str)
+            if code is None:
+                # requires consistent iteration on dicts
+                kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
+                kwd = [ast.Name(id=k, ctx=ast.Load()) for k in self.kwarg_defaults.keys()]
+                try:
+                    code = compile(
+                        ast.fix_missing_locations(
+                            ast.Expression(ast.Lambda(
+                                args=ast.arguments(
+                                    posonlyargs=[],
+                                    args=[ast.arg(arg='state')],
+                                    defaults=[],
+                                    kwonlyargs=kwargs,
+                                    kw_defaults=kwd),
+                                body=body))),
+                        '<string>', 'eval')
+                except TypeError as e:
+                    raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+                compiled_rules[rule_str] = code
+            # globals/locals. if undefined, everything in the namespace *now* would be allowed
+            # the keyword defaults are looked up in locals, so the code is shared between players
+            self.rule_cache[rule_str] = eval(code, allowed_globals, self.kwarg_defaults)
         return self.rule_cache[rule_str]
 
 
@@ -448,7 +553,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     ## Handlers for compile-time optimizations (former State functions)
 
     def at_day(self, node):
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAY or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -456,7 +561,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         return ast.NameConstant(True)
 
     def at_dampe_time(self, node):
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -464,10 +569,10 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         return ast.NameConstant(True)
 
     def at_night(self, node):
-        if self.current_spot.type == 'GS Token' and self.multiworld.logic_no_night_tokens_without_suns_song:
+        if self.current_spot.type == 'GS Token' and self.get_setting('logic_no_night_tokens_without_suns_song'):
             # Using visit here to resolve 'can_play' rule
             return self.visit(ast.parse('can_play(Suns_Song)', mode='eval').body)
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -479,7 +584,24 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     # If spot is None, here() rules won't work.
     def parse_rule(self, rule_string, spot=None):
         self.current_spot = spot
-        return self.make_access_rule(self.visit(ast.parse(rule_string, mode='eval').body))
+        key = (rule_string, get_spot_key(spot))
+        world_settings = self.multiworld.__dict__
+        for transformed in transformed_rules.get(key, ()):
+            if all((name in world_settings) == present and (not present or world_settings[name] == value)
+                   for name, present, value in transformed.settings):
+                self.events.update(transformed.events)
+                return self.make_access_rule(None, transformed.rule_str)
+
+        self.settings_read = {}
+        self.events_added = []
+        self.cacheable = True
+        body = self.visit(ast.parse(rule_string, mode='eval').body)
+        rule_str = ast.dump(body, False)
+        if self.cacheable:
+            transformed_rules.setdefault(key, []).append(TransformedRule(
+                tuple((name, present, value) for name, (present, value) in self.settings_read.items()),
+                tuple(self.events_added), rule_str))
+        return self.make_access_rule(body, rule_str)
 
     def parse_spot_rule(self, spot):
         rule = spot.rule_string.split('#', 1)[0].strip()
@@ -494,20 +616,20 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     # Hijacking functions
     def current_spot_child_access(self, node): 
         r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', {self.player})", mode='eval').body
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', player)", mode='eval').body
 
     def current_spot_adult_access(self, node): 
         r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', {self.player})", mode='eval').body
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', player)", mode='eval').body
 
     def current_spot_starting_age_access(self, node): 
-        return self.current_spot_child_access(node) if self.multiworld.starting_age == 'child' else self.current_spot_adult_access(node)
+        return self.current_spot_child_access(node) if self.get_setting('starting_age') == 'child' else self.current_spot_adult_access(node)
 
     def has_bottle(self, node): 
-        return ast.parse(f"state._oot_has_bottle({self.player})", mode='eval').body
+        return ast.parse(f"state._oot_has_bottle(player)", mode='eval').body
 
     def can_live_dmg(self, node):
-        return ast.parse(f"state._oot_can_live_dmg({self.player}, {node.args[0].value})", mode='eval').body
+        return ast.parse(f"state._oot_can_live_dmg(player, {node.args[0].value})", mode='eval').body
 
     def region_has_shortcuts(self, node):
-        return ast.parse(f"state._oot_region_has_shortcuts({self.player}, '{node.args[0].value}')", mode='eval').body
+        return ast.parse(f"state._oot_region_has_shortcuts(player, '{node.args[0].value}')", mode='eval').body
@@ -19,7 +19,7 @@ from .Items import OOTItem, item_table, oot_data_to_ap_id, oot_is_item_of_type
 from .ItemPool import generate_itempool, get_junk_item, get_junk_pool
 from .Regions import OOTRegion, TimeOfDay
 from .Rules import set_rules, set_shop_rules, set_entrances_based_rules
-from .RuleParser import Rule_AST_Transformer
+from .RuleParser import Rule_AST_Transformer, load_rule_cache, save_rule_cache
 from .Options import oot_options
 from .Utils import data_path, read_json
 from .LocationList import business_scrubs, set_drop_location_names, dungeon_song_locations
@@ -86,8 +86,12 @@ class OOTSettings(settings.Group):
         Alternatively, a path to a program to open the .z64 file with
         """
 
+    class RuleCache(settings.Bool):
+        """Set this to true to keep parsed logic rules in the cache folder, so later generations skip parsing them"""
+
     rom_file: RomFile = RomFile(RomFile.copy_to)
     rom_start: typing.Union[RomStart, bool] = True
+    rule_cache: typing.Union[RuleCache, bool] = False
 
 
 class OOTWeb(WebWorld):
@@ -191,6 +195,12 @@ class OOTWorld(World):
         rom = Rom(file=get_options()['oot_options']['rom_file'])
 
 
+    @classmethod
+    def stage_generate_early(cls, multiworld: MultiWorld):
+        if cls.settings.rule_cache:
+            load_rule_cache()
+
+
     # Option parsing, handling incompatible options, building useful-item table
     def generate_early(self):
         self.parser = Rule_AST_Transformer(self, self.player)
@@ -1069,6 +1079,13 @@ class OOTWorld(World):
             apz5.write()
 
 
+    # Rules are parsed up to pre_fill, where shop rules are set
+    @classmethod
+    def stage_pre_fill(cls, multiworld: MultiWorld):
+        if cls.settings.rule_cache:
+            save_rule_cache()
+
+
     # Gathers hint data for OoT. Loops over all world locations for woth, barren, and major item locations.
     @classmethod
     def stage_generate_output(cls, multiworld: MultiWorld, output_directory: str):
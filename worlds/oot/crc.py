@@ -1,36 +1,43 @@
 import itertools
-from .ntype import BigStream, uint32
+import operator
+import struct
+from functools import reduce
+
+try:
+    from _speedups import n64_crc
+except ImportError:
+    n64_crc = None
+
 
 def calculate_crc(self):
+    if n64_crc is not None:
+        return n64_crc(self.buffer)
 
     t1 = t2 = t3 = t4 = t5 = t6 = 0xDF26F436
     u32 = 0xFFFFFFFF
 
-    m1 = self.read_bytes(0x1000, 0x100000)
-    words = map(uint32.value, zip(m1[0::4], m1[1::4], m1[2::4], m1[3::4]))
-
-    m2 = self.read_bytes(0x750, 0x100)
-    words2 = map(uint32.value, zip(m2[0::4], m2[1::4], m2[2::4], m2[3::4]))
-
-    for d, d2 in zip(words, itertools.cycle(words2)):
-        # keep t2 and t6 in u32 for comparisons; others can wait to be truncated
-        if ((t6 + d) & u32) < t6:
-            t4 += 1
-
-        t6 = (t6+d) & u32
-        t3 ^= d
-        shift = d & 0x1F
-        r = ((d << shift) | (d >> (32 - shift)))
-        t5 += r
-
+    words = struct.unpack('>262144I', self.read_bytes(0x1000, 0x100000))
+    words2 = struct.unpack('>64I', self.read_bytes(0x750, 0x100))
+
+    # everything but t2 can be summed up at once; others can wait to be truncated
+    t6_sum = t6 + sum(words)
+    t4 += t6_sum >> 32
+    t6 = t6_sum & u32
+    t3 = reduce(operator.xor, words, t3)
+    rotated = [((d << (d & 0x1F)) | (d >> (32 - (d & 0x1F)))) & u32 for d in words]
+    t5 += sum(rotated)
+    t1 += sum(map(operator.xor, itertools.cycle(words2), words))
+
+    # t2 depends on the running t6 of each word
+    running_t6 = itertools.accumulate(words, initial=0xDF26F436)
+    next(running_t6)
+    for d, r, t6_d in zip(words, rotated, running_t6):
         if t2 > d:
-            t2 ^= r & u32
+            t2 ^= r
         else:
-            t2 ^= t6 ^ d
-
-        t1 += d2 ^ d
+            t2 ^= (t6_d & u32) ^ d
 
     crc0 = (t6 ^ t4 ^ t3) & u32
     crc1 = (t5 ^ t2 ^ t1) & u32
 
-    return uint32.bytes(crc0) + uint32.bytes(crc1)
\ No newline at end of file
+    return struct.pack('>II', crc0, crc1)
@@ -211,8 +211,7 @@ class BigStream(object):
 
 
     def append_bytes(self, values):
-        for value in values:
-            self.append_byte(value)
+        self.buffer.extend(values)
 
 
     def append_int16s(self, values):
@@ -35,6 +35,7 @@ class SC2WoLWorld(World):
     game = "Starcraft 2 Wings of Liberty"
     web = Starcraft2WoLWebWorld()
     data_version = 5
+    trace_rule_dependencies = True
 
     item_name_to_id = {name: data.code for name, data in get_full_item_list().items()}
     location_name_to_id = {location.name: location.code for location in get_locations(None, None)}
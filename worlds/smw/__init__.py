@@ -174,7 +174,6 @@ class SMWWorld(World):
 
 
     def generate_output(self, output_directory: str):
-        rompath = ""  # if variable is not declared finally clause may fail
         try:
             world = self.multiworld
             player = self.player
@@ -183,18 +182,15 @@ class SMWWorld(World):
             patch_rom(self.multiworld, rom, self.player, self.active_level_dict)
 
             rompath = os.path.join(output_directory, f"{self.multiworld.get_out_file_name_base(self.player)}.sfc")
-            rom.write_to_file(rompath)
             self.rom_name = rom.name
 
             patch = SMWDeltaPatch(os.path.splitext(rompath)[0]+SMWDeltaPatch.patch_file_ending, player=player,
-                                  player_name=world.player_name[player], patched_path=rompath)
+                                  player_name=world.player_name[player], patched_data=rom.buffer)
             patch.write()
         except:
             raise
         finally:
             self.rom_name_available_event.set()  # make sure threading continues and errors are collected
-            if os.path.exists(rompath):
-                os.unlink(rompath)
 
     def modify_multidata(self, multidata: dict):
         import base64
@@ -9,6 +9,7 @@ from .bundles import get_all_bundles, Bundle
 from .items import item_table, create_items, ItemData, Group, items_by_group, get_all_filler_items, remove_limited_amount_packs
 from .locations import location_table, create_locations, LocationData
 from .logic import StardewLogic, StardewRule, True_, MAX_MONTHS
+from .stardew_rule import RuleCompiler
 from .options import StardewValleyOptions, SeasonRandomization, Goal, BundleRandomization, BundlePrice, NumberOfLuckBuffs, NumberOfMovementBuffs, \
     BackpackProgression, BuildingProgression, ExcludeGingerIsland, TrapItems
 from .presets import sv_options_presets
@@ -236,6 +237,13 @@ class StardewValleyWorld(World):
     def set_rules(self):
         set_rules(self)
         self.force_first_month_once_all_early_items_are_found()
+        self.compile_rules()
+
+    def compile_rules(self):
+        rule_compiler = RuleCompiler(self.multiworld, self.player)
+        for spot in [*self.multiworld.get_locations(self.player), *self.multiworld.get_entrances(self.player)]:
+            if isinstance(spot.access_rule, StardewRule):
+                spot.access_rule = rule_compiler.compile(spot.access_rule)
 
     def force_first_month_once_all_early_items_are_found(self):
         """
@@ -299,6 +307,17 @@ class StardewValleyWorld(World):
         else:
             return self.options.trap_items != TrapItems.option_no_traps, self.options.exclude_ginger_island == ExcludeGingerIsland.option_true
 
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        # also when unchanged, as CollectionState.collect then still counts events that are not advancement
+        state.stardew_rule_cache.pop(self.player, None)
+        return super().collect(state, item)
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        change = super().remove(state, item)
+        if change:
+            state.stardew_rule_cache.pop(self.player, None)
+        return change
+
     def fill_slot_data(self) -> Dict[str, Any]:
 
         modified_bundles = {}
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Dict, List, Union, FrozenSet, Set
+from typing import Iterable, Dict, List, Union, FrozenSet, Set, Tuple
 
-from BaseClasses import CollectionState, ItemClassification
+from BaseClasses import CollectionState, ItemClassification, MultiWorld, Region, Location, Entrance
+from worlds.AutoWorld import LogicMixin
 from .items import item_table
 
 MISSING_ITEM = "THIS ITEM IS MISSING"
@@ -116,7 +117,10 @@ class Or(StardewRule):
         self._simplified = False
 
     def __call__(self, state: CollectionState) -> bool:
-        return any(rule(state) for rule in self.rules)
+        for rule in self.rules:
+            if rule(state):
+                return True
+        return False
 
     def __repr__(self):
         return f"({' | '.join(repr(rule) for rule in self.rules)})"
@@ -190,7 +194,10 @@ class And(StardewRule):
         self._simplified = False
 
     def __call__(self, state: CollectionState) -> bool:
-        return all(rule(state) for rule in self.rules)
+        for rule in self.rules:
+            if not rule(state):
+                return False
+        return True
 
     def __repr__(self):
         return f"({' & '.join(repr(rule) for rule in self.rules)})"
@@ -267,6 +274,12 @@ class Count(StardewRule):
     def __repr__(self):
         return f"Received {self.count} {repr(self.rules)}"
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and other.count == self.count and other.rules == self.rules
+
+    def __hash__(self):
+        return hash((self.count, *self.rules))
+
     def get_difficulty(self):
         rules_sorted_by_difficulty = sorted(self.rules, key=lambda x: x.get_difficulty())
         easiest_n_rules = rules_sorted_by_difficulty[0:self.count]
@@ -300,8 +313,9 @@ class TotalReceived(StardewRule):
 
     def __call__(self, state: CollectionState) -> bool:
         c = 0
+        player_items = state.prog_items[self.player]
         for item in self.items:
-            c += state.count(item, self.player)
+            c += player_items[item]
             if c >= self.count:
                 return True
         return False
@@ -309,6 +323,13 @@ class TotalReceived(StardewRule):
     def __repr__(self):
         return f"Received {self.count} {self.items}"
 
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and other.count == self.count and other.items == self.items \
+            and other.player == self.player
+
+    def __hash__(self):
+        return hash((self.count, self.player, *self.items))
+
     def get_difficulty(self):
         return self.count
 
@@ -324,7 +345,7 @@ class Received(StardewRule):
             f"Item [{item_table[self.item].name}] has to be progression to be used in logic"
 
     def __call__(self, state: CollectionState) -> bool:
-        return state.has(self.item, self.player, self.count)
+        return state.prog_items[self.player][self.item] >= self.count
 
     def __repr__(self):
         if self.count == 1:
@@ -382,3 +403,152 @@ class Has(StardewRule):
 
     def simplify(self) -> StardewRule:
         return self.other_rules[self.item].simplify()
+
+
+class ReachSpot(StardewRule):
+    """Reach with its spot resolved, created by the RuleCompiler."""
+    spot: Union[Region, Location, Entrance]
+    resolution_hint: str
+
+    def __init__(self, spot: Union[Region, Location, Entrance], resolution_hint: str):
+        self.spot = spot
+        self.resolution_hint = resolution_hint
+
+    def __call__(self, state: CollectionState) -> bool:
+        return self.spot.can_reach(state)
+
+    def __repr__(self):
+        return f"Reach {self.resolution_hint} {self.spot.name}"
+
+    def get_difficulty(self):
+        return 1
+
+
+class Memoized(StardewRule):
+    """
+    Rule only depending on the items of its player, created by the RuleCompiler.
+    Its result is cached in the state until the player's items change.
+    """
+    rule: StardewRule
+    player: int
+
+    def __init__(self, rule: StardewRule, player: int):
+        self.rule = rule
+        self.player = player
+
+    def __call__(self, state: CollectionState) -> bool:
+        cache = state.stardew_rule_cache.get(self.player)
+        if cache is None:
+            cache = state.stardew_rule_cache[self.player] = {}
+        result = cache.get(self)
+        if result is None:
+            result = cache[self] = self.rule(state)
+        return result
+
+    def __repr__(self):
+        return repr(self.rule)
+
+    def get_difficulty(self):
+        return self.rule.get_difficulty()
+
+
+class StardewRuleCache(LogicMixin):
+    # results of Memoized rules per player, replaced instead of cleared when the player's items change,
+    # so copies of a state can share them until either of them collects or removes an item of that player
+    stardew_rule_cache: Dict[int, Dict[StardewRule, bool]]
+
+    def init_mixin(self, multiworld: MultiWorld) -> None:
+        self.stardew_rule_cache = {}
+
+    def copy_mixin(self, new_state: CollectionState) -> CollectionState:
+        new_state.stardew_rule_cache = self.stardew_rule_cache.copy()
+        return new_state
+
+
+class RuleCompiler:
+    """
+    Prepares the rules of a player for evaluation once they are all set.
+    Equal sub-rules are merged into a single instance, Has and Reach are resolved to what they refer to
+    and combinations only depending on the player's items are memoized.
+    """
+    multiworld: MultiWorld
+    player: int
+    canonical: Dict[StardewRule, StardewRule]
+    memoized: Dict[StardewRule, Memoized]
+    compiled: Dict[int, Tuple[StardewRule, StardewRule, bool]]
+    """original rule, compiled rule and whether it only depends on the player's items, by id of the original rule"""
+
+    def __init__(self, multiworld: MultiWorld, player: int):
+        self.multiworld = multiworld
+        self.player = player
+        self.canonical = {}
+        self.memoized = {}
+        self.compiled = {}
+
+    def compile(self, rule: StardewRule) -> StardewRule:
+        return self._compile(rule)[0]
+
+    def _compile(self, rule: StardewRule) -> Tuple[StardewRule, bool]:
+        known = self.compiled.get(id(rule))
+        if known is None:
+            # keeping the original rule alive, so its id can't be reused
+            known = self.compiled[id(rule)] = (rule, *self._compile_new(rule))
+        return known[1], known[2]
+
+    def _compile_new(self, rule: StardewRule) -> Tuple[StardewRule, bool]:
+        rule_type = type(rule)
+        if rule is true_ or rule is false_:
+            return rule, True
+        if rule_type is Has:
+            if rule.item not in rule.other_rules:
+                return rule, False
+            return self._compile(rule.other_rules[rule.item])
+        if rule_type is Received or rule_type is TotalReceived:
+            return self._intern(rule), rule.player == self.player
+        if rule_type is Reach:
+            return self._resolve_reach(rule), False
+
+        if rule_type is And or rule_type is Or:
+            absorbing, neutral = (false_, true_) if rule_type is And else (true_, false_)
+            sub_rules = {self._compile(sub_rule) for sub_rule in rule.rules}
+            if any(sub_rule is absorbing for sub_rule, _ in sub_rules):
+                return absorbing, True
+            sub_rules = {(sub_rule, item_only) for sub_rule, item_only in sub_rules if sub_rule is not neutral}
+            if not sub_rules:
+                return neutral, True
+            if len(sub_rules) == 1:
+                return next(iter(sub_rules))
+            compiled = rule_type(sub_rule for sub_rule, _ in sub_rules)
+        elif rule_type is Count:
+            sub_rules = [self._compile(sub_rule) for sub_rule in rule.rules]
+            compiled = Count(rule.count, [sub_rule for sub_rule, _ in sub_rules])
+        else:
+            return rule, False
+
+        compiled = self._intern(compiled)
+        if not all(item_only for _, item_only in sub_rules):
+            return compiled, False
+        memoized = self.memoized.get(compiled)
+        if memoized is None:
+            memoized = self.memoized[compiled] = Memoized(compiled, self.player)
+        return memoized, True
+
+    def _intern(self, rule: StardewRule) -> StardewRule:
+        return self.canonical.setdefault(rule, rule)
+
+    def _resolve_reach(self, rule: Reach) -> StardewRule:
+        resolved = self.canonical.get(rule)
+        if resolved is None:
+            try:
+                if rule.resolution_hint == "Location":
+                    spot = self.multiworld.get_location(rule.spot, rule.player)
+                elif rule.resolution_hint == "Entrance":
+                    spot = self.multiworld.get_entrance(rule.spot, rule.player)
+                else:
+                    spot = self.multiworld.get_region(rule.spot, rule.player)
+            except KeyError:
+                resolved = rule
+            else:
+                resolved = ReachSpot(spot, rule.resolution_hint)
+            self.canonical[rule] = resolved
+        return resolved
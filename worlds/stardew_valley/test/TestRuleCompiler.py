@@ -0,0 +1,68 @@
+import unittest
+
+from BaseClasses import CollectionState, ItemClassification
+from . import setup_solo_multiworld
+from ..stardew_rule import RuleCompiler, Memoized, Received, Reach, ReachSpot, And, Or
+
+
+class TestRuleCompiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = setup_solo_multiworld()
+        self.world = self.multiworld.worlds[1]
+        self.rule_compiler = RuleCompiler(self.multiworld, 1)
+        starting_items = {item.name for item in self.multiworld.precollected_items[1]}
+        # the starting season is randomized, and already in every new state
+        self.first, self.second = [season for season in ("Spring", "Summer", "Fall", "Winter")
+                                   if season not in starting_items][:2]
+
+    def test_merges_equal_sub_rules(self):
+        seasons = Or(Received("Summer", 1, 1), Received("Fall", 1, 1))
+        first = self.rule_compiler.compile(And(seasons, Received("Winter", 1, 1)))
+        second = self.rule_compiler.compile(And(Received("Spring", 1, 1), Or(Received("Fall", 1, 1),
+                                                                             Received("Summer", 1, 1))))
+        self.assertIsInstance(first, Memoized)
+        compiled_seasons = self.rule_compiler.compile(seasons)
+        self.assertIn(compiled_seasons, first.rule.rules)
+        self.assertIn(compiled_seasons, second.rule.rules)
+
+    def test_resolves_reach(self):
+        compiled = self.rule_compiler.compile(Reach("Farm", "Region", 1) & Received("Summer", 1, 1))
+        self.assertNotIsInstance(compiled, Memoized)
+        self.assertIn(self.multiworld.get_region("Farm", 1),
+                      [sub_rule.spot for sub_rule in compiled.rules if isinstance(sub_rule, ReachSpot)])
+
+    def test_memoized_until_items_change(self):
+        compiled = self.rule_compiler.compile(Received(self.first, 1, 1) & Received(self.second, 1, 1))
+        state = CollectionState(self.multiworld)
+        state.collect(self.world.create_item(self.first), True)
+        self.assertFalse(compiled(state))
+        copied = state.copy()
+        copied.collect(self.world.create_item(self.second), True)
+        self.assertTrue(compiled(copied))
+        self.assertFalse(compiled(state))
+        copied.remove(self.world.create_item(self.second))
+        self.assertFalse(compiled(copied))
+
+    def test_memoized_until_events_change(self):
+        compiled = self.rule_compiler.compile(Received(self.first, 1, 1) & Received(self.second, 1, 1))
+        state = CollectionState(self.multiworld)
+        state.collect(self.world.create_item(self.first), True)
+        self.assertFalse(compiled(state))
+        second = self.world.create_item(self.second)
+        second.classification = ItemClassification.filler
+        state.collect(second, True)
+        self.assertTrue(compiled(state))
+
+    def test_compiled_rules_match(self):
+        logic = self.world.logic
+        states = [CollectionState(self.multiworld) for _ in range(3)]
+        items = sorted(self.multiworld.get_items(), key=lambda item: item.name)
+        for item in items[::2]:
+            states[1].collect(item, True)
+        for item in items:
+            states[2].collect(item, True)
+        for name, rule in [*logic.item_rules.items(), *logic.building_rules.items()]:
+            compiled = self.rule_compiler.compile(rule)
+            for index, state in enumerate(states):
+                with self.subTest(rule=name, state=index):
+                    self.assertEqual(compiled(state), rule(state))
@@ -44,6 +44,7 @@ class WitnessWorld(World):
     """
     game = "The Witness"
     topology_present = False
+    trace_rule_dependencies = True
     web = WitnessWebWorld()
 
     options_dataclass = TheWitnessOptions